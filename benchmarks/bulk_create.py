@@ -0,0 +1,68 @@
+"""
+Objects per second when creating data arrays, tags and sources one by one
+(create_data_array etc.) and in bulk (create_data_arrays etc.).
+
+Usage: python benchmarks/bulk_create.py [number of objects]
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+import nixio as nix
+
+
+def run(count, tmpdir):
+    path = os.path.join(tmpdir, "bulk_create.nix")
+    nixfile = nix.File.open(path, nix.FileMode.Overwrite)
+    loop = nixfile.create_block("loop", "benchmark")
+    bulk = nixfile.create_block("bulk", "benchmark")
+
+    def report(what, create_one, create_many):
+        start = time.time()
+        for idx in range(count):
+            create_one(idx)
+        looptime = time.time() - start
+        start = time.time()
+        create_many()
+        bulktime = time.time() - start
+        print("{:12s} {:8.0f}/s -> {:8.0f}/s".format(
+            what, count / looptime, count / bulktime
+        ))
+
+    report("data arrays",
+           lambda idx: loop.create_data_array("da{}".format(idx), "bench",
+                                              data=[1.0, 2.0, 3.0]),
+           lambda: bulk.create_data_arrays(
+               [dict(name="da{}".format(idx), array_type="bench",
+                     data=[1.0, 2.0, 3.0]) for idx in range(count)]
+           ))
+    report("tags",
+           lambda idx: loop.create_tag("tag{}".format(idx), "bench",
+                                       position=[1.0]),
+           lambda: bulk.create_tags(
+               [dict(name="tag{}".format(idx), type_="bench",
+                     position=[1.0]) for idx in range(count)]
+           ))
+    report("sources",
+           lambda idx: loop.create_source("src{}".format(idx), "bench"),
+           lambda: bulk.create_sources(
+               [dict(name="src{}".format(idx), type_="bench")
+                for idx in range(count)]
+           ))
+    nixfile.close()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    print("Objects per second, {} objects each (loop -> bulk):".format(count))
+    tmpdir = tempfile.mkdtemp()
+    try:
+        run(count, tmpdir)
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Time and peak memory use (resident set size) of exporting a DataFrame with
+int, float and string columns to CSV (DataFrame.write_to_csv) and of
+importing it again (Block.create_data_frame_from_csv). Each step runs in a
+separate process, so the peak memory use is that of the step alone.
+
+Usage: python benchmarks/csv_io.py [rows]
+"""
+import os
+import sys
+import time
+import shutil
+import resource
+import tempfile
+import subprocess
+from collections import OrderedDict
+
+import numpy as np
+import nixio as nix
+
+
+CHUNK_ROWS = 100000
+
+
+def create(nrows, tmpdir):
+    nixfile = nix.File.open(os.path.join(tmpdir, "frame.nix"),
+                            nix.FileMode.Overwrite)
+    block = nixfile.create_block("block", "benchmark")
+    col_dict = OrderedDict((("id", np.int64), ("value", np.float64),
+                            ("label", nix.DataType.String)))
+    df = block.create_data_frame("frame", "bench", col_dict=col_dict)
+    for first in range(0, nrows, CHUNK_ROWS):
+        count = min(CHUNK_ROWS, nrows - first)
+        ids = np.arange(first, first + count)
+        df.append_rows(list(zip(ids, ids * 0.5,
+                                ["label {}".format(idx) for idx in ids])))
+    nixfile.close()
+
+
+def export(tmpdir):
+    nixfile = nix.File.open(os.path.join(tmpdir, "frame.nix"),
+                            nix.FileMode.ReadOnly)
+    df = nixfile.blocks[0].data_frames["frame"]
+    nrows = df.row_count()
+    start = time.time()
+    df.write_to_csv(os.path.join(tmpdir, "frame.csv"))
+    report("export", nrows, time.time() - start)
+    nixfile.close()
+
+
+def import_(tmpdir):
+    nixfile = nix.File.open(os.path.join(tmpdir, "imported.nix"),
+                            nix.FileMode.Overwrite)
+    block = nixfile.create_block("block", "benchmark")
+    if not hasattr(block, "create_data_frame_from_csv"):
+        print("import: not available in this version")
+        nixfile.close()
+        return
+    start = time.time()
+    df = block.create_data_frame_from_csv("frame", "bench",
+                                          os.path.join(tmpdir, "frame.csv"))
+    report("import", df.row_count(), time.time() - start)
+    nixfile.close()
+
+
+def report(what, nrows, duration):
+    # kilobytes on Linux
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+    print("{} {} rows: {:.1f} s ({:.2f} Mrows/s), {:.0f} MB peak "
+          "RSS".format(what, nrows, duration, nrows / duration / 1e6, peak))
+
+
+def main():
+    if len(sys.argv) > 2:
+        step, tmpdir = sys.argv[1:3]
+        if step == "create":
+            create(int(sys.argv[3]), tmpdir)
+        elif step == "export":
+            export(tmpdir)
+        else:
+            import_(tmpdir)
+        return
+
+    nrows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    tmpdir = tempfile.mkdtemp()
+    try:
+        for args in (("create", tmpdir, str(nrows)), ("export", tmpdir),
+                     ("import", tmpdir)):
+            subprocess.check_call([sys.executable, __file__] + list(args))
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Compares the Compound and Columns layouts of a wide DataFrame of floats:
+reading single columns, appending a column and appending single rows.
+
+Usage: python benchmarks/data_frame_layout.py [rows] [columns]
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+from collections import OrderedDict
+
+import numpy as np
+import nixio as nix
+
+
+def timed(func):
+    start = time.time()
+    func()
+    return time.time() - start
+
+
+def run(nrows, ncols, tmpdir):
+    names = ["c{}".format(idx) for idx in range(ncols)]
+    col_dict = OrderedDict((name, np.float64) for name in names)
+    data = np.zeros(nrows, dtype=[(name, np.float64) for name in names])
+    row = [tuple(range(ncols))]
+    results = OrderedDict()
+    for layout in (nix.DataFrameLayout.Compound, nix.DataFrameLayout.Columns):
+        path = os.path.join(tmpdir, "{}.nix".format(layout.value))
+        nixfile = nix.File.open(path, nix.FileMode.Overwrite)
+        block = nixfile.create_block("block", "benchmark")
+        df = block.create_data_frame("frame", "bench", col_dict=col_dict,
+                                     data=data, layout=layout)
+
+        def read_columns():
+            for name in names[:20]:
+                df.read_columns(name=[name])
+
+        def append_rows():
+            for _ in range(100):
+                df.append_rows(row)
+
+        read_time = timed(read_columns)
+        rows_time = timed(append_rows)
+        column_time = timed(lambda: df.append_column(np.zeros(nrows + 100),
+                                                     name="extra"))
+        results[layout] = (read_time, column_time, rows_time)
+        nixfile.close()
+
+    print("{} rows x {} float columns (Compound -> Columns):".format(nrows,
+                                                                     ncols))
+    compound, columns = results.values()
+    for idx, what in enumerate(("read 20 single columns",
+                                "append a column",
+                                "100 single-row appends")):
+        print("  {:24s} {:.3f} s -> {:.3f} s".format(what + ":",
+                                                     compound[idx],
+                                                     columns[idx]))
+
+
+def main():
+    nrows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    ncols = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    tmpdir = tempfile.mkdtemp()
+    try:
+        run(nrows, ncols, tmpdir)
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Time to decode the UTF-8 bytes h5py returns for variable length strings:
+a per-element loop, numpy.char.decode and util.decode_strings. Also times
+reading the strings with Dataset.asstr() and reading a string DataArray
+end to end.
+
+Usage: python benchmarks/decode_strings.py [number of strings]
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+import numpy as np
+from six import ensure_str
+import nixio as nix
+from nixio import util
+
+
+def timed(what, func):
+    start = time.time()
+    result = func()
+    print("{:32s} {:.2f} s".format(what, time.time() - start))
+    return result
+
+
+def run(count, tmpdir):
+    path = os.path.join(tmpdir, "decode_strings.nix")
+    nixfile = nix.File.open(path, nix.FileMode.Overwrite)
+    block = nixfile.create_block("block", "benchmark")
+    strings = np.array(["value {}".format(idx) for idx in range(count)],
+                       dtype=object)
+    da = block.create_data_array("strings", "bench",
+                                 dtype=nix.DataType.String, data=strings)
+    dataset = da._h5group.group["data"]
+    raw = dataset[:]
+    assert isinstance(raw[0], bytes)
+
+    print("Decoding {} strings:".format(count))
+    looped = timed("per-element ensure_str",
+                   lambda: np.array([ensure_str(v) for v in raw],
+                                    dtype=object))
+    timed("numpy.char.decode", lambda: np.char.decode(raw.astype(bytes)))
+    decoded = timed("util.decode_strings", lambda: util.decode_strings(raw))
+    assert list(decoded[:10]) == list(looped[:10])
+    if hasattr(dataset, "asstr"):
+        timed("Dataset.asstr() incl. read", lambda: dataset.asstr()[:])
+    timed("DataArray read incl. decode", lambda: da[:])
+    nixfile.close()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    tmpdir = tempfile.mkdtemp()
+    try:
+        run(count, tmpdir)
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Time and number of HDF5 objects opened for repeated lookups of entities
+through their containers: data_arrays[name].dimensions[0] for a number of
+data arrays and MultiTag.references[i] for all references of a MultiTag.
+
+Usage: python benchmarks/entity_lookup.py [number of data arrays]
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+import h5py
+import nixio as nix
+
+
+PASSES = 5
+
+
+class OpenCounter(object):
+    """
+    Counts the calls of h5py.h5o.open, which all object accesses of h5py
+    and nixio go through.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._open = h5py.h5o.open
+
+    def __enter__(self):
+        def counting_open(*args, **kwargs):
+            self.count += 1
+            return self._open(*args, **kwargs)
+        h5py.h5o.open = counting_open
+        return self
+
+    def __exit__(self, *exc):
+        h5py.h5o.open = self._open
+
+
+def run(count, tmpdir):
+    path = os.path.join(tmpdir, "entity_lookup.nix")
+    nixfile = nix.File.open(path, nix.FileMode.Overwrite)
+    block = nixfile.create_block("block", "benchmark")
+    names = list()
+    for idx in range(count):
+        da = block.create_data_array("da{}".format(idx), "bench",
+                                     data=[1.0, 2.0, 3.0])
+        da.append_sampled_dimension(1.0)
+        names.append(da.name)
+    positions = block.create_data_array("positions", "bench", data=[0.0])
+    mtag = block.create_multi_tag("mtag", "bench", positions)
+    nrefs = min(49, count)
+    mtag.references.extend(block.data_arrays[name]
+                           for name in names[:nrefs])
+    nixfile.close()
+
+    nixfile = nix.File.open(path, nix.FileMode.ReadOnly)
+    block = nixfile.blocks[0]
+    mtag = block.multi_tags["mtag"]
+    with OpenCounter() as counter:
+        start = time.time()
+        for _ in range(PASSES):
+            for name in names:
+                block.data_arrays[name].dimensions[0]
+            for idx in range(nrefs):
+                mtag.references[idx]
+        duration = time.time() - start
+    nixfile.close()
+    print("{} passes over {} dimension lookups and {} reference lookups: "
+          "{} HDF5 object opens, {:.2f} s".format(PASSES, count, nrefs,
+                                                  counter.count, duration))
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    tmpdir = tempfile.mkdtemp()
+    try:
+        run(count, tmpdir)
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == "__main__":
+    main()
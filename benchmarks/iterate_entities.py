@@ -0,0 +1,49 @@
+"""
+DataArrays per second when iterating over all data arrays of a block in a
+file that is opened read-only, with and without reading an attribute of
+each one.
+
+Usage: python benchmarks/iterate_entities.py [number of data arrays]
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+import nixio as nix
+
+
+def run(count, tmpdir):
+    path = os.path.join(tmpdir, "iterate_entities.nix")
+    nixfile = nix.File.open(path, nix.FileMode.Overwrite)
+    block = nixfile.create_block("block", "benchmark")
+    for idx in range(count):
+        block.create_data_array("da{}".format(idx), "bench", shape=(1,))
+    nixfile.close()
+
+    for what, read in (("", lambda da: da),
+                       (", reading the name", lambda da: da.name)):
+        nixfile = nix.File.open(path, nix.FileMode.ReadOnly)
+        block = nixfile.blocks[0]
+        start = time.time()
+        items = [read(da) for da in block.data_arrays]
+        duration = time.time() - start
+        nixfile.close()
+        assert len(items) == count
+        print("Iterating {} DataArrays{}: {:.0f}/s".format(
+            count, what, count / duration
+        ))
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    tmpdir = tempfile.mkdtemp()
+    try:
+        run(count, tmpdir)
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Time to walk the whole metadata tree of a file (names, types, definitions,
+property values and units) through the Section and Property objects and
+through File.metadata_snapshot(), including loading the snapshot.
+
+Usage: python benchmarks/metadata_snapshot.py [sections] [properties]
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+import nixio as nix
+
+
+def walk_objects(sections):
+    count = 0
+    for sec in sections:
+        sec.name, sec.type, sec.definition
+        for prop in sec.props:
+            prop.name, prop.values, prop.unit, prop.definition
+            count += 1
+        count += walk_objects(sec.sections)
+    return count
+
+
+def walk_snapshot(sections):
+    count = 0
+    for sec in sections:
+        sec.name, sec.type, sec.definition
+        for prop in sec.props.values():
+            prop.name, prop.values, prop.unit, prop.definition
+            count += 1
+        count += walk_snapshot(sec.sections.values())
+    return count
+
+
+def run(nsections, nprops, tmpdir):
+    path = os.path.join(tmpdir, "metadata_snapshot.nix")
+    nixfile = nix.File.open(path, nix.FileMode.Overwrite)
+    for idx in range(nsections):
+        session = nixfile.create_section("session {}".format(idx), "session")
+        for child in range(10):
+            sec = session.create_section("subject {}".format(child),
+                                         "Subject")
+            for pidx in range(nprops):
+                sec["p{}".format(pidx)] = [1.0, 2.0]
+                sec.props["p{}".format(pidx)].unit = "mV"
+    nixfile.close()
+
+    nixfile = nix.File.open(path, nix.FileMode.ReadOnly)
+    start = time.time()
+    count = walk_objects(nixfile.sections)
+    objtime = time.time() - start
+    start = time.time()
+    snapshot = nixfile.metadata_snapshot()
+    walk_snapshot(snapshot.sections.values())
+    snaptime = time.time() - start
+    nixfile.close()
+    print("Walking {} sections with {} properties: objects {:.2f} s, "
+          "snapshot {:.2f} s ({:.1f}x)".format(nsections * 11, count,
+                                               objtime, snaptime,
+                                               objtime / snaptime))
+
+
+def main():
+    nsections = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    nprops = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    tmpdir = tempfile.mkdtemp()
+    try:
+        run(nsections, nprops, tmpdir)
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == "__main__":
+    main()
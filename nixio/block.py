@@ -19,15 +19,20 @@ try:
 except ImportError:
     from collections import OrderedDict
 import sys
+import csv
+from itertools import islice, chain
 
 from .util import find as finders
 from .compression import Compression
+from .datatype import DataType
 
 from .entity import Entity
 from .exceptions import exceptions
 from .group import Group
 from .data_array import DataArray
-from .data_frame import DataFrame
+from .data_frame import (DataFrame, DataFrameLayout, _CSV_CHUNK_ROWS,
+                         _csv_column_type, _csv_rows_to_array,
+                         _pandas_chunks, _pandas_col_dict, _pandas_to_array)
 from .multi_tag import MultiTag
 from .tag import Tag
 from .source import Source
@@ -232,6 +237,21 @@ class Block(Entity):
                                     keep_copy_id, name)
             return self.data_arrays[id]
 
+        data, dtype, shape = self._data_array_layout(data, dtype, shape)
+        util.check_entity_name_and_type(name, array_type)
+        data_arrays = self._h5group.open_group("data_arrays")
+        if name in data_arrays:
+            raise exceptions.DuplicateName("create_data_array")
+        if compression == Compression.Auto:
+            compression = self._compr
+        da = DataArray.create_new(self.file, self, data_arrays, name, array_type,
+                                  dtype, shape, compression)
+        if data is not None:
+            da.write_direct(data)
+        return da
+
+    @staticmethod
+    def _data_array_layout(data, dtype, shape):
         if data is None:
             if shape is None:
                 raise ValueError("Either shape and or data must not be None")
@@ -246,26 +266,123 @@ class Block(Entity):
                     raise ValueError("Shape must equal data.shape")
             else:
                 shape = data.shape
-        util.check_entity_name_and_type(name, array_type)
-        data_arrays = self._h5group.open_group("data_arrays")
-        if name in data_arrays:
-            raise exceptions.DuplicateName("create_data_array")
-        if compression == Compression.Auto:
-            compression = self._compr
-        da = DataArray.create_new(self.file, self, data_arrays, name, array_type,
-                                  dtype, shape, compression)
-        if data is not None:
-            da.write_direct(data)
-        return da
+        return data, dtype, shape
+
+    @staticmethod
+    def _check_new_entities(h5container, names, types, caller):
+        seen = set()
+        for name, type_ in zip(names, types):
+            util.check_entity_name_and_type(name, type_)
+            if name in seen or name in h5container:
+                raise exceptions.DuplicateName(caller)
+            seen.add(name)
+
+    def create_data_arrays(self, specs):
+        """
+        Create many data arrays for this block at once. Each spec is a dict
+        of the keyword arguments of :meth:`create_data_array` (except for
+        ``copy_from`` and ``keep_copy_id``). All specs are checked before any
+        data array is created, and all data arrays share one creation time.
+
+        :param specs: The specifications of the data arrays to create.
+        :type specs: list of dict
+
+        :returns: The newly created data arrays.
+        :rtype: list of :class:`~nixio.DataArray`
+        """
+        def layout(name="", array_type="", dtype=None, shape=None,
+                   data=None, compression=Compression.Auto):
+            data, dtype, shape = self._data_array_layout(data, dtype, shape)
+            if data is not None:
+                # fails here, before anything is created, if the data
+                # cannot be stored with the given dtype
+                data = np.asarray(data, dtype)
+            if compression == Compression.Auto:
+                compression = self._compr
+            return name, array_type, data, dtype, shape, compression
+
+        layouts = [layout(**spec) for spec in specs]
+        names = [lo[0] for lo in layouts]
+        types = [lo[1] for lo in layouts]
+        data_arrays = self._h5group.open_group("data_arrays", True)
+        self._check_new_entities(data_arrays, names, types,
+                                 "create_data_arrays")
+        das = DataArray.create_many(self.file, self, data_arrays, names,
+                                    types)
+        for da, (_, _, data, dtype, shape, compression) in zip(das, layouts):
+            datacompr = compression == Compression.DeflateNormal
+            dset = da._h5group.create_dataset("data", shape, dtype, datacompr)
+            if data is not None:
+                dset.write_data(data)
+        return das
+
+    def create_tags(self, specs):
+        """
+        Create many tags for this block at once. Each spec is a dict of the
+        keyword arguments of :meth:`create_tag` (except for ``copy_from`` and
+        ``keep_copy_id``). All specs are checked before any tag is created,
+        and all tags share one creation time. A scalar position is stored
+        as a position with a single dimension.
+
+        :param specs: The specifications of the tags to create.
+        :type specs: list of dict
+
+        :returns: The newly created tags.
+        :rtype: list of Tag
+        """
+        def layout(name="", type_="", position=0):
+            if position is not None:
+                if np.ndim(position) == 0:
+                    position = [position]
+                position = np.asarray(position, DataType.Double)
+            return name, type_, position
+
+        layouts = [layout(**spec) for spec in specs]
+        names = [lo[0] for lo in layouts]
+        types = [lo[1] for lo in layouts]
+        tags = self._h5group.open_group("tags", True)
+        self._check_new_entities(tags, names, types, "create_tags")
+        new_tags = Tag.create_many(self.file, self, tags, names, types)
+        for tag, (_, _, position) in zip(new_tags, layouts):
+            if position is not None and len(position):
+                tag._h5group.write_data("position", position,
+                                        DataType.Double)
+        return new_tags
+
+    def create_sources(self, specs):
+        """
+        Create many sources on this block at once. Each spec is a dict of
+        the keyword arguments of :meth:`create_source`. All specs are
+        checked before any source is created, and all sources share one
+        creation time.
+
+        :param specs: The specifications of the sources to create.
+        :type specs: list of dict
+
+        :returns: The newly created sources.
+        :rtype: list of Source
+        """
+        def layout(name, type_):
+            return name, type_
+
+        layouts = [layout(**spec) for spec in specs]
+        names = [lo[0] for lo in layouts]
+        types = [lo[1] for lo in layouts]
+        sources = self._h5group.open_group("sources", True)
+        self._check_new_entities(sources, names, types, "create_sources")
+        return Source.create_many(self.file, self, sources, names, types)
 
     def create_data_frame(self, name="", type_="", col_dict=None,
                           col_names=None, col_dtypes=None, data=None,
                           compression=Compression.No,
-                          copy_from=None, keep_copy_id=True):
+                          copy_from=None, keep_copy_id=True,
+                          layout=DataFrameLayout.Compound, from_pandas=None):
         """
         Create/copy a new data frame for this block. Either ``col_dict``
         or ``col_name`` and ``col_dtypes`` must be given.
         If both are given, ``col_dict`` will be used.
+        When the data is given as ``from_pandas``, the columns are taken
+        from the (first) pandas.DataFrame if neither is given.
 
         :param name: The name of the data frame to create/copy.
         :type name: str
@@ -287,6 +404,17 @@ class Block(Entity):
         :type copy_from: DataFrame
         :param keep_copy_id: Specify if the id should be copied in copy mode
         :type keep_copy_id: bool
+        :param layout: How the data is stored in the file: as one compound
+                       dataset (default) or as one dataset per column. The
+                       Columns layout is not part of the NIX file format
+                       and cannot be read by the NIX C++ library or older
+                       versions of nixpy (see DataFrameLayout).
+        :type layout: :class:`~nixio.DataFrameLayout`
+        :param from_pandas: Data to write, instead of ``data``. The columns
+                            are copied as NumPy arrays, and the units are
+                            taken from ``attrs["units"]``. An iterable of
+                            pandas.DataFrames is written one by one.
+        :type from_pandas: pandas.DataFrame or iterable of pandas.DataFrame
 
         :returns: The newly created data frame.
         :rtype: :class:`~nixio.DataFrame`
@@ -307,12 +435,44 @@ class Block(Entity):
                             "to create DataFrames as the order "
                             "of the columns cannot be maintained in Py2")
 
+        pandas_chunks = None
+        if from_pandas is not None:
+            if data is not None:
+                raise ValueError("Only one of data and from_pandas "
+                                 "can be given")
+            first, pandas_chunks = self._data_frame_pandas_chunks(from_pandas)
+            if col_dict is None and col_names is None:
+                col_dict = _pandas_col_dict(first)
+
         if data is not None:
             shape = len(data)
         else:
             shape = 0
         data_frames = self._h5group.open_group("data_frames")
 
+        col_dtype = self._data_frame_dtype(col_dict, col_names, col_dtypes,
+                                           data)
+
+        df = DataFrame.create_new(self.file, self, data_frames, name,
+                                  type_, shape, col_dtype, compression,
+                                  layout)
+
+        if pandas_chunks is not None:
+            for chunk in pandas_chunks:
+                df.append(_pandas_to_array(chunk, col_dtype))
+            units = getattr(first, "attrs", {}).get("units")
+            if units:
+                df.units = [units.get(n) or "" for n in col_dtype.names]
+        elif data is not None:
+            df.write_direct(self._data_frame_array(data, col_dtype))
+        return df
+
+    @staticmethod
+    def _data_frame_dtype(col_dict, col_names, col_dtypes, data):
+        """
+        Returns the compound data type of a new data frame from the column
+        arguments of create_data_frame.
+        """
         if col_dict is None:
             if col_names is not None:
                 if col_dtypes is not None:
@@ -361,19 +521,99 @@ class Block(Entity):
                 if 'U' in str(dt) or dt == np.string_:
                     col_dict[nam] = util.vlen_str_dtype
             dt_arr = list(col_dict.items())
-            col_dtype = np.dtype(dt_arr)
+            return np.dtype(dt_arr)
 
-        df = DataFrame.create_new(self.file, self, data_frames, name,
-                                  type_, shape, col_dtype, compression)
+    @staticmethod
+    def _data_frame_pandas_chunks(from_pandas):
+        """
+        Returns the first pandas.DataFrame of ``from_pandas`` and an iterator
+        over all of them, including the first.
+        """
+        pandas_chunks = _pandas_chunks(from_pandas)
+        first = next(pandas_chunks, None)
+        if first is None:
+            raise ValueError("from_pandas contains no pandas.DataFrame")
+        return first, chain([first], pandas_chunks)
 
-        if data is not None:
-            if type(data[0]) == np.void:
-                data = np.ascontiguousarray(data, dtype=col_dtype)
-                df.write_direct(data)
-            else:
-                data = list(map(tuple, data))
-                arr = np.ascontiguousarray(data, dtype=col_dtype)
-                df.write_direct(arr)
+    @staticmethod
+    def _data_frame_array(data, col_dtype):
+        """
+        Converts the data given to create_data_frame (a structured array,
+        a 2D array or a sequence of rows) to an array of ``col_dtype``.
+        """
+        if type(data[0]) == np.void:
+            return np.ascontiguousarray(data, dtype=col_dtype)
+        if isinstance(data, np.ndarray) and data.ndim == 2:
+            # copy column by column instead of through row tuples
+            if data.shape[1] != len(col_dtype.names):
+                raise ValueError("Data has {} columns, expected "
+                                 "{}".format(data.shape[1],
+                                             len(col_dtype.names)))
+            arr = np.empty(len(data), dtype=col_dtype)
+            for idx, colname in enumerate(col_dtype.names):
+                arr[colname] = data[:, idx]
+            return arr
+        data = list(map(tuple, data))
+        return np.ascontiguousarray(data, dtype=col_dtype)
+
+    def create_data_frame_from_csv(self, name, type_, filename,
+                                   col_dict=None,
+                                   compression=Compression.No,
+                                   layout=DataFrameLayout.Compound):
+        """
+        Create a new data frame for this block from a CSV file, as written
+        by DataFrame.write_to_csv. The first line of the file holds the
+        column names. The file is read and appended to the data frame in
+        chunks, so memory use does not grow with the size of the file.
+
+        The data type of the columns that are not given in ``col_dict`` is
+        guessed from the first chunk of rows: integer, float, or else
+        string. If a later row cannot be converted to these types, the data
+        frame is deleted again and the error is raised.
+
+        :param name: The name of the data frame to create.
+        :type name: str
+        :param type_: The type of the data frame.
+        :type type_: str
+        :param filename: The CSV file to read
+        :type filename: str
+        :param col_dict: The data types of some or all of the columns
+        :type col_dict: dict of {str: type}
+        :param compression: En-/disable dataset compression.
+        :type compression: :class:`~nixio.Compression`
+        :param layout: How the data is stored in the file.
+        :type layout: :class:`~nixio.DataFrameLayout`
+
+        :returns: The newly created data frame.
+        :rtype: :class:`~nixio.DataFrame`
+        """
+        with open(filename, "r", newline="") as csvfile:
+            reader = csv.reader(csvfile)
+            header = next(reader)
+            types = dict(col_dict or {})
+            for colname in types:
+                if colname not in header:
+                    raise ValueError("No column named {} in "
+                                     "{}".format(colname, filename))
+            rows = list(islice(reader, _CSV_CHUNK_ROWS))
+            columns = list(zip(*rows)) or [()] * len(header)
+            full_dict = OrderedDict()
+            for colname, values in zip(header, columns):
+                if colname not in types:
+                    types[colname] = _csv_column_type(values)
+                full_dict[colname] = types[colname]
+            df = self.create_data_frame(name, type_, col_dict=full_dict,
+                                        compression=compression,
+                                        layout=layout)
+            dtype = df.data_type
+            try:
+                while rows:
+                    df.append(_csv_rows_to_array(rows, dtype))
+                    rows = list(islice(reader, _CSV_CHUNK_ROWS))
+            except Exception as e:
+                # do not leave a partly filled data frame behind
+                del self.data_frames[df.name]
+                raise e
         return df
 
     def find_sources(self, filtr=lambda _: True, limit=None):
@@ -398,6 +638,33 @@ class Block(Entity):
             limit = maxint
         return finders._find_sources(self, filtr, limit)
 
+    def iter_sources(self, filtr=None, limit=None, name=None, type_=None,
+                     visit=False):
+        """
+        Get all sources in this block recursively, one at a time.
+
+        Like find_sources, this traverses the tree breadth first, but
+        the sources are yielded as they are found, so the traversal can be
+        stopped early. Sources are only instantiated when they are
+        yielded or passed to the filter.
+
+        :param filtr: A filter function
+        :type filtr:  function
+        :param limit: The maximum depth of traversal
+        :type limit:  int
+        :param name: Only yield sources with this name
+        :type name: str
+        :param type_: Only yield sources of this type
+        :type type_: str
+        :param visit: Collect the sources with a single HDF5 visititems
+                      call and yield them in depth first order
+        :type visit: bool
+
+        :returns: A generator of the matching sources.
+        :rtype: generator of Source
+        """
+        return finders.iter_sources(self, filtr, limit, name, type_, visit)
+
     def pprint(self, indent=2, max_length=120, extra=True, start_depth=0):
         """
         Pretty Printing the Data and MetaData Tree of the whole File
@@ -499,6 +766,7 @@ class Block(Entity):
         o = obj._parent._h5group.copy(source=src, dest=self._h5group,
                                       name=name, cls=clsname,
                                       keep_id=keep_id)
+        self.file._metadata_refs = None
 
         return o.attrs["entity_id"]
 
@@ -583,8 +851,9 @@ class Block(Entity):
         :type: Section
         """
         if "metadata" in self._h5group:
-            return Section(self.file, None,
-                           self._h5group.open_group("metadata"))
+            return self.file._entity(
+                Section, None, self._h5group.open_group("metadata")
+            )
         else:
             return None
 
@@ -592,9 +861,11 @@ class Block(Entity):
     def metadata(self, sect):
         if not isinstance(sect, Section):
             raise TypeError("{} is not of type Section".format(sect))
+        self.file._metadata_changed(self, None, sect)
         self._h5group.create_link(sect, "metadata")
 
     @metadata.deleter
     def metadata(self):
         if "metadata" in self._h5group:
+            self.file._metadata_changed(self, None, None)
             self._h5group.delete("metadata")
@@ -31,7 +31,7 @@ class Container(object):
         self._name = name
 
     def _inst_item(self, item):
-        return self._itemclass(self._file, self._parent, item)
+        return self._file._entity(self._itemclass, self._parent, item)
 
     def __len__(self):
         return len(self._backend)
@@ -47,7 +47,7 @@ class Container(object):
             item = self._backend.get_by_id_or_name(item)
         return self._inst_item(item)
 
-    def __delitem__(self, item):
+    def _check_item(self, item):
         if not isinstance(item, Entity):
             item = self[item]
 
@@ -56,8 +56,27 @@ class Container(object):
                 "Wrong item type: {} required or the name or ID of one".format(
                     self._itemclass.__name__)
             )
+        return item
+
+    @staticmethod
+    def _ids_to_delete(item):
+        return [item.id]
+
+    def __delitem__(self, item):
+        self.delete_many([item])
 
-        self._file._h5group.delete_all([item.id])
+    def delete_many(self, items):
+        """
+        Deletes the given items and all references to them from the file.
+        All items are checked before any of them is deleted.
+
+        :param items: The items, or their names or ids
+        :type items: list
+        """
+        ids = list()
+        for item in items:
+            ids.extend(self._ids_to_delete(self._check_item(item)))
+        self._file._delete_entities(ids)
 
     def __iter__(self):
         for group in self._backend:
@@ -101,48 +120,30 @@ class Container(object):
 
 class SectionContainer(Container):
     """
-    SectionContainer extends Container with a new __delitem__ method.
-    When a Section is deleted, all child sections need to be deleted
+    SectionContainer extends Container to delete child sections with their
+    parent. When a Section is deleted, all child sections need to be deleted
     individually to make sure all their references are removed.
     """
-    def __delitem__(self, item):
-        if not isinstance(item, Entity):
-            item = self[item]
-
-        if not isinstance(item, self._itemclass):
-            raise TypeError(
-                "Wrong item type: {} required or the name or ID of one".format(
-                    self._itemclass.__name__)
-            )
-
+    @staticmethod
+    def _ids_to_delete(item):
         # collect all IDs under item and send them for deletion, starting from
         # the root block
-        secids = [s.id for s in item.find_sections()]
-
-        self._file._h5group.delete_all(secids)
+        return [s.id for s in item.find_sections()]
 
 
 class SourceContainer(Container):
     """
-    SourceContainer extends Container with a new __delitem__ method.
-    When a Source is deleted, all child sources need to be deleted individually
-    to make sure all their references are removed.
+    SourceContainer extends Container to delete child sources with their
+    parent. When a Source is deleted, all child sources need to be deleted
+    individually to make sure all their references are removed.
     """
-    def __delitem__(self, item):
-        if not isinstance(item, Entity):
-            item = self[item]
-
-        if not isinstance(item, self._itemclass):
-            raise TypeError(
-                "Wrong item type: {} required or the name or ID of one".format(
-                    self._itemclass.__name__)
-            )
-
+    @staticmethod
+    def _ids_to_delete(item):
         # collect all IDs under item and send them for deletion, starting from
         # the root block
         srcids = [s.id for s in item.find_sources()]
         srcids.append(item.id)
-        self._file._h5group.delete_all(srcids)
+        return srcids
 
 
 class LinkContainer(Container):
@@ -180,16 +181,19 @@ class LinkContainer(Container):
         self._itemstore = itemstore
 
     def __delitem__(self, item):
-        if not isinstance(item, Entity):
-            item = self[item]
+        item = self._check_item(item)
+        self._backend.delete(item.id)
 
-        if not isinstance(item, self._itemclass):
-            raise TypeError(
-                "Wrong item type: {} required or the name or ID of one".format(
-                    self._itemclass.__name__)
-            )
+    def delete_many(self, items):
+        """
+        Removes the links to the given items. The linked objects are not
+        removed from the file.
 
-        self._backend.delete(item.id)
+        :param items: The items, or their names or ids
+        :type items: list
+        """
+        for item in [self._check_item(item) for item in items]:
+            self._backend.delete(item.id)
 
     def append(self, item):
         if util.is_uuid(item):
@@ -245,7 +249,8 @@ class LinkContainer(Container):
         return False
 
     def _inst_item(self, item):
-        return self._itemclass(self._file, self._itemstore._parent, item)
+        return self._file._entity(self._itemclass, self._itemstore._parent,
+                                  item)
 
     @staticmethod
     def _item_key(item):
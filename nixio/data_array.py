@@ -89,7 +89,7 @@ class DataArray(Entity, DataSet):
         if labels:
             setdim.labels = labels
         if self.file.auto_update_timestamps:
-            self.force_updated_at()
+            self.file._updated(self._h5group)
         return setdim
 
     def append_sampled_dimension(self, sampling_interval, label=None,
@@ -114,7 +114,7 @@ class DataArray(Entity, DataSet):
         if offset:
             smpldim.offset = offset
         if self.file.auto_update_timestamps:
-            self.force_updated_at()
+            self.file._updated(self._h5group)
         return smpldim
 
     def append_range_dimension(self, ticks=None, label=None, unit=None):
@@ -134,7 +134,7 @@ class DataArray(Entity, DataSet):
         rdim.label = label
         rdim.unit = unit
         if self.file.auto_update_timestamps:
-            self.force_updated_at()
+            self.file._updated(self._h5group)
         if ticks is not None:
             rdim.ticks = ticks
         return rdim
@@ -202,7 +202,7 @@ class DataArray(Entity, DataSet):
             dtype = DataType.Double
             self._h5group.write_data("polynom_coefficients", coeff, dtype)
         if self.file.auto_update_timestamps:
-            self.force_updated_at()
+            self.file._updated(self._h5group)
 
     @property
     def expansion_origin(self):
@@ -220,7 +220,7 @@ class DataArray(Entity, DataSet):
         util.check_attr_type(eo, Number)
         self._h5group.set_attr("expansion_origin", eo)
         if self.file.auto_update_timestamps:
-            self.force_updated_at()
+            self.file._updated(self._h5group)
 
     @property
     def label(self):
@@ -238,7 +238,7 @@ class DataArray(Entity, DataSet):
         util.check_attr_type(l, str)
         self._h5group.set_attr("label", l)
         if self.file.auto_update_timestamps:
-            self.force_updated_at()
+            self.file._updated(self._h5group)
 
     @property
     def unit(self):
@@ -259,7 +259,7 @@ class DataArray(Entity, DataSet):
         util.check_attr_type(u, str)
         self._h5group.set_attr("unit", u)
         if self.file.auto_update_timestamps:
-            self.force_updated_at()
+            self.file._updated(self._h5group)
 
     def get_slice(self, positions, extents=None, mode=DataSliceMode.Index):
         datadim = len(self.shape)
@@ -340,8 +340,9 @@ class DataArray(Entity, DataSet):
         :type: Section
         """
         if "metadata" in self._h5group:
-            return Section(self.file, None,
-                           self._h5group.open_group("metadata"))
+            return self.file._entity(
+                Section, None, self._h5group.open_group("metadata")
+            )
         else:
             return None
 
@@ -349,9 +350,11 @@ class DataArray(Entity, DataSet):
     def metadata(self, sect):
         if not isinstance(sect, Section):
             raise TypeError("{} is not of type Section".format(sect))
+        self.file._metadata_changed(self, "data_arrays", sect)
         self._h5group.create_link(sect, "metadata")
 
     @metadata.deleter
     def metadata(self):
         if "metadata" in self._h5group:
+            self.file._metadata_changed(self, "data_arrays", None)
             self._h5group.delete("metadata")
@@ -12,18 +12,162 @@ try:
 except ImportError:
     from collections import Iterable
 from collections import OrderedDict
+from bisect import bisect_left, bisect_right
 from inspect import isclass
+from numbers import Integral
+from enum import Enum
 import numpy as np
-from .exceptions import OutOfBounds
+from .exceptions import OutOfBounds, DuplicateColumnName
 from .entity import Entity
 from . import util
+from . import data_frame_query
 from .data_set import DataSet
 from .datatype import DataType
 from .section import Section
+from .compression import Compression
 from six import string_types
 import csv
 
 
+# Size of the blocks of rows that are processed at once when a DataFrame
+# is rebuilt or rewritten
+_CHUNK_BYTES = 1 << 24
+
+
+# DataFrame.where reads single candidate rows from an index instead of whole
+# chunks if there are fewer than one in _SPARSE_FACTOR rows in the chunk
+_SPARSE_FACTOR = 32
+
+# Number of rows that are converted at once when a CSV file is imported
+_CSV_CHUNK_ROWS = 1 << 16
+
+
+def _csv_column_type(values):
+    """
+    Guesses the type of a column of a CSV file from its values (strings):
+    integer, float, or else string.
+    """
+    for dtype in (np.int64, np.float64):
+        try:
+            np.array(values, dtype=dtype)
+            return dtype
+        except (ValueError, OverflowError):
+            pass
+    return str
+
+
+def _csv_rows_to_array(rows, dtype):
+    """
+    Converts rows of a CSV file (lists of strings) into a structured array
+    of the given dtype, column by column.
+    """
+    if any(len(row) != len(dtype.names) for row in rows):
+        raise ValueError("Rows of the CSV file must have {} "
+                         "values".format(len(dtype.names)))
+    data = np.empty(len(rows), dtype=dtype)
+    for name, values in zip(dtype.names, zip(*rows)):
+        fieldtype = dtype.fields[name][0]
+        if fieldtype.kind == "O":
+            data[name] = values
+        elif fieldtype.kind == "b":
+            data[name] = [v.strip().lower() in ("true", "1") for v in values]
+        else:
+            data[name] = np.array(values, dtype=fieldtype)
+    return data
+
+
+def _import_pandas():
+    """
+    Imports pandas, which is only needed for converting DataFrames from and
+    to pandas.
+    """
+    try:
+        import pandas
+    except ImportError:
+        raise ImportError("pandas is required to convert DataFrames from "
+                          "and to pandas.DataFrame")
+    return pandas
+
+
+def _pandas_col_dict(frame):
+    """
+    Returns the column names and data types of a DataFrame that can hold
+    the columns of a pandas.DataFrame.
+    """
+    is_string_dtype = _import_pandas().api.types.is_string_dtype
+    col_dict = OrderedDict()
+    for colname, coltype in frame.dtypes.items():
+        if isinstance(coltype, np.dtype) and coltype.kind in "biuf":
+            col_dict[str(colname)] = coltype
+        elif is_string_dtype(coltype):
+            col_dict[str(colname)] = str
+        else:
+            raise TypeError("Column {} of type {} cannot be stored in a "
+                            "DataFrame".format(colname, coltype))
+    return col_dict
+
+
+def _pandas_to_array(frame, dtype):
+    """
+    Copies the columns of a pandas.DataFrame into a structured array of the
+    given dtype, one column at a time.
+    """
+    if len(frame.columns) != len(dtype.names):
+        raise ValueError("pandas.DataFrame has {} columns, expected "
+                         "{}".format(len(frame.columns), len(dtype.names)))
+    data = np.empty(len(frame), dtype=dtype)
+    for name, (_, column) in zip(dtype.names, frame.items()):
+        data[name] = column.to_numpy()
+    return data
+
+
+def _pandas_chunks(frames):
+    """
+    Yields the pandas.DataFrame ``frames``, or each of the pandas.DataFrames
+    if ``frames`` is an iterable of them (e.g. pandas.read_csv with a
+    chunksize).
+    """
+    if hasattr(frames, "dtypes"):
+        yield frames
+        return
+    for frame in frames:
+        yield frame
+
+
+class _SortedValues(object):
+    """
+    Read-only sequence over the sorted values of a column index, reading
+    single values on access, for binary searches with the bisect module.
+    """
+
+    def __init__(self, dataset):
+        self.dataset = dataset
+
+    def __len__(self):
+        return len(self.dataset)
+
+    def __getitem__(self, pos):
+        return util.decode_strings(self.dataset[pos])
+
+
+class DataFrameLayout(Enum):
+    """
+    The ways the data of a DataFrame can be stored in the file.
+
+    Compound: one dataset with a compound data type, i.e. one record per
+    row. Rows are read and written as a whole.
+
+    Columns: one dataset per column. Reading or appending a single column
+    does not touch the others, which suits frames with many columns.
+    This layout is an extension of nixpy and not part of the NIX file
+    format: the NIX C++ library and older versions of nixpy cannot read
+    such DataFrames. They are marked by a ``layout`` attribute on the
+    DataFrame group, and DataFrames with an unknown layout are refused.
+    """
+    Compound = "Compound"
+    Columns = "Columns"
+
+
 class DataFrame(Entity, DataSet):
 
     def __init__(self, nixfile, nixparent, h5group):
@@ -31,15 +175,154 @@ class DataFrame(Entity, DataSet):
         self._sources = None
         self._columns = None
         self._rows = None
+        self._column_cache = None
 
     @classmethod
     def create_new(cls, nixfile, nixparent, h5parent, name, type_,
-                   shape, col_dtype, compression):
+                   shape, col_dtype, compression,
+                   layout=DataFrameLayout.Compound):
         newentity = super(DataFrame, cls).create_new(nixfile, nixparent,
                                                      h5parent, name, type_)
-        newentity._h5group.create_dataset("data", (shape, ), col_dtype)
+        if layout == DataFrameLayout.Columns:
+            datacompr = compression == Compression.DeflateNormal
+            columns = newentity._h5group.open_group("columns", create=True)
+            for idx, colname in enumerate(col_dtype.names):
+                columns.create_dataset(str(idx), (shape, ),
+                                       col_dtype.fields[colname][0],
+                                       datacompr)
+            columns.set_attr("column_names",
+                             np.array(col_dtype.names, util.vlen_str_dtype))
+            newentity._h5group.set_attr("layout", layout.value)
+        else:
+            newentity._h5group.create_dataset("data", (shape, ), col_dtype)
         return newentity
 
+    @property
+    def layout(self):
+        """
+        The storage layout of the DataFrame in the file.
+        This is a read only property.
+
+        :type: DataFrameLayout
+        """
+        layout = self._h5group.get_attr("layout")
+        if layout is None:
+            # the standard NIX layout
+            return DataFrameLayout.Compound
+        try:
+            return DataFrameLayout(layout)
+        except ValueError:
+            raise RuntimeError("Unsupported layout '{}' of DataFrame "
+                               "{}".format(layout, self.name))
+
+    def _column_info(self):
+        """
+        Returns the column names of a DataFrame with the Columns layout and
+        a dictionary of the column datasets that have been opened so far.
+        Both are kept until a group or dataset is created or deleted in the
+        file (see File._generation), which covers appending a column.
+        """
+        cached = self._column_cache
+        generation = self._file._generation
+        if cached is None or cached[0] != generation:
+            colgroup = self._h5group.group["columns"]
+            names = tuple(util.decode_strings(colgroup.attrs["column_names"]))
+            cached = (generation, names, dict())
+            self._column_cache = cached
+        return cached[1], cached[2]
+
+    def _column_datasets(self, names=None):
+        """
+        Returns the (name, h5py dataset) pairs of the given columns, or of
+        all columns if names is None, of a DataFrame with the Columns
+        layout.
+        """
+        allnames, opened = self._column_info()
+        if names is None:
+            names = allnames
+        result = list()
+        for name in names:
+            if name not in opened:
+                if name not in allnames:
+                    raise ValueError("No column named {} in "
+                                     "DataFrame".format(name))
+                colgroup = self._h5group.group["columns"]
+                opened[name] = colgroup[str(allnames.index(name))]
+            result.append((name, opened[name]))
+        return result
+
+    @staticmethod
+    def _split_selection(sl):
+        """
+        Splits a selection into the row selection and the column names it
+        contains, as h5py does for compound datasets.
+        """
+        if sl is None:
+            sl = ()
+        elif not isinstance(sl, tuple):
+            sl = (sl, )
+        names = tuple(s for s in sl if isinstance(s, string_types))
+        rows = tuple(s for s in sl if not isinstance(s, string_types))
+        return rows or (np.s_[:], ), names
+
+    def _read_data(self, sl=None):
+        if self.layout == DataFrameLayout.Compound:
+            return super(DataFrame, self)._read_data(sl)
+        rows, names = self._split_selection(sl)
+        columns = self._column_datasets(names or None)
+        try:
+            values = [util.decode_strings(ds[rows]) for _, ds in columns]
+        except ValueError as ve:
+            raise IndexError(ve)
+        if len(names) == 1:
+            return values[0]
+        data = np.empty(np.shape(values[0]),
+                        dtype=[(n, ds.dtype) for n, ds in columns])
+        for (n, _), value in zip(columns, values):
+            data[n] = value
+        if not data.ndim:
+            return data[()]
+        return data
+
+    def _write_data(self, data, sl=None):
+        if self.layout == DataFrameLayout.Compound:
+            return super(DataFrame, self)._write_data(data, sl)
+        rows, names = self._split_selection(sl)
+        columns = self._column_datasets(names or None)
+        if len(names) == 1:
+            columns[0][1][rows] = data
+        else:
+            data = np.asarray(data,
+                              dtype=[(n, ds.dtype) for n, ds in columns])
+            for n, ds in columns:
+                ds[rows] = data[n]
+        self._data_modified()
+
+    def _get_dtype(self):
+        if self.layout == DataFrameLayout.Compound:
+            return super(DataFrame, self)._get_dtype()
+        return np.dtype([(n, ds.dtype) for n, ds in self._column_datasets()])
+
+    @property
+    def data_extent(self):
+        """
+        The number of rows of the DataFrame, as a tuple.
+
+        :type: tuple of int
+        """
+        if self.layout == DataFrameLayout.Compound:
+            return DataSet.data_extent.fget(self)
+        return self._h5group.group["columns"]["0"].shape
+
+    @data_extent.setter
+    def data_extent(self, extent):
+        if self.layout == DataFrameLayout.Compound:
+            DataSet.data_extent.fset(self, extent)
+            return
+        for _, ds in self._column_datasets():
+            ds.resize(extent)
+        self._data_modified()
+
     def append_column(self, column, name, datatype=None):
         """
         Append a new column to the DataFrame
@@ -61,21 +344,66 @@ class DataFrame(Entity, DataSet):
         if isclass(datatype) and any(issubclass(datatype, st)
                                      for st in string_types):
             datatype = util.vlen_str_dtype
+        if self.layout == DataFrameLayout.Columns:
+            self._append_column_dataset(column, name, datatype)
+            return
         dt_arr = [(n, dty) for n, dty in zip(self.column_names, self.dtype)]
         dt_arr.append((name, datatype))
         dt = np.dtype(dt_arr)
-        column = np.array(column, dtype=datatype)
-        new_da = []
-        for i, rows in enumerate(self._h5group.group['data'][:]):
-            li = list(rows)
-            li.append(column[i])
-            tu = tuple(li)
-            new_da.append(tu)
-        farr = np.ascontiguousarray(new_da, dtype=dt)
-        del self._h5group.group['data']
-        self._h5group.group['data'] = farr
-        self._h5group.create_dataset("data", (self.shape[0],), dt)
-        self.write_direct(farr)
+        column = np.asarray(column, dtype=datatype)
+        # The rows are copied into a new dataset chunk by chunk, so that
+        # memory use does not grow with the size of the DataFrame
+        group = self._h5group.group
+        olddata = group["data"]
+        tmpname = "data.append_column"
+        newdata = self._h5group.create_dataset(
+            tmpname, olddata.shape, dt,
+            compression=olddata.compression is not None
+        )
+        for attr, value in olddata.attrs.items():
+            newdata.set_attr(attr, value)
+        for sl in self._row_chunks(dt.itemsize):
+            oldrows = olddata[sl]
+            newrows = np.empty(len(oldrows), dtype=dt)
+            for field in olddata.dtype.names:
+                newrows[field] = oldrows[field]
+            newrows[name] = column[sl]
+            newdata.write_data(newrows, sl=sl)
+        del group["data"]
+        group.move(tmpname, "data")
+        self._data_modified()
+
+    def _append_column_dataset(self, column, name, datatype):
+        """
+        append_column for the Columns layout: only the new column is
+        written.
+        """
+        names = self.column_names
+        if name in names:
+            raise DuplicateColumnName
+        columns = self._h5group.open_group("columns")
+        first = columns.group["0"]
+        dataset = columns.create_dataset(
+            str(len(names)), first.shape, datatype,
+            compression=first.compression is not None
+        )
+        dataset.write_data(np.asarray(column, dtype=dataset.dtype))
+        columns.set_attr("column_names",
+                         np.array(names + (name, ), util.vlen_str_dtype))
+        self._data_modified()
+
+    def _row_chunks(self, itemsize, max_rows=None):
+        """
+        Yields slices that split the rows of the DataFrame into chunks of
+        about _CHUNK_BYTES bytes, given the size of a row, and of at most
+        max_rows rows.
+        """
+        nrows = len(self)
+        step = max(1, _CHUNK_BYTES // max(itemsize, 1))
+        if max_rows is not None:
+            step = min(step, max_rows)
+        for start in range(0, nrows, step):
+            yield np.s_[start:min(start + step, nrows)]
 
     def append_rows(self, data):
         """
@@ -105,15 +433,24 @@ class DataFrame(Entity, DataSet):
         """
         if len(column) != self.shape[0]:
             raise ValueError('If there are missing data, please fill in None')
-        if not index and not name:
+        if index is None and name is None:
             raise ValueError("Either index or name must not be None")
         if name is None:
             name = self._find_name_by_idx(index)
-        column = np.array(column)
-        for i, rows in enumerate(self._h5group.group['data'][:]):
-            cell = column[i]
-            rows[name] = cell
-            self.write_rows(rows=[rows], index=[i])
+        if self.layout == DataFrameLayout.Columns:
+            _, dataset = self._column_datasets((name, ))[0]
+            dataset[:] = np.asarray(column, dtype=dataset.dtype)
+            self._data_modified()
+            return
+        # h5py writes a single field of the compound dataset when it is
+        # given a structured array with only that field
+        dataset = self._h5group.group["data"]
+        field_dt = np.dtype([(name, dataset.dtype.fields[name][0])])
+        for sl in self._row_chunks(field_dt.itemsize):
+            cells = np.empty(sl.stop - sl.start, dtype=field_dt)
+            cells[name] = column[sl]
+            dataset[sl, name] = cells
+        self._data_modified()
 
     def read_columns(self, index=None, name=None, sl=None,
                      group_by_cols=False):
@@ -130,31 +467,27 @@ class DataFrame(Entity, DataSet):
                               False for group by rows.
                               Only applicable for reading multiple columns
         :type group_by_cols: bool
+
+        :returns: The values of a single column, an array with one row per
+                  column if group_by_cols is True, or else a structured
+                  array with only the requested columns
+        :rtype: numpy.ndarray
         """
         if index is None and name is None:
             raise ValueError("Either index or name must not be None")
         if name is None:
-            name = []
-            for ci in index:
-                name.append(self.column_names[ci])
+            name = [self.column_names[ci] for ci in index]
         if sl is None:
-            slic = np.s_[:]
-        else:
-            slic = np.s_[sl]
+            sl = np.s_[:]
+        if not isinstance(sl, tuple):
+            sl = (sl, )
+        # Only the requested fields (or column datasets) are read
+        data = self._read_data(sl + tuple(name))
         if len(name) == 1:
-            get_col = self._read_data(sl=slic)[name]
-            get_col = [i[0] for i in get_col]
-            return np.array(get_col)
+            return data
         if group_by_cols:
-            gcol = []
-            for n in name:
-                get_col = self._read_data(sl=slic)[n]
-                get_col = [i for i in get_col]
-                gcol.append(get_col)
-            return np.array(gcol)
-        else:
-            get_col = self._read_data(sl=slic)[name]
-            return get_col
+            return np.array([data[n] for n in name])
+        return data
 
     def write_rows(self, rows, index):
         """
@@ -280,6 +613,255 @@ class DataFrame(Entity, DataSet):
         for i, row in enumerate(self._read_data(sl=row_sl)[list(cl)]):
             print(row_form.format("  [{}]:".format(ridx[i]), *row))
 
+    def to_pandas(self, columns=None, rows=None, chunksize=None):
+        """
+        Returns (part of) the DataFrame as a pandas.DataFrame. Only the
+        requested columns are read, and they are passed to pandas as NumPy
+        arrays. The units of the columns are stored in the ``attrs``
+        dictionary of the pandas.DataFrame under ``"units"``.
+
+        With a ``chunksize``, a generator is returned that reads and yields
+        the rows in pandas.DataFrames of at most ``chunksize`` rows, which
+        allows processing DataFrames that do not fit into memory. The index
+        of each pandas.DataFrame holds the row numbers in this DataFrame.
+
+        Requires pandas.
+
+        :param columns: Names or indices of the columns to return; None for
+                        all columns
+        :type columns: list of str or int
+        :param rows: The rows to return; None for all rows
+        :type rows: slice or list of int
+        :param chunksize: The number of rows per pandas.DataFrame, or None
+                          to return all rows in one pandas.DataFrame
+        :type chunksize: int
+
+        :returns: A pandas.DataFrame or a generator of pandas.DataFrames
+        """
+        pandas = _import_pandas()
+        if columns is None:
+            names = self.column_names
+        else:
+            names = tuple(self.column_names[c] if isinstance(c, Integral)
+                          else c for c in columns)
+        nrows = len(self)
+        if rows is None:
+            rows = np.s_[:]
+        if isinstance(rows, slice):
+            start, stop, step = rows.indices(nrows)
+            index = range(start, stop, step)
+        else:
+            index = np.asarray(rows)
+        if chunksize is None:
+            return self._pandas_frame(pandas, names, rows, index)
+        return self._iter_pandas(pandas, names, index, chunksize)
+
+    def _iter_pandas(self, pandas, names, index, chunksize):
+        for pos in range(0, len(index), chunksize):
+            chunk = index[pos:pos + chunksize]
+            if isinstance(chunk, range):
+                rows = np.s_[chunk.start:chunk.stop:chunk.step]
+            else:
+                rows = chunk
+            yield self._pandas_frame(pandas, names, rows, chunk)
+
+    def _pandas_frame(self, pandas, names, rows, index):
+        data = self._read_data((rows, ) + tuple(names))
+        if len(names) == 1:
+            columns = {names[0]: data}
+        else:
+            columns = OrderedDict((n, data[n]) for n in names)
+        if isinstance(index, range):
+            index = pandas.RangeIndex(index.start, index.stop, index.step)
+        frame = pandas.DataFrame(columns, index=index, columns=list(names))
+        units = self.units
+        if units is not None:
+            frame.attrs["units"] = dict(
+                (n, u) for n, u in zip(self.column_names, units)
+                if n in names and u is not None
+            )
+        return frame
+
+    def _read_fields(self, sl, names):
+        """
+        Reads the given columns of a selection of rows into a dictionary of
+        arrays.
+        """
+        data = self._read_data((sl, ) + tuple(names))
+        if len(names) == 1:
+            return {names[0]: data}
+        return dict((n, data[n]) for n in names)
+
+    def create_index(self, column):
+        """
+        Creates a sorted index of a column, which DataFrame.where uses to
+        find the rows that satisfy comparisons with the column without
+        scanning it. The index is stored in the file. It is removed when the
+        data of the DataFrame is modified and has to be created again. Rows
+        with a NaN value are not part of the index.
+
+        :param column: The name or index of the column
+        :type column: str or int
+        """
+        if isinstance(column, Integral):
+            column = self.column_names[column]
+        position = self.column_names.index(column)
+        values = self._read_data((np.s_[:], column))
+        if values.dtype.kind in "fc":
+            # NaN does not satisfy any comparison that is answered from the
+            # index, so NaN rows are left out
+            rows = np.flatnonzero(~np.isnan(values))
+            order = rows[np.argsort(values[rows], kind="stable")]
+        else:
+            order = np.argsort(values, kind="stable")
+        indices = self._h5group.open_group("indices", create=True)
+        name = str(position)
+        if name in indices:
+            del indices[name]
+        index = indices.open_group(name, create=True)
+        index.write_data("values", values[order],
+                         dtype=self.data_type.fields[column][0])
+        index.write_data("rows", order.astype(np.int64), dtype=np.int64)
+
+    def _data_modified(self):
+        super(DataFrame, self)._data_modified()
+        if "indices" in self._h5group:
+            del self._h5group["indices"]
+
+    def _index_rows(self, expr):
+        """
+        Returns the sorted numbers of the rows that satisfy a comparison
+        (see data_frame_query), or None if there is no index for the
+        column or the comparison cannot be answered from it.
+        """
+        _, column, op, value = expr
+        if op == "!=" or "indices" not in self._h5group:
+            return None
+        name = str(self.column_names.index(column))
+        indices = self._h5group.group["indices"]
+        if name not in indices:
+            return None
+        values = _SortedValues(indices[name]["values"])
+        try:
+            lower, upper = 0, len(values)
+            if op in ("==", ">="):
+                lower = bisect_left(values, value)
+            elif op == ">":
+                lower = bisect_right(values, value)
+            if op in ("==", "<="):
+                upper = bisect_right(values, value)
+            elif op == "<":
+                upper = bisect_left(values, value)
+        except TypeError:
+            # values that cannot be compared with the column
+            return None
+        if lower >= upper:
+            return np.array([], dtype=np.int64)
+        return np.sort(indices[name]["rows"][lower:upper])
+
+    def where(self, condition, columns=None):
+        """
+        Returns the numbers of the rows that satisfy a condition. The rows
+        are processed in chunks and only the columns the condition refers to
+        are read.
+
+        The condition is either a string (see nixio.data_frame_query), e.g.
+        ``"trial_type == 'go' and rt < 0.5"``, or a function. A function is
+        called for each chunk with a dictionary that maps the names of the
+        ``columns`` (all columns by default) to the arrays of their values
+        in the chunk, and must return an array of bool.
+
+        When a comparison of a condition string that is combined with the
+        rest of the condition by ``and`` refers to a column with an index
+        (see create_index), the index is used to find the candidate rows,
+        and only the chunks that contain candidates are read.
+
+        The result can be passed to read_rows or to_pandas to read the rows.
+
+        :param condition: The condition
+        :type condition: str or function
+        :param columns: The columns passed to a condition function
+        :type columns: list of str
+
+        :returns: The numbers of the matching rows in increasing order
+        :rtype: numpy.ndarray of int
+        """
+        if callable(condition):
+            names = (list(self.column_names) if columns is None
+                     else list(columns))
+
+            def test(data, nrows):
+                return np.broadcast_to(
+                    np.asarray(condition(data), dtype=bool), (nrows, )
+                )
+            return self._scan_rows(test, names)
+
+        expr = data_frame_query.parse(condition)
+        unknown = (set(data_frame_query.columns(expr)) -
+                   set(self.column_names))
+        if unknown:
+            raise ValueError("No column named {} in DataFrame".format(
+                ", ".join(sorted(unknown))
+            ))
+        candidates, terms = self._plan_index(expr)
+        if candidates is not None and not terms:
+            return candidates
+        expr = data_frame_query.conjunction(terms)
+
+        def test(data, nrows):
+            return data_frame_query.evaluate(expr, data, nrows)
+        return self._scan_rows(test, data_frame_query.columns(expr),
+                               candidates)
+
+    def _plan_index(self, expr):
+        """
+        Looks for a comparison combined by ``and`` with the rest of the
+        condition that can be answered from an index. Returns the rows
+        found in the index (None if no index could be used) and the
+        remaining terms that still have to be evaluated on the data.
+        """
+        terms = data_frame_query.conjuncts(expr)
+        for term in terms:
+            if term[0] != "compare":
+                continue
+            candidates = self._index_rows(term)
+            if candidates is not None:
+                terms.remove(term)
+                return candidates, terms
+        return None, terms
+
+    def _scan_rows(self, test, names, candidates=None):
+        """
+        Evaluates ``test`` chunk by chunk on the columns ``names`` and
+        returns the matching rows. If ``candidates`` is given, only those
+        rows can match and chunks without candidates are skipped.
+        """
+        dtype = self.data_type
+        itemsize = sum(dtype.fields[n][0].itemsize for n in names)
+        matches = list()
+        for sl in self._row_chunks(itemsize):
+            if candidates is None:
+                mask = test(self._read_fields(sl, names), sl.stop - sl.start)
+                matches.append(np.flatnonzero(mask) + sl.start)
+                continue
+            lower, upper = np.searchsorted(candidates, (sl.start, sl.stop))
+            if lower < upper:
+                matches.append(self._scan_candidates(test, names, sl,
+                                                     candidates[lower:upper]))
+        if not matches:
+            return np.array([], dtype=np.int64)
+        return np.concatenate(matches).astype(np.int64)
+
+    def _scan_candidates(self, test, names, sl, chunkrows):
+        nrows = sl.stop - sl.start
+        if len(chunkrows) * _SPARSE_FACTOR < nrows:
+            # few candidates: reading single rows is cheaper than
+            # reading the whole chunk
+            mask = test(self._read_fields(chunkrows, names), len(chunkrows))
+            return chunkrows[mask]
+        mask = test(self._read_fields(sl, names), nrows)
+        return chunkrows[mask[chunkrows - sl.start]]
+
     def _find_idx_by_name(self, name):
         for i, n in enumerate(self.column_names):
             if n == name:
@@ -300,29 +882,24 @@ class DataFrame(Entity, DataSet):
 
     def write_to_csv(self, filename, mode='w'):
         """
-        Export the whole DataFrame to a CSV file
+        Export the whole DataFrame to a CSV file. The rows are read and
+        written in chunks, so memory use does not grow with the size of
+        the DataFrame.
 
         :param filename: The resulted/ targeted CSV file to write to/ create
         :type filename: str
-        :param mode: The column name in which the targeted cell belongs to
+        :param mode: The mode in which the file is opened ('w' or 'a')
         :type mode: str
         """
         with open(filename, mode, newline='') as csvfile:
-            dw = csv.DictWriter(csvfile, fieldnames=self.column_names)
-            dw.writeheader()
-            di = dict()
-            for n in self.column_names:
-                n = str(n)
-                di[n] = list(self[n])
-            complete_di_list = []
-            sample_len = len(self[n])
-            for i in range(sample_len):
-                single_sample_di = dict()
-                for na in self.column_names:
-                    single_sample_di[na] = di[na][i]
-                complete_di_list.append(single_sample_di)
-            dw.writerows(complete_di_list)
-            csvfile.close()
+            writer = csv.writer(csvfile)
+            writer.writerow(self.column_names)
+            # rows are converted to Python objects, which take much more
+            # memory than the array, so chunks are limited to a row count
+            chunks = self._row_chunks(self.data_type.itemsize,
+                                      _CSV_CHUNK_ROWS)
+            for sl in chunks:
+                writer.writerows(self._read_data(sl).tolist())
 
     @property
     def units(self):
@@ -349,7 +926,7 @@ class DataFrame(Entity, DataSet):
         unit = np.array(u, util.vlen_str_dtype)
         self._h5group.set_attr("units", unit)
         if self.file.auto_update_timestamps:
-            self.force_updated_at()
+            self.file._updated(self._h5group)
 
     @property
     def columns(self):
@@ -376,6 +953,8 @@ class DataFrame(Entity, DataSet):
 
         :type: list of str
         """
+        if self.layout == DataFrameLayout.Columns:
+            return self._column_info()[0]
         dt = self._h5group.group["data"].dtype
         return dt.names
 
@@ -387,7 +966,7 @@ class DataFrame(Entity, DataSet):
 
         :type: list of DataType
         """
-        dt = self._h5group.group["data"].dtype
+        dt = self._get_dtype()
         key = self.column_names
         di = OrderedDict()
         for k in key:
@@ -406,7 +985,7 @@ class DataFrame(Entity, DataSet):
 
         :type: tuple
         """
-        x = len(self._h5group.group["data"])
+        x = len(self)
         y = len(self.column_names)
         df_shape = (x, y)
         df_shape = tuple(df_shape)
@@ -423,8 +1002,9 @@ class DataFrame(Entity, DataSet):
         :type: Section
         """
         if "metadata" in self._h5group:
-            return Section(self.file, None,
-                           self._h5group.open_group("metadata"))
+            return self.file._entity(
+                Section, None, self._h5group.open_group("metadata")
+            )
         else:
             return None
 
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+# Copyright © 2026, German Neuroinformatics Node (G-Node)
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted under the terms of the BSD License. See
+# LICENSE file in the root of the Project.
+"""
+Conditions on the rows of a DataFrame (see DataFrame.where).
+
+A condition is made of comparisons ``column <op> value``, where ``<op>`` is
+one of ``==``, ``!=``, ``<``, ``<=``, ``>``, ``>=``, combined with ``and``,
+``or`` and ``not`` (in increasing order of precedence) and grouped with
+parentheses, e.g.::
+
+    trial_type == 'go' and rt < 0.5
+
+Column names containing spaces or special characters can be quoted with
+``'`` or ``"``. Values are quoted strings, numbers, ``true`` or ``false``.
+"""
+import operator
+import numpy as np
+
+from .metadata_query import _Parser
+
+
+_OPERATORS = {"==": operator.eq, "!=": operator.ne,
+              "<": operator.lt, "<=": operator.le,
+              ">": operator.gt, ">=": operator.ge}
+
+
+class _ConditionParser(_Parser):
+
+    what = "DataFrame condition"
+
+    def parse_term(self):
+        if self.peek() == ("word", "not"):
+            self.take()
+            return ("not", self.parse_term())
+        if self.peek() == ("paren", "("):
+            self.take()
+            expr = self.parse_or()
+            self.expect("paren", ")")
+            return expr
+        name = self.parse_name()
+        kind, op = self.take()
+        if kind != "op":
+            raise self.error("expected a comparison after {!r}", name)
+        return ("compare", name, op, self.parse_value())
+
+
+def parse(condition):
+    """
+    Parses a condition (see module documentation) into a tree of tuples.
+
+    :param condition: The condition
+    :type condition: str
+
+    :returns: The parsed condition
+    :rtype: tuple
+    """
+    return _ConditionParser(condition).parse()
+
+
+def columns(expr):
+    """
+    Returns the names of the columns a parsed condition refers to, in order
+    of appearance.
+
+    :rtype: list of str
+    """
+    if expr[0] == "compare":
+        return [expr[1]]
+    names = list()
+    for sub in expr[1:]:
+        names.extend(n for n in columns(sub) if n not in names)
+    return names
+
+
+def conjuncts(expr):
+    """
+    Splits a parsed condition into the conditions that are combined with
+    ``and`` at the top level.
+
+    :rtype: list of tuple
+    """
+    if expr[0] == "and":
+        return conjuncts(expr[1]) + conjuncts(expr[2])
+    return [expr]
+
+
+def conjunction(exprs):
+    """
+    Combines parsed conditions with ``and`` (the inverse of conjuncts).
+
+    :rtype: tuple
+    """
+    expr = exprs[0]
+    for other in exprs[1:]:
+        expr = ("and", expr, other)
+    return expr
+
+
+def evaluate(expr, data, nrows):
+    """
+    Evaluates a parsed condition on a chunk of rows.
+
+    :param expr: The parsed condition
+    :param data: The values of the referenced columns in the chunk
+    :type data: dict of {str: numpy.ndarray}
+    :param nrows: The number of rows in the chunk
+
+    :returns: For each row, whether it satisfies the condition
+    :rtype: numpy.ndarray of bool
+    """
+    kind = expr[0]
+    if kind == "compare":
+        _, name, op, value = expr
+        result = _OPERATORS[op](data[name], value)
+    elif kind == "not":
+        result = ~evaluate(expr[1], data, nrows)
+    elif kind == "and":
+        result = evaluate(expr[1], data, nrows) & evaluate(expr[2], data,
+                                                           nrows)
+    else:
+        result = evaluate(expr[1], data, nrows) | evaluate(expr[2], data,
+                                                           nrows)
+    # comparisons between incompatible types give a single bool
+    return np.broadcast_to(np.asarray(result, dtype=bool), (nrows, ))
@@ -7,7 +7,6 @@
 # modification, are permitted under the terms of the BSD License. See
 # LICENSE file in the root of the Project.
 import numpy as np
-from six import ensure_str
 from . import util
 
 
@@ -121,14 +120,22 @@ class DataSet(object):
     def _write_data(self, data, sl=None):
         dataset = self._h5group.get_dataset("data")
         dataset.write_data(data,  sl)
+        self._data_modified()
+
+    def _data_modified(self):
+        """
+        Invalidates values derived from the data of this object that are
+        cached on the File (see File._get_derived).
+        Must be called whenever the underlying data is modified.
+        """
+        versions = self._file._data_versions
+        if self._file._derived_cache:
+            eid = self._h5group.get_attr("entity_id")
+            versions[eid] = versions.get(eid, 0) + 1
 
     def _read_data(self, sl=None):
         dataset = self._h5group.get_dataset("data")
-        data = dataset.read_data(sl)
-        if data.dtype == util.vlen_str_dtype:
-            data = np.array([ensure_str(d) for d in data],
-                            dtype=util.vlen_str_dtype)
-        return data
+        return util.decode_strings(dataset.read_data(sl))
 
     @property
     def data_extent(self):
@@ -144,6 +151,7 @@ class DataSet(object):
     def data_extent(self, extent):
         dataset = self._h5group.get_dataset("data")
         dataset.shape = extent
+        self._data_modified()
 
     @property
     def data_type(self):
@@ -39,6 +39,7 @@ class DataView(DataSet):
 
         self.array = da
         self._h5group = self.array._h5group
+        self._file = self.array.file
         self._slices = slices
 
     @property
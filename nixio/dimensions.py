@@ -19,6 +19,7 @@ from .datatype import DataType
 from .dimension_type import DimensionType
 from . import util
 from .container import Container
+from .data_frame import DataFrame
 from .exceptions import IncompatibleDimensions, OutOfBounds
 
 
@@ -115,19 +116,37 @@ class DimensionLink(object):
         """
         Returns the values (vector or column) from the linked data object
         (DataArray or DataFrame) specified by the LinkDimension's index.
+
+        Only the selected vector or column is read from the file and the
+        result is cached until the linked data is modified. The returned
+        array is read-only.
         """
-        data = self.linked_data
-        if self._data_object_type == "DataArray":
-            dimindex = list(self.index)
-            # replace -1 with slice(None)
-            dimindex[dimindex.index(-1)] = slice(None)
-            return data[tuple(dimindex)]
-        elif self._data_object_type == "DataFrame":
-            return tuple(row[self.index] for row in data)
-        else:
+        lobj = self._linked_group()
+        index = self.index
+        dotype = self._data_object_type
+        if dotype not in ("DataArray", "DataFrame"):
             raise RuntimeError("Invalid DataObjectType attribute found in "
                                "DimensionLink")
 
+        def read_values():
+            if dotype == "DataArray":
+                dset = lobj.group["data"]
+                dimindex = list(index)
+                # replace -1 with slice(None): reads a single hyperslab
+                dimindex[dimindex.index(-1)] = slice(None)
+                values = dset[tuple(dimindex)]
+            else:
+                # reads only the linked column, in either layout
+                dframe = DataFrame(self._file, None, lobj)
+                values = dframe.read_columns(index=[index])
+            values = np.asarray(values)
+            values.flags.writeable = False
+            return values
+
+        lid = lobj.get_attr("entity_id")
+        return self._file._get_derived(("DimensionLink", lid, index),
+                                       (lid,), read_values)
+
     @property
     def unit(self):
         """
@@ -171,8 +190,7 @@ class DimensionLink(object):
         if self._data_object_type == "DataArray":
             return lobj.get_attr("label")
         elif self._data_object_type == "DataFrame":
-            col_dts = lobj.group["data"].dtype
-            return col_dts.names[self.index]
+            return DataFrame(self._file, None, lobj).column_names[self.index]
         else:
             raise RuntimeError("Invalid DataObjectType attribute found in "
                                "DimensionLink")
@@ -319,16 +337,18 @@ class SampledDimension(Dimension):
         """
         Returns the index of a certain position in the dimension.
 
-        :param position: The position.
+        :param position: The position, or an array of positions.
 
-        :returns: The nearest index.
-        :rtype: int
+        :returns: The nearest index, or an array of the nearest indices.
+        :rtype: int or numpy.ndarray of int
         """
         offset = self.offset if self.offset else 0
         sample = self.sampling_interval
-        index = np.round((position - offset) / sample)
-        if index < 0:
+        index = np.round((np.asarray(position) - offset) / sample)
+        if np.any(index < 0):
             raise IndexError("Position is out of bounds of this dimension!")
+        if index.ndim:
+            return index.astype(np.int64)
         return int(index)
 
     def axis(self, count, start=0):
@@ -466,20 +486,19 @@ class RangeDimension(Dimension):
     def index_of(self, position):
         """
         Returns the index of a certain position in the dimension.
+        Positions before the first or after the last tick map to the first
+        or last index.
 
-        :param position: The position.
+        :param position: The position, or an array of positions.
 
-        :returns: The nearest index.
-        :rtype: int
+        :returns: The nearest index, or an array of the nearest indices.
+        :rtype: int or numpy.ndarray of int
         """
-        ticks = self.ticks
-        if position <= ticks[0]:
-            return 0
-        elif position >= ticks[-1]:
-            return len(ticks) - 1
-
-        ticks = np.array(ticks)
+        ticks = np.asarray(self.ticks)
         pidxs = np.searchsorted(ticks, position, side="right") - 1
+        pidxs = np.clip(pidxs, 0, len(ticks) - 1)
+        if np.ndim(pidxs):
+            return pidxs.astype(np.int64)
         return int(pidxs)
 
     def tick_at(self, index):
@@ -535,10 +554,7 @@ class SetDimension(Dimension):
         else:
             labels = self._h5group.get_data("labels")
 
-        if len(labels) and isinstance(labels[0], bytes):
-            labels = tuple(label.decode() for label in labels)
-
-        return tuple(labels)
+        return tuple(util.decode_strings(labels))
 
     @labels.setter
     def labels(self, labels):
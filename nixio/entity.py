@@ -13,7 +13,8 @@ from . import util
 class Entity(object):
 
     def __init__(self, nixfile, nixparent, h5group):
-        util.check_entity_id(h5group.get_attr("entity_id"))
+        if not h5group.trusted:
+            util.check_entity_id(h5group.get_attr("entity_id"))
         self._h5group = h5group
         self._parent = nixparent
         self._file = nixfile
@@ -31,11 +32,32 @@ class Entity(object):
         h5group.set_attr("type", type_)
         h5group.set_attr("entity_id", id_)
 
-        newentity = cls(nixfile, nixparent, h5group)
+        newentity = nixfile._entity(cls, nixparent, h5group)
         newentity.force_created_at()
         newentity.force_updated_at()
         return newentity
 
+    @classmethod
+    def create_many(cls, nixfile, nixparent, h5parent, names, types):
+        """
+        Creates new entities with the given names and types. All entities
+        share one creation time. Names and types are not checked, this is
+        up to the caller.
+
+        :returns: The new entities
+        :rtype: list
+        """
+        stamp = util.time_to_str(util.now_int())
+        entities = list()
+        for name, type_ in zip(names, types):
+            h5group = h5parent.open_group(name, create=True)
+            h5group.create_str_attrs([("name", name), ("type", type_),
+                                      ("entity_id", util.create_id()),
+                                      ("created_at", stamp),
+                                      ("updated_at", stamp)])
+            entities.append(nixfile._entity(cls, nixparent, h5group))
+        return entities
+
     @property
     def id(self):
         """
@@ -121,7 +143,7 @@ class Entity(object):
         util.check_attr_type(d, str)
         self._h5group.set_attr("definition", d)
         if self.file.auto_update_timestamps:
-            self.force_updated_at()
+            self.file._updated(self._h5group)
 
     @property
     def name(self):
@@ -151,8 +173,9 @@ class Entity(object):
             raise AttributeError("type can't be None")
         util.check_attr_type(t, str)
         self._h5group.set_attr("type", t)
+        self.file._metadata_modified()
         if self.file.auto_update_timestamps:
-            self.force_updated_at()
+            self.file._updated(self._h5group)
 
     def __eq__(self, other):
         """
@@ -15,7 +15,8 @@ from .util import util
 class Feature(object):
 
     def __init__(self, nixfile, nixparent, h5group):
-        util.check_entity_id(h5group.get_attr("entity_id"))
+        if not h5group.trusted:
+            util.check_entity_id(h5group.get_attr("entity_id"))
         self._h5group = h5group
         self._parent = nixparent
         self._file = nixfile
@@ -54,15 +55,14 @@ class Feature(object):
         lt = LinkType(lt)
         self._h5group.set_attr("link_type", lt.value)
         if self.file.auto_update_timestamps:
-            t = util.now_int()
-            self._h5group.set_attr("updated_at", util.time_to_str(t))
+            self.file._updated(self._h5group)
 
     @property
     def data(self):
         if "data" not in self._h5group:
             raise RuntimeError("Feature.data: DataArray not found!")
-        return DataArray(self.file, self._parent._parent,
-                         self._h5group.open_group("data"))
+        return self.file._entity(DataArray, self._parent._parent,
+                                 self._h5group.open_group("data"))
 
     @data.setter
     def data(self, da):
@@ -75,8 +75,7 @@ class Feature(object):
             del self._h5group["data"]
         self._h5group.create_link(da, "data")
         if self.file.auto_update_timestamps:
-            t = util.now_int()
-            self._h5group.set_attr("updated_at", util.time_to_str(t))
+            self.file._updated(self._h5group)
 
     @property
     def created_at(self):
@@ -8,7 +8,10 @@
 # LICENSE file in the root of the Project.
 import os
 import gc
+import weakref
+from collections import deque
 import numpy as np
+from contextlib import contextmanager
 from warnings import warn
 
 try:
@@ -20,6 +23,8 @@ import h5py
 from .hdf5.h5group import H5Group
 from .block import Block
 from .section import Section
+from .metadata_snapshot import MetadataSnapshot
+from .metadata_query import MetadataIndex
 from .container import Container, SectionContainer
 from . import util
 from .exceptions import InvalidFile, DuplicateName
@@ -104,6 +109,9 @@ class File(object):
         except (UnicodeError, LookupError):
             pass
 
+        # incremented by H5Group whenever a group, dataset or link is
+        # created or deleted, to detect outdated structural caches
+        self._generation = 0
         if not os.path.exists(path) and mode == FileMode.ReadOnly:
             raise RuntimeError(
                 "Cannot open non-existent file in ReadOnly mode!"
@@ -115,12 +123,14 @@ class File(object):
             fid = h5py.h5f.create(path, flags=h5mode, fapl=make_fapl(),
                                   fcpl=make_fcpl())
             self._h5file = h5py.File(fid)
+            H5Group.register_file(self._h5file, self)
             self._root = H5Group(self._h5file, "/", create=True)
             self._create_header()
         else:
             h5mode = map_file_mode(mode)
             fid = h5py.h5f.open(path, flags=h5mode, fapl=make_fapl())
             self._h5file = h5py.File(fid)
+            H5Group.register_file(self._h5file, self)
             self._root = H5Group(self._h5file, "/")
 
         self._h5group = self._root  # to match behaviour of other objects
@@ -139,6 +149,21 @@ class File(object):
         # make container props but don't initialise
         self._blocks = None
         self._sections = None
+        # values derived from entity data (see _get_derived)
+        self._derived_cache = dict()
+        self._data_versions = dict()
+        # reverse index of entity references (see _delete_entities)
+        self._reference_index = None
+        # location and parent of every section (see _section_index)
+        self._sections_index = None
+        # entities referring to each section (see _metadata_references)
+        self._metadata_refs = None
+        # inverted index of the metadata tree (see query_metadata)
+        self._metadata_query_index = None
+        # objects with pending updated_at writes (see batch)
+        self._touched = None
+        # identity map of the entities in use (see _entity)
+        self._entities = weakref.WeakValueDictionary()
 
     @classmethod
     def open(cls, path, mode=FileMode.ReadWrite, compression=Compression.Auto,
@@ -289,6 +314,43 @@ class File(object):
             util.check_attr_type(t, int)
         self._h5file.attrs["updated_at"] = util.time_to_str(t)
 
+    def _updated(self, h5obj):
+        """
+        Sets the update time of the given backend object to the current
+        time, or, within a :meth:`batch`, when the batch ends.
+        """
+        if self._touched is not None:
+            self._touched[h5obj.h5obj.id] = h5obj
+        else:
+            h5obj.set_attr("updated_at", util.time_to_str(util.now_int()))
+
+    @contextmanager
+    def batch(self):
+        """
+        Context manager for bulk modifications. Within the context, the
+        automatic updates of the `updated_at` attribute of modified objects
+        are collected and each object's `updated_at` is written once, when
+        the context is left. Nested batches are merged into the outermost
+        one.
+
+        Example::
+
+            with nixfile.batch():
+                for da in block.data_arrays:
+                    da.unit = "mV"
+        """
+        if self._touched is not None:
+            yield self
+            return
+        self._touched = dict()
+        try:
+            yield self
+        finally:
+            touched, self._touched = self._touched, None
+            stamp = util.time_to_str(util.now_int())
+            for h5obj in touched.values():
+                h5obj.set_attr("updated_at", stamp)
+
     def is_open(self):
         """
         Checks whether a file is open or closed.
@@ -364,6 +426,8 @@ class File(object):
         obj._parent._h5group.copy(source=src, dest=self._h5group,
                                   name=name, cls=clsname,
                                   shallow=not children, keep_id=keep_id)
+        self._sections_index = None
+        self._metadata_modified()
 
         if not children:
             for p in obj.props:
@@ -372,6 +436,208 @@ class File(object):
 
         return self.sections[obj.name]
 
+    def _entity(self, cls, nixparent, h5group):
+        """
+        Returns the object of class ``cls`` for the given backend group.
+
+        As long as an object is in use, every access to the same HDF5 object
+        (through the same parent object) returns this object, together with
+        the containers it has already opened, instead of creating and
+        validating a new one.
+        """
+        key = (h5group.h5obj.id, cls, id(nixparent))
+        entity = self._entities.get(key)
+        if entity is None:
+            entity = cls(self, nixparent, h5group)
+            self._entities[key] = entity
+        return entity
+
+    def _get_derived(self, key, dependencies, builder):
+        """
+        Returns a cached value that is derived from the data of the entities
+        with the given ids. The value is (re)built by calling ``builder`` if
+        it is not cached yet or if the data of any of the dependencies has
+        been modified since it was built.
+
+        :param key: Hashable key identifying the derived value
+        :param dependencies: Ids of the entities the value is derived from
+        :param builder: Function without arguments that builds the value
+        """
+        stamp = tuple((eid, self._data_versions.get(eid, 0))
+                      for eid in dependencies)
+        cached = self._derived_cache.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        value = builder()
+        self._derived_cache[key] = (stamp, value)
+        return value
+
+    def _delete_entities(self, ids):
+        """
+        Deletes the entities with the given ids and all links to them.
+
+        The links are looked up in a reverse index of all references in the
+        file. The index is built on first use and kept until a group,
+        dataset or link is created or deleted, so that consecutive
+        deletions do not have to traverse the file again. Changes made
+        directly through h5py are not tracked.
+
+        :param ids: Ids of the entities to delete
+        """
+        cached = self._reference_index
+        if cached is None or cached[0] != self._generation:
+            cached = (self._generation, self._root.reference_index())
+            self._reference_index = cached
+        self._root.delete_many(ids, cached[1])
+        if self._sections_index is not None:
+            for eid in ids:
+                self._sections_index.pop(eid, None)
+        if self._metadata_refs is not None:
+            for eid in ids:
+                self._metadata_refs.pop(eid, None)
+        self._metadata_modified()
+
+    def _section_index(self):
+        """
+        Returns a dictionary that maps the id of every section in the file to
+        the HDF5 path of the section and the id of its parent section (None
+        for top-level sections).
+
+        The index is built in one pass over the metadata tree on first use.
+        Afterwards it is updated when sections are created or deleted, so
+        that looking up the parent of a section does not have to search the
+        tree.
+        """
+        if self._sections_index is None:
+            index = dict()
+            metadata = self._metadata.group
+            queue = deque((grp, None) for grp in metadata.values())
+            while queue:
+                grp, parent_id = queue.popleft()
+                eid = grp.attrs["entity_id"]
+                if isinstance(eid, bytes):
+                    eid = eid.decode()
+                index[eid] = (grp.name, parent_id)
+                # follow the "sections" groups only: linked sections are
+                # reached through their own parents
+                children = grp.get("sections")
+                if children is not None:
+                    queue.extend((child, eid) for child in children.values())
+            self._sections_index = index
+        return self._sections_index
+
+    def _section_added(self, section, parent):
+        """
+        Records a newly created section in the section index.
+
+        :param section: The new section
+        :param parent: The parent section or None for top-level sections
+        """
+        self._metadata_modified()
+        if self._sections_index is not None:
+            parent_id = parent.id if parent is not None else None
+            self._sections_index[section.id] = (section._h5group.group.name,
+                                                parent_id)
+
+    def _section_by_id(self, id_):
+        """
+        Returns the section with the given id using the section index.
+        """
+        path, parent_id = self._section_index()[id_]
+        if parent_id is None:
+            parent = self
+        else:
+            parent = self._section_by_id(parent_id)
+        h5group = H5Group.create_from_h5obj(self._h5file[path])
+        return self._entity(Section, parent, h5group)
+
+    def _metadata_references(self):
+        """
+        Returns a dictionary that maps the id of every section that is used
+        as metadata to the entities referring to it. Each entity is listed as
+        a (block name, container name, entity name, entity id) tuple, where
+        the container name is None for blocks.
+
+        The index is built in one pass over the blocks on first use and
+        updated when the metadata of an entity is set or deleted (see
+        _metadata_changed). Entries of entities that have been deleted since
+        are skipped when the index is used (see _referring_entities).
+        """
+        if self._metadata_refs is None:
+            index = dict()
+
+            def add(grp, blkname, container, name):
+                mdgrp = grp.get("metadata")
+                if mdgrp is None:
+                    return
+                secid, eid = (mdgrp.attrs["entity_id"], grp.attrs["entity_id"])
+                if isinstance(secid, bytes):
+                    secid = secid.decode()
+                if isinstance(eid, bytes):
+                    eid = eid.decode()
+                index.setdefault(secid, list()).append(
+                    (blkname, container, name, eid)
+                )
+
+            for blkname, blkgrp in self._data.group.items():
+                add(blkgrp, blkname, None, blkname)
+                for container in ("groups", "data_arrays", "tags",
+                                  "multi_tags", "sources"):
+                    contgrp = blkgrp.get(container)
+                    if contgrp is None:
+                        continue
+                    for name, grp in contgrp.items():
+                        add(grp, blkname, container, name)
+            self._metadata_refs = index
+        return self._metadata_refs
+
+    def _metadata_changed(self, entity, container, section):
+        """
+        Updates the metadata index before the metadata of an entity is
+        changed.
+
+        :param entity: The entity whose metadata is set or deleted
+        :param container: The name of the block container of the entity or
+                          None for blocks
+        :param section: The new metadata section or None if the metadata is
+                        deleted
+        """
+        index = self._metadata_refs
+        if index is None:
+            return
+        blkname = entity._h5group.group.name.split("/")[2]
+        ref = (blkname, container, entity.name, entity.id)
+        if "metadata" in entity._h5group:
+            old = entity._h5group.open_group("metadata").get_attr("entity_id")
+            if ref in index.get(old, ()):
+                index[old].remove(ref)
+        if section is not None:
+            refs = index.setdefault(section.id, list())
+            if ref not in refs:
+                refs.append(ref)
+
+    def _referring_entities(self, section_id, container):
+        """
+        Returns the entities of a given block container (None for blocks)
+        that refer to the section with the given id as their metadata.
+        """
+        entities = list()
+        refs = self._metadata_references().get(section_id, ())
+        for blkname, cont, name, eid in refs:
+            if cont != container or blkname not in self.blocks:
+                continue
+            entity = self.blocks[blkname]
+            if container is not None:
+                items = getattr(entity, container)
+                if name not in items:
+                    continue
+                entity = items[name]
+            metadata = entity.metadata
+            if (entity.id == eid and metadata is not None and
+                    metadata.id == section_id):
+                entities.append(entity)
+        return entities
+
     def flush(self):
         self._h5file.flush()
 
@@ -382,6 +648,7 @@ class File(object):
         gc.collect()  # should handle refs better instead of calling collect()
         # Flush is probably unnecessary
         self._h5file.flush()
+        H5Group.unregister_file(self._h5file, self)
         self._h5file.close()
 
     # Block
@@ -418,6 +685,7 @@ class File(object):
                                                 name=name,
                                                 cls=clsname,
                                                 keep_id=keep_copy_id)
+            self._metadata_refs = None
             id_ = b.attrs["entity_id"]
             return self.blocks[id_]
 
@@ -447,6 +715,7 @@ class File(object):
         if name in self.sections:
             raise DuplicateName("create_section")
         sec = Section.create_new(self, self, self._metadata, name, type_, oid)
+        self._section_added(sec, None)
         return sec
 
     @property
@@ -462,6 +731,57 @@ class File(object):
             self._blocks = Container("data", self, self, Block)
         return self._blocks
 
+    def metadata_snapshot(self):
+        """
+        Loads the whole metadata tree of the file (sections and their
+        properties with values, units and definitions) into memory in a
+        single traversal. The snapshot is meant for read-only analysis: it
+        is not updated when the file is modified.
+
+        Loading and walking the snapshot is about 2-2.5 times faster than
+        walking the Section and Property objects, and walking it again
+        costs no file access at all. A larger speedup for a single walk is
+        not possible, since most of the time is spent by HDF5 opening each
+        object and reading its own attributes, which cannot be batched
+        across objects.
+
+        :returns: The snapshot of the metadata tree
+        :rtype: MetadataSnapshot
+        """
+        return MetadataSnapshot(self._metadata.group, self.version)
+
+    def query_metadata(self, query):
+        """
+        Finds the sections matching a query on the names and types of the
+        sections and the names and values of their properties, e.g.
+
+            ``"Subject/species == 'mouse' and Recording/duration > 300"``
+
+        See nixio.metadata_query for the query syntax and for which sections
+        are returned. The query is answered from an inverted index of the
+        metadata tree, which is built on first use and rebuilt after the
+        metadata has been modified.
+
+        :param query: The query
+        :type query: str
+
+        :returns: The matching sections
+        :rtype: list of Section
+        """
+        if self._metadata_query_index is None:
+            self._metadata_query_index = MetadataIndex(
+                self.metadata_snapshot()
+            )
+        return [self._section_by_id(secid)
+                for secid in self._metadata_query_index.query(query)]
+
+    def _metadata_modified(self):
+        """
+        Drops the metadata query index after sections or properties have been
+        created, deleted or modified.
+        """
+        self._metadata_query_index = None
+
     def find_sections(self, filtr=lambda _: True, limit=None):
         """
         Get all sections and their child sections recursively.
@@ -484,6 +804,33 @@ class File(object):
             limit = maxint
         return finders._find_sections(self, filtr, limit)
 
+    def iter_sections(self, filtr=None, limit=None, name=None, type_=None,
+                      visit=False):
+        """
+        Get all sections in this file recursively, one at a time.
+
+        Like find_sections, this traverses the tree breadth first, but
+        the sections are yielded as they are found, so the traversal can be
+        stopped early. Sections are only instantiated when they are
+        yielded or passed to the filter.
+
+        :param filtr: A filter function
+        :type filtr:  function
+        :param limit: The maximum depth of traversal
+        :type limit:  int
+        :param name: Only yield sections with this name
+        :type name: str
+        :param type_: Only yield sections of this type
+        :type type_: str
+        :param visit: Collect the sections with a single HDF5 visititems
+                      call and yield them in depth first order
+        :type visit: bool
+
+        :returns: A generator of the matching sections.
+        :rtype: generator of Section
+        """
+        return finders.iter_sections(self, filtr, limit, name, type_, visit)
+
     @property
     def sections(self):
         """
@@ -115,8 +115,9 @@ class Group(Entity):
         :type: Section
         """
         if "metadata" in self._h5group:
-            return Section(self.file, None,
-                           self._h5group.open_group("metadata"))
+            return self.file._entity(
+                Section, None, self._h5group.open_group("metadata")
+            )
         else:
             return None
 
@@ -124,9 +125,11 @@ class Group(Entity):
     def metadata(self, sect):
         if not isinstance(sect, Section):
             raise TypeError("{} is not of type Section".format(sect))
+        self.file._metadata_changed(self, "groups", sect)
         self._h5group.create_link(sect, "metadata")
 
     @metadata.deleter
     def metadata(self):
         if "metadata" in self._h5group:
+            self.file._metadata_changed(self, "groups", None)
             self._h5group.delete("metadata")
@@ -12,11 +12,16 @@ from .. import util
 
 class H5DataSet(object):
 
+    # see H5Group.trusted
+    trusted = False
+
     def __init__(self, parent, name, dtype=None, shape=None,
-                 compression=False):
+                 compression=False, h5obj=None):
         self._parent = parent
         self.name = name
-        if (dtype is None) or (shape is None):
+        if h5obj is not None:
+            self.dataset = h5obj
+        elif (dtype is None) or (shape is None):
             self.dataset = self._parent[name]
         else:
             maxshape = (None,) * len(shape)
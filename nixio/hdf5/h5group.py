@@ -7,6 +7,7 @@
 # modification, are permitted under the terms of the BSD License. See
 # LICENSE file in the root of the Project.
 
+import weakref
 import h5py
 import numpy as np
 
@@ -18,24 +19,60 @@ from .. import util
 
 class H5Group(object):
 
-    def __init__(self, parent, name, create=False):
+    # the open nixio File objects by HDF5 file number; their structure
+    # counter (see File._generation) is incremented whenever a group,
+    # dataset or link is created or deleted through this class
+    _files = weakref.WeakValueDictionary()
+    _gcpl = None
+    _str_attr_types = None
+    # set on objects obtained by iterating over their parent group; the
+    # entity_id of such objects is not checked when they are instantiated
+    trusted = False
+
+    def __init__(self, parent, name, create=False, h5obj=None):
         self._parent = parent
         self.name = name
-        self.group = None
-        if create or name in self._parent:
+        self.group = h5obj
+        if h5obj is None and (create or name in self._parent):
             self._create_h5obj()
-        self.h5obj = self.group
 
     def _create_h5obj(self):
         if self.name in self._parent:
             self.group = self._parent[self.name]
         else:
-            gcpl = h5py.h5p.create(h5py.h5p.GROUP_CREATE)
-            flags = h5py.h5p.CRT_ORDER_TRACKED | h5py.h5p.CRT_ORDER_INDEXED
-            gcpl.set_link_creation_order(flags)
+            if H5Group._gcpl is None:
+                # the property list is the same for all groups; create once
+                gcpl = h5py.h5p.create(h5py.h5p.GROUP_CREATE)
+                flags = (h5py.h5p.CRT_ORDER_TRACKED |
+                         h5py.h5p.CRT_ORDER_INDEXED)
+                gcpl.set_link_creation_order(flags)
+                H5Group._gcpl = gcpl
             name = self.name.encode("utf-8")
-            gid = h5py.h5g.create(self._parent.id, name, gcpl=gcpl)
+            gid = h5py.h5g.create(self._parent.id, name, gcpl=H5Group._gcpl)
             self.group = h5py.Group(gid)
+            self._structure_changed()
+
+    @classmethod
+    def register_file(cls, h5file, nixfile):
+        """
+        Registers the File object of an HDF5 file, whose structure counter
+        is then kept up to date (see _files).
+        """
+        cls._files[h5file.id.fileno] = nixfile
+
+    @classmethod
+    def unregister_file(cls, h5file, nixfile):
+        """
+        Removes the registration of a File object (see register_file).
+        """
+        fileno = h5file.id.fileno
+        if cls._files.get(fileno) is nixfile:
+            del cls._files[fileno]
+
+    def _structure_changed(self):
+        nixfile = H5Group._files.get(self.group.id.fileno)
+        if nixfile is not None:
+            nixfile._generation += 1
 
     @property
     def group(self):
@@ -50,20 +87,27 @@ class H5Group(object):
     def group(self, grp):
         self._group = grp
 
+    @property
+    def h5obj(self):
+        return self.group
+
     def create_link(self, target, name):
         self._create_h5obj()
         if name in self.group:
             del self.group[name]
         self.group[name] = target._h5group.group
+        self._structure_changed()
 
     @classmethod
-    def create_from_h5obj(cls, h5obj):
-        parent = h5obj.parent
-        name = h5obj.name.split("/")[-1]
+    def create_from_h5obj(cls, h5obj, parent=None, name=None):
+        if parent is None:
+            parent = h5obj.parent
+        if name is None:
+            name = h5obj.name.split("/")[-1]
         if isinstance(h5obj, h5py.Group):
-            return cls(parent, name)
+            return cls(parent, name, h5obj=h5obj)
         elif isinstance(h5obj, h5py.Dataset):
-            return H5DataSet(parent, name)
+            return H5DataSet(parent, name, h5obj=h5obj)
         else:
             raise ValueError("Invalid object: "
                              "{} must be either h5py.Group of h5py.Dataset.")
@@ -93,6 +137,7 @@ class H5Group(object):
         :return: a new H5DataSet object
         """
         self._create_h5obj()
+        self._structure_changed()
         return H5DataSet(self.group, name, dtype, shape, compression)
 
     def get_dataset(self, name):
@@ -180,7 +225,7 @@ class H5Group(object):
 
     def get_by_name(self, name):
         if self.group and name in self.group:
-            return self.create_from_h5obj(self.group[name])
+            return self.create_from_h5obj(self.group[name], self.group, name)
         else:
             raise KeyError("Item not found '{}'".format(name))
 
@@ -200,6 +245,8 @@ class H5Group(object):
                                               idx_type=h5py.h5.INDEX_CRT_ORDER,
                                               order=h5py.h5.ITER_INC,
                                               idx=pos)
+        if isinstance(name, bytes):
+            name = name.decode()
         return self.get_by_name(name)
 
     def delete(self, id_or_name, delete_if_empty=True):
@@ -214,6 +261,7 @@ class H5Group(object):
             del self.group[name]
         except Exception:
             raise ValueError("Error deleting {} ".format(name))
+        self._structure_changed()
         # Delete if empty and non-root container
         groupdepth = len(self.group.name.split("/")) - 1
         if delete_if_empty and not len(self.group) and groupdepth > 1:
@@ -226,23 +274,58 @@ class H5Group(object):
         Deletes all references to a given list of objects, identified by their
         entity_id, below the current object.
         """
-        # Use visit_items to traverse groups and check their children.
-        # visit_items visits each item only once, so instead of checking
-        # whether each item is the one we're searching for, we check whether
-        # it *contains* the one we're searching for
-        # We delete the child as soon as we find it; this doesn't cause
-        # iteration issues since it's deleted before descending into the
-        # children of the current group
-
-        def delete_by_id(name, obj):
+        self.delete_many(eid, self.reference_index())
+
+    def reference_index(self):
+        """
+        Builds an index of all references to objects below the current
+        object in a single traversal. The index maps the entity_id of each
+        object to a list of (path of the parent group, link name) tuples,
+        one for each link to the object.
+
+        :return: dict of entity_id to list of (str, str) tuples
+        """
+        index = dict()
+
+        # visititems visits each group only once, even if it is linked from
+        # several places, so the links to an object are found by checking
+        # the children of every group
+        def add_children(name, obj):
             if not isinstance(obj, h5py.Group):
                 return
-            grp = self.create_from_h5obj(obj)
-            for ch in grp:
-                if ch.get_attr("entity_id") in eid:
-                    del grp[ch.name]
-
-        self._group.visititems(delete_by_id)
+            for chname, child in obj.items():
+                eid = child.attrs.get("entity_id")
+                if eid is None:
+                    continue
+                if isinstance(eid, bytes):
+                    eid = eid.decode()
+                index.setdefault(eid, list()).append((obj.name, chname))
+
+        add_children(None, self.group)
+        self.group.visititems(add_children)
+        return index
+
+    def delete_many(self, eid, index):
+        """
+        Deletes all references to a given list of objects, identified by their
+        entity_id, using a reference index (see reference_index). The
+        deleted references are removed from the index. References in the
+        index that no longer exist are skipped.
+        """
+        h5file = self.group.file
+        for id_ in eid:
+            for parent, name in index.pop(id_, ()):
+                if parent not in h5file:
+                    continue
+                grp = h5file[parent]
+                child = grp.get(name)
+                if child is None:
+                    continue
+                chid = child.attrs.get("entity_id")
+                if isinstance(chid, bytes):
+                    chid = chid.decode()
+                if chid == id_:
+                    del grp[name]
 
     def set_attr(self, name, value):
         self._create_h5obj()
@@ -252,6 +335,34 @@ class H5Group(object):
         else:
             self.group.attrs[name] = value
 
+    def create_str_attrs(self, attrs):
+        """
+        Creates several new string attributes on the group. Unlike set_attr,
+        this writes through the low level interface with HDF5 types and
+        dataspaces that are shared between all calls, which makes it
+        considerably faster for newly created objects. The attributes must
+        not exist yet.
+
+        :param attrs: list of (name, value) tuples, where each value is
+                      either a str or a bytes object
+        """
+        if self.group is None:
+            self._create_h5obj()
+        if H5Group._str_attr_types is None:
+            # variable length strings as written by h5py for text and bytes
+            types = list()
+            for encoding in ("utf-8", "ascii"):
+                dtype = h5py.string_dtype(encoding)
+                types.append((dtype, h5py.h5t.py_create(dtype, logical=True)))
+            space = h5py.h5s.create(h5py.h5s.SCALAR)
+            H5Group._str_attr_types = (types, space)
+        types, space = H5Group._str_attr_types
+        gid = self.group.id
+        for name, value in attrs:
+            dtype, tid = types[isinstance(value, bytes)]
+            aid = h5py.h5a.create(gid, name.encode("utf-8"), tid, space)
+            aid.write(np.array(value, dtype=dtype))
+
     def get_attr(self, name):
         if self.group is None:
             return None
@@ -278,6 +389,7 @@ class H5Group(object):
     def copy(self, source, dest, name=None, cls=None, shallow=False,
              keep_id=True):
         grp = self.group
+        self._structure_changed()
         dest.open_group(cls, create=True)
         dest_grp = dest.group[cls]
         grp.copy(source=source, dest=dest_grp, name=name, shallow=shallow)
@@ -301,8 +413,10 @@ class H5Group(object):
     def __iter__(self):
         if not len(self):
             return
-        for grp in self.group.values():
-            yield self.create_from_h5obj(grp)
+        for name, grp in self.group.items():
+            child = self.create_from_h5obj(grp, self.group, name)
+            child.trusted = True
+            yield child
 
     def __contains__(self, item):
         if self.group is None:
@@ -317,6 +431,7 @@ class H5Group(object):
 
     def __delitem__(self, key):
         del self.group[key]
+        self._structure_changed()
 
     def __str__(self):
         return "<H5Group object: {}>".format(self.group.name)
@@ -0,0 +1,329 @@
+# -*- coding: utf-8 -*-
+# Copyright © 2026, German Neuroinformatics Node (G-Node)
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted under the terms of the BSD License. See
+# LICENSE file in the root of the Project.
+"""
+Queries on the metadata tree of a file, answered from an inverted index.
+
+A query is made of terms that are combined with ``and`` and ``or`` (``and``
+binds stronger, parentheses can be used for grouping):
+
+    ``Section``
+        sections with the name or type ``Section``
+    ``Section/property``
+        sections with the name or type ``Section`` that have the property
+    ``Section/property <op> value``
+        as above, where any of the property values compares to ``value``
+        with ``<op>``, one of ``==``, ``!=``, ``<``, ``<=``, ``>``, ``>=``
+    ``property <op> value``
+        any section with a matching property
+
+Names containing spaces or special characters can be quoted with ``'`` or
+``"``. Values are quoted strings, numbers, ``true`` or ``false``.
+
+A term is satisfied by a section if the section or one of its descendants
+matches it. The result of a query are the most specific sections that
+satisfy it: for a single term, the matching sections; for ``A and B``, the
+sections that match one of the terms and contain a match of the other, or
+else the lowest common ancestor sections of the matches. If ``A`` and ``B``
+refer to the same section name or type (e.g. ``Subject/species == 'mouse'
+and Subject/age > 3``), they must be matched by the same section.
+"""
+import re
+from bisect import bisect_left, bisect_right
+from numbers import Number
+from six import string_types
+import numpy as np
+
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<op>==|!=|<=|>=|<|>)
+      | (?P<paren>[()])
+      | (?P<slash>/)
+      | '(?P<squote>[^']*)'
+      | "(?P<dquote>[^"]*)"
+      | (?P<word>[^\s()/<>=!'"]+)
+    )""", re.VERBOSE)
+
+_NUMBER = re.compile(r"^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$")
+
+
+def _tokenize(query, what="metadata query"):
+    tokens = list()
+    pos = 0
+    query = query.rstrip()
+    while pos < len(query):
+        match = _TOKEN.match(query, pos)
+        if match is None or match.end() == pos:
+            raise ValueError("Invalid {} at position {}: "
+                             "{!r}".format(what, pos, query[pos:]))
+        pos = match.end()
+        kind = match.lastgroup
+        if kind in ("squote", "dquote"):
+            tokens.append(("string", match.group(kind)))
+        else:
+            tokens.append((kind, match.group(kind)))
+    return tokens
+
+
+class _Parser(object):
+
+    what = "metadata query"
+
+    def __init__(self, query):
+        self.tokens = _tokenize(query, self.what)
+        self.pos = 0
+
+    def error(self, message, *args):
+        return ValueError("Invalid {}: {}".format(self.what,
+                                                  message.format(*args)))
+
+    def peek(self):
+        if self.pos < len(self.tokens):
+            return self.tokens[self.pos]
+        return (None, None)
+
+    def take(self):
+        token = self.peek()
+        self.pos += 1
+        return token
+
+    def expect(self, kind, value=None):
+        token = self.take()
+        if token[0] != kind or (value is not None and token[1] != value):
+            raise self.error("expected {} but found {!r}", value or kind,
+                             token[1])
+        return token
+
+    def parse(self):
+        expr = self.parse_or()
+        if self.peek()[0] is not None:
+            raise self.error("unexpected {!r}", self.peek()[1])
+        return expr
+
+    def parse_or(self):
+        expr = self.parse_and()
+        while self.peek() == ("word", "or"):
+            self.take()
+            expr = ("or", expr, self.parse_and())
+        return expr
+
+    def parse_and(self):
+        expr = self.parse_term()
+        while self.peek() == ("word", "and"):
+            self.take()
+            expr = ("and", expr, self.parse_term())
+        return expr
+
+    def parse_name(self):
+        kind, value = self.take()
+        if kind not in ("word", "string"):
+            raise self.error("expected a name but found {!r}", value)
+        return value
+
+    def parse_value(self):
+        kind, value = self.take()
+        if kind == "string":
+            return value
+        if kind == "word":
+            if value in ("true", "false"):
+                return value == "true"
+            if _NUMBER.match(value):
+                number = float(value)
+                return int(number) if number.is_integer() else number
+        raise self.error("expected a value but found {!r}", value)
+
+    def parse_term(self):
+        if self.peek() == ("paren", "("):
+            self.take()
+            expr = self.parse_or()
+            self.expect("paren", ")")
+            return expr
+        section, prop = None, self.parse_name()
+        if self.peek()[0] == "slash":
+            self.take()
+            section, prop = prop, self.parse_name()
+        if self.peek()[0] != "op":
+            if section is None:
+                return ("section", prop)
+            return ("property", section, prop, None, None)
+        _, op = self.take()
+        return ("property", section, prop, op, self.parse_value())
+
+
+def parse(query):
+    """
+    Parses a metadata query (see module documentation) into a tree of
+    tuples.
+
+    :param query: The query
+    :type query: str
+
+    :returns: The parsed query
+    :rtype: tuple
+    """
+    return _Parser(query).parse()
+
+
+def _kind(value):
+    if isinstance(value, (bool, np.bool_)):
+        return bool
+    if isinstance(value, Number):
+        return Number
+    if isinstance(value, string_types):
+        return str
+    return None
+
+
+class _PropertyIndex(object):
+    """
+    The values of all properties with the same name: a map from each value
+    (and its kind, so that e.g. True and 1 are kept apart) to the sections
+    with that value, and the values of each kind in sorted order for range
+    comparisons (created on first use).
+    """
+
+    def __init__(self):
+        self.sections = set()
+        self.by_value = dict()
+        self._sorted = None
+
+    def add(self, secid, values):
+        self.sections.add(secid)
+        for value in values:
+            kind = _kind(value)
+            if kind is None:
+                continue
+            if kind is bool:
+                value = bool(value)
+            self.by_value.setdefault((kind, value), set()).add(secid)
+
+    def sorted_values(self, kind):
+        if self._sorted is None:
+            self._sorted = dict()
+            for (kind_, value), secids in self.by_value.items():
+                self._sorted.setdefault(kind_, list()).append(
+                    (value, secids)
+                )
+            for kind_, items in self._sorted.items():
+                items.sort(key=lambda item: item[0])
+                self._sorted[kind_] = ([item[0] for item in items],
+                                       [item[1] for item in items])
+        return self._sorted.get(kind, ((), ()))
+
+    def match(self, op, value):
+        if op is None:
+            return set(self.sections)
+        kind = _kind(value)
+        if op == "==":
+            return set(self.by_value.get((kind, value), ()))
+        keys, secids = self.sorted_values(kind)
+        if op == "!=":
+            lo, hi = bisect_left(keys, value), bisect_right(keys, value)
+            ranges = (secids[:lo], secids[hi:])
+        elif op == "<":
+            ranges = (secids[:bisect_left(keys, value)],)
+        elif op == "<=":
+            ranges = (secids[:bisect_right(keys, value)],)
+        elif op == ">":
+            ranges = (secids[bisect_right(keys, value):],)
+        else:
+            ranges = (secids[bisect_left(keys, value):],)
+        result = set()
+        for part in ranges:
+            for ids in part:
+                result.update(ids)
+        return result
+
+
+class MetadataIndex(object):
+    """
+    Inverted index of a metadata tree over the names and types of the
+    sections and the names and values of their properties.
+
+    :param snapshot: The metadata tree
+    :type snapshot: MetadataSnapshot
+    """
+
+    def __init__(self, snapshot):
+        self.order = dict()
+        self.parents = dict()
+        self.sections = dict()
+        self.properties = dict()
+        for pos, sec in enumerate(snapshot.iter_sections()):
+            self.order[sec.id] = pos
+            self.parents[sec.id] = (sec.parent.id if sec.parent is not None
+                                    else None)
+            self.sections.setdefault(sec.name, set()).add(sec.id)
+            self.sections.setdefault(sec.type, set()).add(sec.id)
+            for prop in sec.props.values():
+                if prop.name not in self.properties:
+                    self.properties[prop.name] = _PropertyIndex()
+                self.properties[prop.name].add(sec.id, prop.values)
+
+    def _with_ancestors(self, secids):
+        closure = set()
+        for secid in secids:
+            while secid is not None and secid not in closure:
+                closure.add(secid)
+                secid = self.parents[secid]
+        return closure
+
+    def _most_specific(self, secids):
+        return secids - set(self.parents[secid] for secid in secids)
+
+    @staticmethod
+    def _section_of(expr):
+        """
+        Returns the section name or type a term refers to, or None.
+        """
+        if expr[0] in ("section", "property"):
+            return expr[1]
+        return None
+
+    def _evaluate(self, expr):
+        """
+        Returns the sections that match the expression and the sections whose
+        subtree contains a match.
+        """
+        if expr[0] == "section":
+            hits = set(self.sections.get(expr[1], ()))
+        elif expr[0] == "property":
+            _, section, prop, op, value = expr
+            index = self.properties.get(prop)
+            hits = index.match(op, value) if index is not None else set()
+            if section is not None:
+                hits &= self.sections.get(section, set())
+        else:
+            hits_a, closure_a = self._evaluate(expr[1])
+            hits_b, closure_b = self._evaluate(expr[2])
+            if expr[0] == "or":
+                return hits_a | hits_b, closure_a | closure_b
+            section = self._section_of(expr[1])
+            if section is not None and section == self._section_of(expr[2]):
+                # both terms must be satisfied by the same section
+                hits = hits_a & hits_b
+                return hits, self._with_ancestors(hits)
+            closure = closure_a & closure_b
+            hits = ((hits_a & closure_b) | (hits_b & closure_a) |
+                    self._most_specific(closure))
+            return hits, closure
+        return hits, self._with_ancestors(hits)
+
+    def query(self, query):
+        """
+        Returns the ids of the sections matching a query, in breadth first
+        order of the tree.
+
+        :param query: The query, see the module documentation
+        :type query: str
+
+        :rtype: list of str
+        """
+        hits, _ = self._evaluate(parse(query))
+        return sorted(hits, key=self.order.get)
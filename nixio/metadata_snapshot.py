@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+# Copyright © 2026, German Neuroinformatics Node (G-Node)
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted under the terms of the BSD License. See
+# LICENSE file in the root of the Project.
+from collections import OrderedDict, deque
+import numpy as np
+import h5py
+
+from .property import OdmlType
+from . import util
+
+
+# The snapshot is read through the low level h5py interface, which avoids
+# most of the overhead of opening objects and reading attributes through
+# the high level interface.
+_SECTION_ATTRS = ("entity_id", "name", "type", "definition", "repository")
+_PROPERTY_ATTRS = ("entity_id", "name", "unit", "definition", "uncertainty",
+                   "reference", "dependency", "dependency_value",
+                   "value_origin", "odml_type")
+
+
+def _attrs(oid, names):
+    present = list()
+    h5py.h5a.iterate(oid, present.append)
+    attrs = dict()
+    for bname in present:
+        name = bname.decode()
+        if name not in names:
+            continue
+        attr = h5py.h5a.open(oid, bname)
+        value = np.ndarray(attr.shape, dtype=attr.dtype)
+        attr.read(value)
+        value = value[()]
+        if isinstance(value, bytes):
+            value = value.decode()
+        attrs[name] = value
+    return attrs
+
+
+def _read(dsid):
+    data = np.ndarray(dsid.shape, dtype=dsid.dtype)
+    if data.size:
+        dsid.read(h5py.h5s.ALL, h5py.h5s.ALL, data)
+    return data
+
+
+def _children(gid, name):
+    """
+    Returns the (name, id) pairs of the objects in the subgroup ``name`` of
+    the group with id ``gid``.
+    """
+    bname = name.encode()
+    if bname not in gid:
+        return []
+    subgid = h5py.h5g.open(gid, bname)
+    return [(chname, h5py.h5o.open(subgid, chname)) for chname in subgid]
+
+
+class PropertySnapshot(object):
+    """
+    In-memory copy of a Property, with its values and attributes.
+    """
+
+    __slots__ = ("id", "name", "values", "unit", "definition", "uncertainty",
+                 "reference", "dependency", "dependency_value",
+                 "value_origin", "odml_type")
+
+    def __init__(self, dsid, filever):
+        attrs = _attrs(dsid, _PROPERTY_ATTRS)
+        self.id = attrs.get("entity_id")
+        self.name = attrs.get("name")
+        self.unit = attrs.get("unit")
+        self.definition = attrs.get("definition")
+        self.dependency = attrs.get("dependency")
+        self.dependency_value = attrs.get("dependency_value")
+        self.value_origin = attrs.get("value_origin")
+        otype = attrs.get("odml_type")
+        self.odml_type = OdmlType(otype) if otype else None
+        data = _read(dsid)
+        if filever < (1, 1, 1):
+            self.values = tuple(v["value"] for v in data)
+            self.uncertainty = data[0]["uncertainty"]
+            self.reference = data[0]["reference"]
+            return
+        self.uncertainty = attrs.get("uncertainty")
+        self.reference = attrs.get("reference")
+        self.values = tuple(util.decode_strings(data))
+
+    def __str__(self):
+        return "{}: {{name = {}}}".format(type(self).__name__, self.name)
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class SectionSnapshot(object):
+    """
+    In-memory copy of a Section with its properties and child sections.
+
+    Like a Section, it gives access to the values of its properties and to
+    its child sections by name.
+    """
+
+    __slots__ = ("id", "name", "type", "definition", "repository", "parent",
+                 "link", "props", "sections")
+
+    def __init__(self, gid, parent):
+        attrs = _attrs(gid, _SECTION_ATTRS)
+        self.id = attrs.get("entity_id")
+        self.name = attrs.get("name")
+        self.type = attrs.get("type")
+        self.definition = attrs.get("definition")
+        self.repository = attrs.get("repository")
+        self.parent = parent
+        self.link = None
+        self.props = OrderedDict()
+        self.sections = OrderedDict()
+
+    def __len__(self):
+        return len(self.props)
+
+    def __getitem__(self, key):
+        if key not in self.props and key in self.sections:
+            return self.sections[key]
+
+        values = list(self.props[key].values)
+        if len(values) == 1:
+            values = values[0]
+        return values
+
+    def __iter__(self):
+        for _, item in self.items():
+            yield item
+
+    def items(self):
+        for item in self.props.items():
+            yield item
+        for item in self.sections.items():
+            yield item
+
+    def __contains__(self, key):
+        return key in self.props or key in self.sections
+
+    def __str__(self):
+        return "{}: {{name = {}, type = {}}}".format(
+            type(self).__name__, self.name, self.type
+        )
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class MetadataSnapshot(object):
+    """
+    In-memory copy of the metadata tree of a file. It is loaded in one
+    traversal of the file (see File.metadata_snapshot) and does not change
+    when the file is modified afterwards.
+
+    The top-level sections can be accessed by name. All sections can be
+    looked up by their id.
+    """
+
+    def __init__(self, h5metadata, filever):
+        self.sections = OrderedDict()
+        self._by_id = dict()
+        links = list()
+        fifo = deque((h5py.h5o.open(h5metadata.id, name), None)
+                     for name in h5metadata.id)
+        while fifo:
+            gid, parent = fifo.popleft()
+            sec = SectionSnapshot(gid, parent)
+            self._by_id[sec.id] = sec
+            if parent is None:
+                self.sections[sec.name] = sec
+            else:
+                parent.sections[sec.name] = sec
+            for _, dsid in _children(gid, "properties"):
+                prop = PropertySnapshot(dsid, filever)
+                sec.props[prop.name] = prop
+            fifo.extend((child, sec)
+                        for _, child in _children(gid, "sections"))
+            if b"link" in gid:
+                link = _attrs(h5py.h5o.open(gid, b"link"), ("entity_id",))
+                links.append((sec, link["entity_id"]))
+        for sec, linkid in links:
+            sec.link = self._by_id.get(linkid)
+
+    def __len__(self):
+        return len(self.sections)
+
+    def __getitem__(self, name):
+        return self.sections[name]
+
+    def __iter__(self):
+        return iter(self.sections.values())
+
+    def __contains__(self, name):
+        return name in self.sections
+
+    def section(self, id_):
+        """
+        Returns the section with the given id.
+
+        :param id_: The id of the section
+        :type id_: str
+
+        :rtype: SectionSnapshot
+        """
+        return self._by_id[id_]
+
+    def iter_sections(self):
+        """
+        Generator over all sections of the snapshot, breadth first.
+
+        :rtype: generator of SectionSnapshot
+        """
+        fifo = deque(self.sections.values())
+        while fifo:
+            sec = fifo.popleft()
+            yield sec
+            fifo.extend(sec.sections.values())
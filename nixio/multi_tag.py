@@ -15,9 +15,155 @@ from .source_link_container import SourceLinkContainer
 from .data_array import DataArray
 from .data_view import DataView
 from .link_type import LinkType
+from .dimension_type import DimensionType
 from .exceptions import (OutOfBounds, IncompatibleDimensions,
-                         UninitializedEntity)
+                         UninitializedEntity, InvalidUnit)
 from .section import Section
+from . import util
+
+
+# maximum number of bytes read at once when coalescing window reads
+WINDOW_BUFFER_SIZE = 2 ** 25
+
+
+class _IntervalIndex(object):
+    """
+    Index over a set of closed intervals [start, start + extent].
+
+    Intervals are kept sorted by their start, with a complete binary tree
+    over them that holds the largest end of the intervals below each node.
+    A query finds the intervals that start before the end of the window by
+    binary search and descends the tree level by level, skipping every
+    subtree whose largest end lies before the window. It takes O(log n)
+    array operations on at most O((k + 1) log n) nodes in total, where k is
+    the number of overlapping intervals.
+    """
+
+    def __init__(self, starts, extents):
+        starts = np.asarray(starts, dtype=float)
+        ends = starts + np.asarray(extents, dtype=float)
+        # negative extents describe intervals that end before they start
+        starts, ends = np.minimum(starts, ends), np.maximum(starts, ends)
+        self._order = np.argsort(starts, kind="mergesort")
+        self._starts = starts[self._order]
+        # levels of the tree of largest ends, from the leaves (the ends of
+        # the sorted intervals, padded to a power of two) to the root
+        size = 1
+        while size < len(starts):
+            size *= 2
+        maxends = np.full(size, -np.inf)
+        maxends[:len(starts)] = ends[self._order]
+        self._levels = [maxends]
+        while len(maxends) > 1:
+            maxends = np.maximum(maxends[0::2], maxends[1::2])
+            self._levels.append(maxends)
+
+    def __len__(self):
+        return len(self._starts)
+
+    def overlapping(self, lower, upper):
+        """
+        Returns the (original) indices of all intervals that overlap the
+        closed window [lower, upper], in ascending order.
+        """
+        last = np.searchsorted(self._starts, upper, side="right")
+        if last == 0:
+            return np.array([], dtype=self._order.dtype)
+        nodes = np.array([0])
+        for depth in range(len(self._levels) - 1, -1, -1):
+            maxends = self._levels[depth]
+            nodes = nodes[maxends[nodes] >= lower]
+            # drop the nodes whose first interval starts after the window
+            nodes = nodes[(nodes << depth) < last]
+            if depth:
+                nodes = np.concatenate((2 * nodes, 2 * nodes + 1))
+        return np.sort(self._order[nodes])
+
+
+def _iter_windows(data, dim, starts, nsamples, buffer_size):
+    """
+    Reads windows of ``nsamples`` along dimension ``dim`` of ``data``,
+    beginning at each of the given start indices. Windows that lie close to
+    each other are coalesced into a single hyperslab read of at most
+    ``buffer_size`` bytes, and at most as many windows are yielded at once
+    as fit into ``buffer_size`` bytes (a single window is always read as a
+    whole). Overlapping windows are copied, so the size of a group is
+    limited by both its span and its number of windows.
+
+    Yields tuples of the indices of the windows in ``starts`` and an array
+    holding these windows stacked along the first axis.
+    """
+    shape = data.data_extent
+    itemsize = data.dtype.itemsize
+    if len(data.polynom_coefficients) or data.expansion_origin:
+        # the calibrated data is returned as double
+        itemsize = np.dtype(np.float64).itemsize
+    rowbytes = itemsize * int(np.prod(shape)) // max(shape[dim], 1)
+    rowbytes = max(rowbytes, 1)
+    maxrows = max(buffer_size // rowbytes, nsamples)
+    maxwindows = max(buffer_size // (nsamples * rowbytes), 1)
+    order = np.argsort(starts, kind="mergesort")
+    sorted_starts = starts[order]
+    offsets = np.arange(nsamples)
+    first = 0
+    while first < len(order):
+        # grow the group while its span and its windows still fit into the
+        # buffer
+        last = np.searchsorted(sorted_starts,
+                               sorted_starts[first] + maxrows - nsamples,
+                               side="right")
+        last = min(max(last, first + 1), first + maxwindows)
+        begin = sorted_starts[first]
+        end = sorted_starts[last - 1] + nsamples
+        sl = [slice(None)] * len(shape)
+        sl[dim] = slice(begin, end)
+        block = np.asarray(data[tuple(sl)])
+        idx = (sorted_starts[first:last] - begin)[:, np.newaxis] + offsets
+        windows = np.moveaxis(np.take(block, idx, axis=dim), dim, 0)
+        del block
+        yield order[first:last], windows
+        first = last
+
+
+def _iter_boxes(data, starts, stops, buffer_size):
+    """
+    Reads the hyperslabs [starts[i], stops[i]) of ``data``. Hyperslabs are
+    visited in order of their start in the first dimension and neighbouring
+    ones are coalesced into a single read of their bounding box as long as
+    it holds at most ``buffer_size`` bytes (a single hyperslab is always
+    read as a whole).
+
+    Yields tuples of the indices of the hyperslabs in ``starts`` and a list
+    of the corresponding arrays.
+    """
+    itemsize = data.dtype.itemsize
+    order = np.argsort(starts[:, 0], kind="mergesort")
+    starts = starts.tolist()
+    stops = stops.tolist()
+    first = 0
+    while first < len(order):
+        lower = list(starts[order[first]])
+        upper = list(stops[order[first]])
+        last = first + 1
+        while last < len(order):
+            idx = order[last]
+            grown_lower = list(map(min, lower, starts[idx]))
+            grown_upper = list(map(max, upper, stops[idx]))
+            size = itemsize * int(np.prod(np.subtract(grown_upper,
+                                                      grown_lower)))
+            if size > buffer_size:
+                break
+            lower, upper = grown_lower, grown_upper
+            last += 1
+        block = np.asarray(data[tuple(map(slice, lower, upper))])
+        members = order[first:last]
+        arrays = list()
+        for idx in members:
+            sl = tuple(slice(start - low, stop - low) for start, stop, low
+                       in zip(starts[idx], stops[idx], lower))
+            arrays.append(block[sl])
+        yield members, arrays
+        first = last
 
 
 class MultiTag(BaseTag):
@@ -44,8 +190,8 @@ class MultiTag(BaseTag):
         """
         if "positions" not in self._h5group:
             raise RuntimeError("MultiTag.positions: DataArray not found!")
-        return DataArray(self.file, self._parent,
-                         self._h5group.open_group("positions"))
+        return self.file._entity(DataArray, self._parent,
+                                 self._h5group.open_group("positions"))
 
     @positions.setter
     def positions(self, da):
@@ -55,7 +201,7 @@ class MultiTag(BaseTag):
             del self._h5group["positions"]
         self._h5group.create_link(da, "positions")
         if self.file.auto_update_timestamps:
-            self.force_updated_at()
+            self.file._updated(self._h5group)
 
     @property
     def extents(self):
@@ -66,8 +212,8 @@ class MultiTag(BaseTag):
         :type: DataArray or None
         """
         if "extents" in self._h5group:
-            return DataArray(self.file, self._parent,
-                             self._h5group.open_group("extents"))
+            return self.file._entity(DataArray, self._parent,
+                                     self._h5group.open_group("extents"))
         return None
 
     @extents.setter
@@ -77,7 +223,7 @@ class MultiTag(BaseTag):
         else:
             self._h5group.create_link(da, "extents")
         if self.file.auto_update_timestamps:
-            self.force_updated_at()
+            self.file._updated(self._h5group)
 
     @property
     def references(self):
@@ -168,6 +314,319 @@ class MultiTag(BaseTag):
             stops = [start + 1 for start in starts]
         return tuple(slice(start, stop) for start, stop in zip(starts, stops))
 
+    def _calc_all_slices(self, data, posidx):
+        """
+        Vectorized counterpart of :meth:`_calc_data_slices` computing the
+        slices of many positions at once.
+
+        :returns: Arrays of the start and stop indices of shape
+                  (number of positions, dimensions of data)
+        """
+        positions = self.positions
+        extents = self.extents
+        if extents and positions.data_extent != extents.data_extent:
+            raise IncompatibleDimensions(
+                "Number of dimensions in position and extent do not match",
+                "MultiTag._calc_all_slices")
+        ndim = len(data.dimensions)
+
+        def read(source, fill):
+            values = np.asarray(source[:], dtype=float)
+            if values.ndim == 1:
+                values = values[:, np.newaxis]
+            values = values[posidx, :ndim]
+            missing = ndim - values.shape[1]
+            if missing > 0:
+                extension = np.broadcast_to(fill[values.shape[1]:],
+                                            (len(values), missing))
+                values = np.concatenate((values, extension), axis=1)
+            return values
+
+        dimpos = read(positions, np.zeros(ndim))
+        if extents is not None:
+            da_len = np.asarray(data.data_extent, dtype=float)
+            extent = read(extents, da_len - 1)
+        units = self.units
+        starts = np.empty(dimpos.shape, dtype=np.int64)
+        stops = np.empty(dimpos.shape, dtype=np.int64)
+        for idx in range(ndim):
+            dim = data.dimensions[idx]
+            unit = units[idx] if idx < len(units) else None
+            starts[:, idx] = self._pos_to_indices(dimpos[:, idx], unit, dim)
+            if extents is not None:
+                stop = self._pos_to_indices(dimpos[:, idx] + extent[:, idx],
+                                            unit, dim) + 1
+                stops[:, idx] = np.maximum(stop, starts[:, idx] + 1)
+            else:
+                stops[:, idx] = starts[:, idx] + 1
+        return starts, stops
+
+    def _interval_index(self, dim):
+        positions = self.positions
+        extents = self.extents
+        posid = positions.id
+        extid = extents.id if extents is not None else None
+
+        def build():
+            ndim = len(positions.data_extent)
+            if ndim == 1 and dim != 0:
+                raise OutOfBounds("Dimension index out of bounds of "
+                                  "positions!", dim)
+            sl = np.s_[:] if ndim == 1 else np.s_[:, dim]
+            starts = positions[sl]
+            if extents is None:
+                lengths = np.zeros_like(starts)
+            else:
+                if extents.data_extent != positions.data_extent:
+                    raise IncompatibleDimensions(
+                        "Number of dimensions in position and extent do not "
+                        "match", "MultiTag.query")
+                lengths = extents[sl]
+            return _IntervalIndex(starts, lengths)
+
+        deps = (posid,) if extid is None else (posid, extid)
+        return self.file._get_derived(("MultiTag", self.id, dim), deps, build)
+
+    def query(self, window_start, window_end, dim=0):
+        """
+        Returns the indices of all positions whose interval (position to
+        position + extent) overlaps the window [window_start, window_end]
+        along the given dimension. Positions without extents are treated
+        as points. Window bounds are given in the units of the tag.
+
+        The lookup is backed by a sorted interval index over the positions
+        and extents which is built on first use and rebuilt automatically
+        when either of them changes.
+
+        :param window_start: Start of the window
+        :type window_start: float
+        :param window_end: End of the window
+        :type window_end: float
+        :param dim: Index of the dimension to query (default: 0)
+        :type dim: int
+
+        :returns: Matching position indices in ascending order
+        :rtype: numpy.ndarray of int
+        """
+        if window_end < window_start:
+            raise ValueError("Window end must not be smaller than the "
+                             "window start")
+        return self._interval_index(dim).overlapping(window_start,
+                                                     window_end)
+
+    def _window_starts(self, data, dim, before, length):
+        """
+        Computes the start indices of fixed-length windows along dimension
+        ``dim`` of ``data`` which begin ``before`` (in tag units) ahead of
+        each position and span ``length`` (in tag units).
+
+        :returns: Tuple of the start indices and the number of samples per
+                  window
+        """
+        dims = data.dimensions
+        if not 0 <= dim < len(dims):
+            raise OutOfBounds("Dimension index out of bounds of the "
+                              "referenced DataArray!", dim)
+        sdim = dims[dim]
+        if sdim.dimension_type != DimensionType.Sample:
+            raise IncompatibleDimensions(
+                "Fixed-length windows require a SampledDimension",
+                "MultiTag._window_starts"
+            )
+        positions = self.positions
+        if len(positions.data_extent) == 1:
+            if dim != 0:
+                raise OutOfBounds("Dimension index out of bounds of "
+                                  "positions!", dim)
+            pos = positions[:]
+        else:
+            pos = positions[:, dim]
+        pos = np.asarray(pos, dtype=float) - before
+
+        units = self.units
+        unit = units[dim] if len(units) > dim else None
+        dimunit = sdim.unit
+        if unit and not dimunit:
+            raise IncompatibleDimensions(
+                "Units of position and SampledDimension must both be given!",
+                "MultiTag._window_starts"
+            )
+        if unit and dimunit:
+            try:
+                pos = util.units.convert(pos, unit, dimunit)
+                length = util.units.convert(length, unit, dimunit)
+            except InvalidUnit:
+                raise IncompatibleDimensions(
+                    "Provided units are not scalable!",
+                    "MultiTag._window_starts"
+                )
+        offset = sdim.offset or 0.0
+        interval = sdim.sampling_interval
+        starts = np.round((pos - offset) / interval).astype(np.int64)
+        nsamples = int(np.round(length / interval)) + 1
+        if len(starts) and (starts.min() < 0 or
+                            starts.max() + nsamples > data.data_extent[dim]):
+            raise OutOfBounds("Window reaches beyond the extent of the "
+                              "referenced DataArray!")
+        return starts, nsamples
+
+    def triggered_average(self, refidx, pre, post, reducer="mean", dim=0,
+                          buffer_size=None):
+        """
+        Computes the event-triggered average (or another summary statistic)
+        of a referenced DataArray: for each position, the window from
+        ``pre`` before to ``post`` after the position along dimension
+        ``dim`` is taken and all windows are reduced element-wise.
+        Other dimensions are included in full.
+
+        Windows are read in a single pass with neighbouring windows coalesced
+        into larger reads. The windows are processed in groups of at most
+        ``buffer_size`` bytes. Positions and window bounds are given in the
+        units of the tag and converted to the units of the dimension.
+        The polynomial calibration of the DataArray is applied.
+
+        :param refidx: Index, name or id of the referenced DataArray
+        :param pre: Length of the window before each position
+        :type pre: float
+        :param post: Length of the window after each position
+        :type post: float
+        :param reducer: "mean", "var", "std", "median" or a percentile
+                        (or sequence of percentiles) between 0 and 100
+        :param dim: The dimension of the DataArray the positions refer to,
+                    must be a SampledDimension (default: 0)
+        :type dim: int
+        :param buffer_size: Maximum number of bytes read at once
+                            (default: WINDOW_BUFFER_SIZE)
+        :type buffer_size: int
+
+        :returns: The reduced window; for a sequence of percentiles the
+                  results are stacked along the first axis.
+        :rtype: numpy.ndarray
+        """
+        if len(self.references) == 0:
+            raise OutOfBounds("There are no references in this multitag!")
+        if buffer_size is None:
+            buffer_size = WINDOW_BUFFER_SIZE
+        ref = self.references[refidx]
+        starts, nsamples = self._window_starts(ref, dim, pre, pre + post)
+        if not len(starts):
+            raise OutOfBounds("There are no positions in this multitag!")
+
+        if reducer in ("mean", "var", "std"):
+            # streaming mean and variance (Chan et al.), merged per block
+            count, mean, sqdev = 0, 0.0, 0.0
+            for _, windows in _iter_windows(ref, dim, starts, nsamples,
+                                            buffer_size):
+                windows = windows.astype(np.float64)
+                bcount = len(windows)
+                bmean = windows.mean(axis=0)
+                bsqdev = ((windows - bmean) ** 2).sum(axis=0)
+                delta = bmean - mean
+                total = count + bcount
+                mean = mean + delta * bcount / total
+                sqdev = sqdev + bsqdev + delta ** 2 * count * bcount / total
+                count = total
+            if reducer == "mean":
+                return mean
+            variance = sqdev / count
+            return variance if reducer == "var" else np.sqrt(variance)
+
+        if reducer == "median":
+            reducer = 50.0
+        try:
+            q = np.asarray(reducer, dtype=float)
+        except (TypeError, ValueError):
+            raise ValueError("Invalid reducer: {}".format(reducer))
+        if np.any(q < 0) or np.any(q > 100):
+            raise ValueError("Percentiles must be between 0 and 100")
+        # percentiles need all windows at once: process the windows in
+        # sample ranges that fit into the buffer
+        shape = list(ref.data_extent)
+        shape[dim] = 1
+        colbytes = len(starts) * int(np.prod(shape)) * 8
+        width = max(1, min(nsamples, buffer_size // max(colbytes, 1)))
+        parts = []
+        for first in range(0, nsamples, width):
+            count = min(width, nsamples - first)
+            shape[dim] = count
+            columns = np.empty([len(starts)] + shape)
+            for idx, windows in _iter_windows(ref, dim, starts + first,
+                                              count, buffer_size):
+                columns[idx] = windows
+            parts.append(np.percentile(columns, q, axis=0))
+        return np.concatenate(parts, axis=dim + q.ndim)
+
+    def stack(self, refidx, window, align="start", dim=0, out=None,
+              buffer_size=None):
+        """
+        Cuts a fixed-length window around each position out of a referenced
+        DataArray and stacks the windows into one array of shape
+        (number of positions,) + the shape of the DataArray where the
+        length of dimension ``dim`` is replaced by the number of samples in
+        the window. For a (channels, samples) array and ``dim=1`` this
+        yields an (epochs, channels, samples) array.
+
+        All windows have the same number of samples. They are read with
+        neighbouring windows coalesced into single reads, and written into
+        the output in groups of at most ``buffer_size`` bytes.
+        Positions and the window length are given in the units of the tag.
+
+        :param refidx: Index, name or id of the referenced DataArray
+        :param window: Length of the window
+        :type window: float
+        :param align: Where the position lies within the window: "start"
+                      (default), "center" or "end"
+        :type align: str
+        :param dim: The dimension of the DataArray the positions refer to,
+                    must be a SampledDimension (default: 0)
+        :type dim: int
+        :param out: Optional output, either a numpy array or a DataArray
+                    of the resulting shape. Writing into a DataArray does
+                    not hold all windows in memory at once.
+        :type out: numpy.ndarray or DataArray
+        :param buffer_size: Maximum number of bytes read at once
+                            (default: WINDOW_BUFFER_SIZE)
+        :type buffer_size: int
+
+        :returns: The stacked windows (``out`` if it was given)
+        :rtype: numpy.ndarray or DataArray
+        """
+        if len(self.references) == 0:
+            raise OutOfBounds("There are no references in this multitag!")
+        offsets = {"start": 0.0, "center": window / 2.0, "end": window}
+        if align not in offsets:
+            raise ValueError("Invalid alignment '{}'. Supported alignments "
+                             "are 'start', 'center' and "
+                             "'end'".format(align))
+        if buffer_size is None:
+            buffer_size = WINDOW_BUFFER_SIZE
+        ref = self.references[refidx]
+        starts, nsamples = self._window_starts(ref, dim, offsets[align],
+                                               window)
+        shape = list(ref.data_extent)
+        shape[dim] = nsamples
+        shape = tuple([len(starts)] + shape)
+        if out is not None and tuple(out.shape) != shape:
+            raise IncompatibleDimensions(
+                "Shape of out {} does not match the shape of the "
+                "stacked windows {}".format(tuple(out.shape), shape),
+                "MultiTag.stack"
+            )
+
+        for idx, windows in _iter_windows(ref, dim, starts, nsamples,
+                                          buffer_size):
+            if out is None:
+                out = np.empty(shape, dtype=windows.dtype)
+            if isinstance(out, DataArray):
+                # HDF5 point selections must be in increasing order
+                srt = np.argsort(idx)
+                out[list(idx[srt])] = windows[srt]
+            else:
+                out[idx] = windows
+        if out is None:
+            out = np.empty(shape, dtype=ref.dtype)
+        return out
+
     def retrieve_data(self, posidx, refidx):
         msg = ("Call to deprecated method MultiTag.retrieve_data. "
                "Use MultiTag.tagged_data instead.")
@@ -199,7 +658,7 @@ class MultiTag(BaseTag):
         warnings.warn(msg, category=DeprecationWarning)
         return self.feature_data(posidx, featidx)
 
-    def feature_data(self, posidx, featidx):
+    def _resolve_feature(self, featidx):
         if len(self.features) == 0:
             msg = "There are no features associated with this tag!"
             raise OutOfBounds(msg)
@@ -214,6 +673,10 @@ class MultiTag(BaseTag):
                     break
             if feat is None:
                 raise
+        return feat
+
+    def feature_data(self, posidx, featidx):
+        feat = self._resolve_feature(featidx)
         da = feat.data
         if da is None:
             raise UninitializedEntity()
@@ -238,6 +701,103 @@ class MultiTag(BaseTag):
         slices = tuple(slice(0, stop) for stop in da.data_extent)
         return DataView(da, slices)
 
+    def feature_data_all(self, featidx, positions=None, buffer_size=None):
+        """
+        Retrieves the data of a feature for many positions at once. This is
+        equivalent to calling :meth:`feature_data` for each position, but
+        the feature and the positions and extents are resolved only once
+        and the data is read in as few reads as possible.
+
+        For Indexed features the rows belonging to the positions are
+        returned, as a lazily indexed DataView if all positions are
+        requested and as an array of shape (number of positions,) + the
+        shape of a row otherwise.
+        For Tagged features the data tagged by each position is returned,
+        stacked along a new first axis if all of the slices have the same
+        shape and as a list otherwise. Neighbouring slices are coalesced
+        into single reads of at most ``buffer_size`` bytes.
+        For Untagged features the full data is returned.
+
+        :param featidx: Index, name or id of the feature, or the name or id
+                        of its data
+        :param positions: Indices of the positions (default: all positions)
+        :type positions: list of int
+        :param buffer_size: Maximum number of bytes read at once
+                            (default: WINDOW_BUFFER_SIZE)
+        :type buffer_size: int
+
+        :returns: The feature data for the positions in the order given
+        :rtype: DataView, numpy.ndarray or list of numpy.ndarray
+        """
+        feat = self._resolve_feature(featidx)
+        da = feat.data
+        if da is None:
+            raise UninitializedEntity()
+        if buffer_size is None:
+            buffer_size = WINDOW_BUFFER_SIZE
+        if feat.link_type == LinkType.Untagged:
+            slices = tuple(slice(0, stop) for stop in da.data_extent)
+            return DataView(da, slices)
+
+        posidx = self._position_indices(positions)
+        if feat.link_type == LinkType.Indexed:
+            if positions is None:
+                return self._indexed_feature_view(da, posidx)
+            return self._indexed_feature_rows(da, posidx, buffer_size)
+        return self._tagged_feature_data(da, posidx, buffer_size)
+
+    def _position_indices(self, positions):
+        npos = self.positions.data_extent[0]
+        if positions is None:
+            return np.arange(npos)
+        posidx = np.asarray(positions, dtype=np.int64).reshape(-1)
+        if len(posidx) and (posidx.min() < 0 or posidx.max() >= npos):
+            raise OutOfBounds("Index out of bounds of positions!")
+        return posidx
+
+    @staticmethod
+    def _check_indexed_rows(da, posidx):
+        if len(posidx) and posidx.max() >= da.data_extent[0]:
+            raise OutOfBounds("Position is larger than the data stored "
+                              "in the Feature!")
+
+    def _indexed_feature_view(self, da, posidx):
+        self._check_indexed_rows(da, posidx)
+        slices = [slice(0, len(posidx))]
+        slices.extend(slice(0, stop) for stop in da.data_extent[1:])
+        return DataView(da, slices)
+
+    def _indexed_feature_rows(self, da, posidx, buffer_size):
+        self._check_indexed_rows(da, posidx)
+        rowshape = tuple(da.data_extent[1:])
+        rows, inverse = np.unique(posidx, return_inverse=True)
+        out = None
+        for idx, windows in _iter_windows(da, 0, rows, 1, buffer_size):
+            if out is None:
+                out = np.empty((len(rows),) + rowshape, dtype=windows.dtype)
+            out[idx] = windows[:, 0]
+        if out is None:
+            return np.empty((0,) + rowshape, dtype=da.dtype)
+        return out[inverse]
+
+    def _tagged_feature_data(self, da, posidx, buffer_size):
+        starts, stops = self._calc_all_slices(da, posidx)
+        if len(posidx) and np.any(stops > np.asarray(da.data_extent)):
+            raise OutOfBounds("Requested data slice out of the extent "
+                              "of the Feature!")
+        if len(posidx) == 0:
+            return np.empty((0,), dtype=da.dtype)
+        lengths = stops - starts
+        stacked = np.all(lengths == lengths[0])
+        result = None if stacked else [None] * len(posidx)
+        for idx, arrays in _iter_boxes(da, starts, stops, buffer_size):
+            for i, arr in zip(idx, arrays):
+                if result is None:
+                    result = np.empty((len(posidx),) + arr.shape,
+                                      dtype=arr.dtype)
+                result[i] = arr
+        return result
+
     @property
     def sources(self):
         """
@@ -263,7 +823,9 @@ class MultiTag(BaseTag):
         :type: Section
         """
         if "metadata" in self._h5group:
-            return Section(self.file, None, self._h5group.open_group("metadata"))
+            return self.file._entity(
+                Section, None, self._h5group.open_group("metadata")
+            )
         else:
             return None
 
@@ -271,9 +833,11 @@ class MultiTag(BaseTag):
     def metadata(self, sect):
         if not isinstance(sect, Section):
             raise TypeError("{} is not of type Section".format(sect))
+        self.file._metadata_changed(self, "multi_tags", sect)
         self._h5group.create_link(sect, "metadata")
 
     @metadata.deleter
     def metadata(self):
         if "metadata" in self._h5group:
+            self.file._metadata_changed(self, "multi_tags", None)
             self._h5group.delete("metadata")
@@ -13,7 +13,7 @@ except ImportError:
     from collections import Sequence, Iterable
 from enum import Enum
 from numbers import Number
-from six import string_types, ensure_str, ensure_text
+from six import string_types, ensure_text
 import numpy as np
 
 from .datatype import DataType
@@ -112,6 +112,7 @@ class Property(Entity):
         h5dataset.set_attr("entity_id", oid)
 
         newentity = cls(nixfile, nixparent, h5dataset)
+        nixfile._metadata_modified()
         newentity.force_created_at()
         newentity.force_updated_at()
 
@@ -243,16 +244,7 @@ class Property(Entity):
         if not sum(dataset.shape):
             return tuple()
 
-        data = dataset.read_data()
-
-        def data_to_value(dat):
-            if isinstance(dat, bytes):
-                dat = ensure_str(dat)  # py2compat
-            return dat
-
-        values = tuple(map(data_to_value, data))
-
-        return values
+        return tuple(util.decode_strings(dataset.read_data()))
 
     @values.setter
     def values(self, vals):
@@ -278,20 +270,29 @@ class Property(Entity):
         self._h5dataset.shape = np.shape(vals)
         data = np.array(vals, dtype=vtype)
         self._h5dataset.write_data(data)
+        self.file._metadata_modified()
 
     def extend_values(self, data):
         """
         Extends values to existing data.
         Suitable when new data is nested or original data is long.
+
+        The new values are written after the current end of the dataset
+        without reading the existing values. NumPy arrays are only checked
+        by their dtype, which must be of the same kind as the data type of
+        the property and safely castable to it.
         """
+        if not np.size(data):
+            return
         vtype = self._check_new_value_types(data)
 
         arr = np.array(data, dtype=vtype).flatten('C')
-        ds = self._h5dataset
-        src_len = len(self.values)
         dlen = len(arr)
+        ds = self._h5dataset
+        src_len = ds.shape[0]
         ds.shape = (src_len+dlen,)
         ds.write_data(arr, sl=np.s_[src_len: src_len+dlen])
+        self.file._metadata_modified()
 
     def _check_new_value_types(self, data):
         if (isinstance(data, (Sequence, Iterable)) and
@@ -321,6 +322,12 @@ class Property(Entity):
             # numpy array: no need to scan values, arrays are consistent but
             # check for 1D
             vtype = data.dtype
+            ptype = self.data_type
+            if vtype.kind in ("U", "S") and ptype == DataType.String:
+                vtype = DataType.String
+            elif (isinstance(ptype, np.dtype) and vtype.kind == ptype.kind and
+                    np.can_cast(vtype, ptype, "safe")):
+                vtype = ptype
             check_prop_consistent(vtype)
         else:
             # Will raise an error, if the data type of the first value is not
@@ -342,6 +349,7 @@ class Property(Entity):
 
     def delete_values(self):
         self._h5dataset.shape = (0,)
+        self.file._metadata_modified()
 
     @staticmethod
     def _make_h5_dtype(valued_type):
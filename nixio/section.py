@@ -85,6 +85,7 @@ class Section(Entity):
             raise exceptions.DuplicateName("create_section")
         sec = Section.create_new(self.file, self, sections, name, type_, oid)
         sec._sec_parent = self
+        self.file._section_added(sec, self)
         return sec
 
     # Property
@@ -210,6 +211,8 @@ class Section(Entity):
         sec = obj._parent._h5group.copy(source=src, dest=self._h5group,
                                         name=name, cls=clsname,
                                         keep_id=keep_id)
+        self.file._sections_index = None
+        self.file._metadata_modified()
 
         if not children:
             for p in obj.props:
@@ -227,7 +230,7 @@ class Section(Entity):
         util.check_attr_type(ref, str)
         self._h5group.set_attr("reference", ref)
         if self.file.auto_update_timestamps:
-            self.force_updated_at()
+            self.file._updated(self._h5group)
 
     @property
     def link(self):
@@ -255,7 +258,7 @@ class Section(Entity):
 
         self._h5group.create_link(sec, "link")
         if self.file.auto_update_timestamps:
-            self.force_updated_at()
+            self.file._updated(self._h5group)
 
     def inherited_properties(self):
         properties = self._h5group.open_group("properties")
@@ -279,7 +282,7 @@ class Section(Entity):
         util.check_attr_type(r, str)
         self._h5group.set_attr("repository", r)
         if self.file.auto_update_timestamps:
-            self.force_updated_at()
+            self.file._updated(self._h5group)
 
     @property
     def parent(self):
@@ -287,26 +290,19 @@ class Section(Entity):
         The parent section. This is a read-only property. For root sections
         this property is always None.
 
-        Accessing this property can be slow when the metadata tree is large.
+        The parent is looked up in an index of all sections that is kept by
+        the file.
 
         :type: Section
         """
-        if self._sec_parent is not None:
-            return self._sec_parent
-        # BFS
-        sections = list(self.file.sections)
-        if self in sections:
-            # Top-level section
-            return None
-
-        while sections:
-            sect = sections.pop(0)
-            if self in sect.sections:
-                self._sec_parent = sect
-                return sect
-            sections.extend(sect.sections)
-
-        return None
+        if self._sec_parent is None:
+            index = self.file._section_index()
+            _, parent_id = index.get(self.id, (None, None))
+            if parent_id is None:
+                # Top-level section
+                return None
+            self._sec_parent = self.file._section_by_id(parent_id)
+        return self._sec_parent
 
     @property
     def referring_objects(self):
@@ -321,59 +317,27 @@ class Section(Entity):
 
     @property
     def referring_blocks(self):
-        f = self.file
-        return list(blk for blk in f.blocks
-                    if blk.metadata is not None and blk.metadata.id == self.id)
+        return self.file._referring_entities(self.id, None)
 
     @property
     def referring_groups(self):
-        f = self.file
-        groups = []
-        for blk in f.blocks:
-            groups.extend(grp for grp in blk.groups
-                          if (grp.metadata is not None and
-                              grp.metadata.id == self.id))
-        return groups
+        return self.file._referring_entities(self.id, "groups")
 
     @property
     def referring_data_arrays(self):
-        f = self.file
-        data_arrays = []
-        for blk in f.blocks:
-            data_arrays.extend(da for da in blk.data_arrays
-                               if (da.metadata is not None and
-                                   da.metadata.id == self.id))
-        return data_arrays
+        return self.file._referring_entities(self.id, "data_arrays")
 
     @property
     def referring_tags(self):
-        f = self.file
-        tags = []
-        for blk in f.blocks:
-            tags.extend(tg for tg in blk.tags
-                        if (tg.metadata is not None and
-                            tg.metadata.id == self.id))
-        return tags
+        return self.file._referring_entities(self.id, "tags")
 
     @property
     def referring_multi_tags(self):
-        f = self.file
-        multi_tags = []
-        for blk in f.blocks:
-            multi_tags.extend(mt for mt in blk.multi_tags
-                              if (mt.metadata is not None and
-                                  mt.metadata.id == self.id))
-        return multi_tags
+        return self.file._referring_entities(self.id, "multi_tags")
 
     @property
     def referring_sources(self):
-        f = self.file
-        sources = []
-        for blk in f.blocks:
-            sources.extend(src for src in blk.sources
-                           if (src.metadata is not None and
-                               src.metadata.id == self.id))
-        return sources
+        return self.file._referring_entities(self.id, "sources")
 
     def find_sections(self, filtr=lambda _: True, limit=None):
         """
@@ -396,6 +360,34 @@ class Section(Entity):
             limit = maxint
         return finders._find_sections(self, filtr, limit)
 
+    def iter_sections(self, filtr=None, limit=None, name=None, type_=None,
+                      visit=False):
+        """
+        Get this section and all its child sections recursively, one at a
+        time.
+
+        Like find_sections, this traverses the tree breadth first, but
+        the sections are yielded as they are found, so the traversal can be
+        stopped early. Sections are only instantiated when they are
+        yielded or passed to the filter.
+
+        :param filtr: A filter function
+        :type filtr:  function
+        :param limit: The maximum depth of traversal
+        :type limit:  int
+        :param name: Only yield sections with this name
+        :type name: str
+        :param type_: Only yield sections of this type
+        :type type_: str
+        :param visit: Collect the sections with a single HDF5 visititems
+                      call and yield them in depth first order
+        :type visit: bool
+
+        :returns: A generator of the matching sections.
+        :rtype: generator of Section
+        """
+        return finders.iter_sections(self, filtr, limit, name, type_, visit)
+
     def find_related(self, filtr=lambda _: True):
         """
         Get all related sections of this section.
@@ -90,6 +90,34 @@ class Source(Entity):
             limit = maxint
         return finders._find_sources(self, filtr, limit)
 
+    def iter_sources(self, filtr=None, limit=None, name=None, type_=None,
+                     visit=False):
+        """
+        Get this source and all its child sources recursively, one at a
+        time.
+
+        Like find_sources, this traverses the tree breadth first, but
+        the sources are yielded as they are found, so the traversal can be
+        stopped early. Sources are only instantiated when they are
+        yielded or passed to the filter.
+
+        :param filtr: A filter function
+        :type filtr:  function
+        :param limit: The maximum depth of traversal
+        :type limit:  int
+        :param name: Only yield sources with this name
+        :type name: str
+        :param type_: Only yield sources of this type
+        :type type_: str
+        :param visit: Collect the sources with a single HDF5 visititems
+                      call and yield them in depth first order
+        :type visit: bool
+
+        :returns: A generator of the matching sources.
+        :rtype: generator of Source
+        """
+        return finders.iter_sources(self, filtr, limit, name, type_, visit)
+
     @property
     def sources(self):
         """
@@ -114,7 +142,9 @@ class Source(Entity):
         :type: Section
         """
         if "metadata" in self._h5group:
-            return Section(self.file, None, self._h5group.open_group("metadata"))
+            return self.file._entity(
+                Section, None, self._h5group.open_group("metadata")
+            )
         else:
             return None
 
@@ -122,9 +152,11 @@ class Source(Entity):
     def metadata(self, sect):
         if not isinstance(sect, Section):
             raise TypeError("{} is not of type Section".format(sect))
+        self.file._metadata_changed(self, "sources", sect)
         self._h5group.create_link(sect, "metadata")
 
     @metadata.deleter
     def metadata(self):
         if "metadata" in self._h5group:
+            self.file._metadata_changed(self, "sources", None)
             self._h5group.delete("metadata")
@@ -69,8 +69,7 @@ class BaseTag(Entity):
 
         :type: list of str
         """
-        return tuple(u.decode() if isinstance(u, bytes) else u
-                     for u in self._h5group.get_data("units"))
+        return tuple(util.decode_strings(self._h5group.get_data("units")))
 
     @units.setter
     def units(self, units):
@@ -87,7 +86,7 @@ class BaseTag(Entity):
             dtype = DataType.String
             self._h5group.write_data("units", sanitized, dtype)
         if self.file.auto_update_timestamps:
-            self.force_updated_at()
+            self.file._updated(self._h5group)
 
     def create_feature(self, data, link_type):
         """
@@ -116,12 +115,24 @@ class BaseTag(Entity):
 
     @staticmethod
     def _pos_to_idx(pos, unit, dim):
+        index = BaseTag._pos_to_indices(np.array([pos]), unit, dim)
+        return int(index[0])
+
+    @staticmethod
+    def _pos_to_indices(pos, unit, dim):
+        """
+        Converts an array of positions (in the given unit) to indices into
+        the given dimension.
+
+        :returns: The indices matching the positions
+        :rtype: numpy.ndarray of int
+        """
+        pos = np.asarray(pos, dtype=float)
         dimtype = dim.dimension_type
         if dimtype == DimensionType.Set:
             dimunit = None
         else:
             dimunit = dim.unit
-        scaling = 1.0
         if dimtype == DimensionType.Sample:
             if not dimunit and unit is not None:
                 raise IncompatibleDimensions(
@@ -131,14 +142,13 @@ class BaseTag(Entity):
                 )
             if dimunit and unit is not None:
                 try:
-                    scaling = util.units.scaling(unit, dimunit)
+                    pos = util.units.convert(pos, unit, dimunit)
                 except InvalidUnit:
                     raise IncompatibleDimensions(
                         "Cannot apply a position with unit to a SetDimension",
                         "Tag._pos_to_idx"
                     )
-
-            index = dim.index_of(pos * scaling)
+            index = dim.index_of(pos)
         elif dimtype == DimensionType.Set:
             if unit and unit != "none":
                 raise IncompatibleDimensions(
@@ -147,21 +157,21 @@ class BaseTag(Entity):
                 )
             index = np.round(pos)
             nlabels = len(dim.labels)
-            if nlabels and index > nlabels:
+            if nlabels and np.any(index > nlabels):
                 raise OutOfBounds("Position is out of bounds in SetDimension",
-                                  pos)
+                                  pos[index > nlabels][0])
         else:  # dimtype == DimensionType.Range:
             if dimunit and unit is not None:
                 try:
-                    scaling = util.units.scaling(unit, dimunit)
+                    pos = util.units.convert(pos, unit, dimunit)
                 except InvalidUnit:
                     raise IncompatibleDimensions(
                         "Provided units are not scalable!",
                         "Tag._pos_to_idx"
                     )
-            index = dim.index_of(pos * scaling)
+            index = dim.index_of(pos)
 
-        return int(index)
+        return np.asarray(index).astype(np.int64)
 
 
 class Tag(BaseTag):
@@ -197,7 +207,7 @@ class Tag(BaseTag):
             dtype = DataType.Double
             self._h5group.write_data("position", pos, dtype)
         if self.file.auto_update_timestamps:
-            self.force_updated_at()
+            self.file._updated(self._h5group)
 
     @property
     def extent(self):
@@ -218,7 +228,7 @@ class Tag(BaseTag):
             dtype = DataType.Double
             self._h5group.write_data("extent", ext, dtype)
         if self.file.auto_update_timestamps:
-            self.force_updated_at()
+            self.file._updated(self._h5group)
 
     def _calc_data_slices(self, data):
         refslice = list()
@@ -376,16 +386,20 @@ class Tag(BaseTag):
         :type: Section
         """
         if "metadata" in self._h5group:
-            return Section(self.file, None, self._h5group.open_group("metadata"))
+            return self.file._entity(
+                Section, None, self._h5group.open_group("metadata")
+            )
         return None
 
     @metadata.setter
     def metadata(self, sect):
         if not isinstance(sect, Section):
             raise TypeError("{} is not of type Section".format(sect))
+        self.file._metadata_changed(self, "tags", sect)
         self._h5group.create_link(sect, "metadata")
 
     @metadata.deleter
     def metadata(self):
         if "metadata" in self._h5group:
+            self.file._metadata_changed(self, "tags", None)
             self._h5group.delete("metadata")
@@ -8,6 +8,7 @@
 # LICENSE file in the root of the Project.
 import os
 import unittest
+import numpy as np
 import nixio as nix
 from .tmp import TempDir
 
@@ -146,6 +147,71 @@ class TestBlock(unittest.TestCase):
 
         assert(len(self.block.sources) == 0)
 
+    def test_block_create_many(self):
+        specs = [dict(name="da{}".format(idx), array_type="bulk",
+                      data=np.arange(idx + 1)) for idx in range(5)]
+        specs.append(dict(name="empty", array_type="bulk", shape=(3, 4),
+                          dtype=nix.DataType.Int16))
+        das = self.block.create_data_arrays(specs)
+        assert(len(self.block.data_arrays) == 6)
+        for idx, da in enumerate(das[:5]):
+            assert(da == self.block.data_arrays["da{}".format(idx)])
+            assert(da.type == "bulk")
+            assert(list(da[:]) == list(range(idx + 1)))
+        assert(das[5].shape == (3, 4))
+        assert(das[5].dtype == np.int16)
+        assert(len(set(da.created_at for da in das)) == 1)
+        assert(len(set(da.id for da in das)) == 6)
+
+        tags = self.block.create_tags([dict(name="t1", type_="bulk",
+                                            position=[1.0, 2.0]),
+                                       dict(name="t2", type_="bulk",
+                                            position=[3.0])])
+        assert([tag.position for tag in tags] == [(1.0, 2.0), (3.0,)])
+        assert(len(self.block.tags) == 2)
+
+        sources = self.block.create_sources([dict(name="s1", type_="bulk"),
+                                             dict(name="s2", type_="bulk")])
+        assert([src.name for src in sources] == ["s1", "s2"])
+        assert(sources[1] == self.block.sources["s2"])
+
+        # nothing is created if any of the specs is invalid
+        with self.assertRaises(nix.exceptions.DuplicateName):
+            self.block.create_sources([dict(name="s3", type_="bulk"),
+                                       dict(name="s1", type_="bulk")])
+        with self.assertRaises(nix.exceptions.DuplicateName):
+            self.block.create_tags([dict(name="t3", type_="bulk"),
+                                    dict(name="t3", type_="bulk")])
+        with self.assertRaises(ValueError):
+            self.block.create_data_arrays([dict(name="da9",
+                                                array_type="bulk",
+                                                data=[1]),
+                                           dict(name="da10",
+                                                array_type="bulk")])
+        with self.assertRaises(ValueError):
+            self.block.create_tags([dict(name="t4", type_="bulk"),
+                                    dict(name="t5", type_="bulk",
+                                         position=["x"])])
+        with self.assertRaises(ValueError):
+            self.block.create_data_arrays([dict(name="da11",
+                                                array_type="bulk",
+                                                data=[1]),
+                                           dict(name="da12",
+                                                array_type="bulk",
+                                                data=["x"],
+                                                dtype=nix.DataType.Double)])
+        with self.assertRaises(TypeError):
+            self.block.create_sources([dict(name="s4", typ="bulk")])
+        assert(len(self.block.sources) == 2)
+        assert(len(self.block.tags) == 2)
+        assert(len(self.block.data_arrays) == 6)
+
+        # scalar positions are stored with a single dimension
+        tags = self.block.create_tags([dict(name="t6", type_="bulk"),
+                                       dict(name="t7", type_="bulk",
+                                            position=2.5)])
+        assert([tag.position for tag in tags] == [(0.0,), (2.5,)])
+
     def test_block_find_sources(self):
         for i in range(2):
             self.block.create_source("level1-p0-s" + str(i), "dummy")
@@ -168,6 +234,27 @@ class TestBlock(unittest.TestCase):
                                                            x.name,
                                            limit=1)) == 0)
 
+    def test_block_iter_sources(self):
+        for i in range(2):
+            src = self.block.create_source("level1-s" + str(i), "dummy")
+            src.create_source("level2-s" + str(i), "deep")
+
+        for visit in (False, True):
+            self.assertEqual(
+                len(list(self.block.iter_sources(visit=visit))), 4
+            )
+            self.assertEqual(
+                len(list(self.block.iter_sources(limit=1, visit=visit))), 2
+            )
+            deep = list(self.block.iter_sources(type_="deep", visit=visit))
+            self.assertEqual(sorted(s.name for s in deep),
+                             ["level2-s0", "level2-s1"])
+            src = self.block.sources["level1-s1"]
+            self.assertEqual(
+                [s.name for s in src.iter_sources(visit=visit)],
+                ["level1-s1", "level2-s1"]
+            )
+
     def test_block_groups(self):
         assert(len(self.block.groups) == 0)
 
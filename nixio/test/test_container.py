@@ -509,3 +509,61 @@ class TestContainer(unittest.TestCase):
         inhpropnames = [p.name for p in chsecb.inherited_properties()]
         self.assertIs(None, chsecb.link)
         self.assertNotIn("2Prop", inhpropnames)
+
+    def test_delete_many(self):
+        arrays = [self.block.create_data_array("da{}".format(idx),
+                                               "containertest", data=[idx])
+                  for idx in range(6)]
+        for da in arrays:
+            self.group.data_arrays.append(da)
+        self.tag.references.extend(arrays[:3])
+
+        self.block.data_arrays.delete_many([arrays[0], arrays[1].name,
+                                            arrays[2].id])
+        for da in arrays[:3]:
+            self.assertNotIn(da.id, self.block.data_arrays)
+            self.assertNotIn(da.id, self.group.data_arrays)
+        self.assertEqual(len(self.tag.references), 0)
+        self.assertEqual(len(self.group.data_arrays), 4)
+
+        # links created after the first deletion are found as well
+        self.tag.references.append(arrays[3])
+        del self.block.data_arrays[arrays[3].name]
+        self.assertEqual(len(self.tag.references), 0)
+        del self.block.data_arrays[arrays[4].name]
+        self.assertNotIn(arrays[4].id, self.group.data_arrays)
+
+        # nothing is deleted if one of the items is invalid
+        with self.assertRaises(KeyError):
+            self.block.data_arrays.delete_many([arrays[5], "notexist"])
+        self.assertIn(arrays[5].id, self.block.data_arrays)
+
+        # deleting links only removes the links
+        self.group.data_arrays.delete_many([arrays[5], self.dataarray])
+        self.assertEqual(len(self.group.data_arrays), 0)
+        self.assertIn(arrays[5].id, self.block.data_arrays)
+
+        # sources are deleted with their children
+        src = self.block.create_source("src", "containertest")
+        child = src.create_source("child", "containertest")
+        self.dataarray.sources.append(child)
+        self.block.sources.delete_many([src])
+        self.assertEqual(len(self.block.sources), 0)
+        self.assertEqual(len(self.dataarray.sources), 0)
+
+    def test_identity(self):
+        # repeated accesses return the same object while it is in use
+        self.assertIs(self.block.data_arrays["test array"], self.dataarray)
+        self.assertIs(self.block.data_arrays[0], self.dataarray)
+        self.assertIs(self.group.data_arrays[0], self.dataarray)
+        self.assertIs(self.file.blocks[0], self.block)
+        self.assertIs(self.multi_tag.positions, self.positions)
+        dims = self.dataarray.dimensions
+        self.assertIs(self.block.data_arrays[0].dimensions, dims)
+
+        # a new object with the same name is a new entity
+        del self.block.data_arrays["test array"]
+        newarray = self.block.create_data_array("test array",
+                                                "containertest", data=[1])
+        self.assertIsNot(newarray, self.dataarray)
+        self.assertIs(self.block.data_arrays["test array"], newarray)
@@ -11,10 +11,16 @@ try:
 except ImportError:
     from collections import OrderedDict
 import sys
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
 
 
 class TestDataFrame(unittest.TestCase):
 
+    layout = nix.DataFrameLayout.Compound
+
     def setUp(self):
 
         self.tmpdir = TempDir("dataframetest")
@@ -31,13 +37,16 @@ class TestDataFrame(unittest.TestCase):
         other_arr = np.arange(11101, 11200).reshape((33, 3))
         other_di = OrderedDict({'name': np.int64, 'id': int, 'time': float})
         self.df1 = self.block.create_data_frame("test df", "signal1",
-                                                data=arr, col_dict=di)
+                                                data=arr, col_dict=di,
+                                                layout=self.layout)
         self.df2 = self.block.create_data_frame("other df", "signal2",
-                                                data=arr, col_dict=di)
+                                                data=arr, col_dict=di,
+                                                layout=self.layout)
         self.df3 = self.block.create_data_frame("reference df", "signal3",
                                                 data=other_arr,
-                                                col_dict=other_di)
-        self.dtype = self.df1._h5group.group["data"].dtype
+                                                col_dict=other_di,
+                                                layout=self.layout)
+        self.dtype = self.df1.data_type
 
     def tearDown(self):
         self.file.close()
@@ -57,7 +66,8 @@ class TestDataFrame(unittest.TestCase):
         dtlist = np.array([np.int64, str, float, np.float64, np.int32])
         df_li = self.block.create_data_frame("test_list", "make_of_list",
                                              data=arr, col_names=namelist,
-                                             col_dtypes=dtlist)
+                                             col_dtypes=dtlist,
+                                             layout=self.layout)
         assert df_li.column_names == self.df1.column_names
         assert df_li.dtype == self.df1.dtype
         for i in df_li[:]:
@@ -106,6 +116,18 @@ class TestDataFrame(unittest.TestCase):
         self.df1.write_column(column2, index=4)
 
         assert list(self.df1[:]['sig2']) == list(column2)
+        # write in several chunks, other columns are left untouched
+        from nixio import data_frame
+        chunk_bytes = data_frame._CHUNK_BYTES
+        data_frame._CHUNK_BYTES = 24
+        try:
+            self.df1.write_column(list("klmnopqrst"), name='id')
+            self.df1.write_column(np.arange(10), index=0)
+        finally:
+            data_frame._CHUNK_BYTES = chunk_bytes
+        assert list(self.df1[:]['id']) == list("klmnopqrst")
+        assert list(self.df1[:]['name']) == list(range(10))
+        assert list(self.df1[:]['sig2']) == list(column2)
 
     def test_read_row(self):
         # read single row
@@ -126,6 +148,15 @@ class TestDataFrame(unittest.TestCase):
         # read columns with slices
         sl_col = self.df1.read_columns(name=['sig1', 'sig2'], sl=slice(0, 10))
         assert len(sl_col) == 10
+        # only the requested fields are returned
+        sl_col = self.df1.read_columns(name=['id', 'sig2'], sl=slice(2, 5))
+        assert sl_col.dtype.names == ('id', 'sig2')
+        assert list(sl_col['id']) == ['c', 'd', 'e']
+        assert list(sl_col['sig2']) == [100, 150, 200]
+        # grouped by columns
+        by_col = self.df1.read_columns(index=[0, 4], group_by_cols=True)
+        assert by_col.shape == (2, 10)
+        assert list(by_col[1][:3]) == [100, 101, 100]
 
     def test_read_cell(self):
         # read cell by position
@@ -165,6 +196,23 @@ class TestDataFrame(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.df1.append_column(long, name='long')
 
+    def test_append_column_chunked(self):
+        from nixio import data_frame
+        chunk_bytes = data_frame._CHUNK_BYTES
+        data_frame._CHUNK_BYTES = 3 * self.dtype.itemsize
+        try:
+            self.df1.append_column(["s{}".format(i) for i in range(10)],
+                                   name='label', datatype=str)
+        finally:
+            data_frame._CHUNK_BYTES = chunk_bytes
+        assert list(self.df1["label"]) == ["s{}".format(i) for i in range(10)]
+        assert list(self.df1["id"]) == list("abcdefghij")
+        np.testing.assert_almost_equal(self.df1["time"][:2], [20.18, 20.09])
+        # the rebuilt dataset can still grow
+        self.df1.append_rows([(3, "k", 20.0, 5.0, 1, "s10")])
+        assert self.df1.row_count() == 11
+        assert list(self.df1[10]) == [3, "k", 20.0, 5.0, 1, "s10"]
+
     def test_append_rows(self):
         # append single row
         srow = [1, "test", 3, 4, 5]
@@ -204,10 +252,150 @@ class TestDataFrame(unittest.TestCase):
     def test_creation_without_name(self):
         data = np.array([("a", 1, 2.2), ("b", 2, 3.3), ("c", 3, 4.4)],
                         dtype=[('name', 'U10'), ("id", 'i4'), ('val', 'f4')])
-        df = self.block.create_data_frame("without_name", "test", data=data)
+        df = self.block.create_data_frame("without_name", "test", data=data,
+                                          layout=self.layout)
         assert sorted(list(df.column_names)) == sorted(["name", "id", "val"])
         assert sorted(list(df["name"])) == ["a", "b", "c"]
 
+    def test_csv_roundtrip(self):
+        from nixio import block
+        csvname = os.path.join(self.tmpdir.path, "df1.csv")
+        self.df1.write_to_csv(csvname)
+        with open(csvname) as csvfile:
+            lines = csvfile.read().splitlines()
+        assert lines[0] == "name,id,time,sig1,sig2"
+        assert lines[1] == "1,a,20.18,5.0,100"
+        assert len(lines) == 11
+
+        chunk_rows = block._CSV_CHUNK_ROWS
+        block._CSV_CHUNK_ROWS = 3
+        try:
+            df = self.block.create_data_frame_from_csv(
+                "from csv", "csv", csvname, col_dict={"sig2": np.int32},
+                layout=self.layout
+            )
+            # a value in a later chunk that does not match the column type
+            # guessed from the first chunk
+            badname = os.path.join(self.tmpdir.path, "bad.csv")
+            with open(badname, "w") as csvfile:
+                csvfile.write("num,name\n1,a\n2,b\n3,c\nfour,d\n")
+            ndf = len(self.block.data_frames)
+            with self.assertRaises(ValueError):
+                self.block.create_data_frame_from_csv("bad", "csv", badname,
+                                                      layout=self.layout)
+            assert len(self.block.data_frames) == ndf
+            assert "bad" not in self.block.data_frames
+        finally:
+            block._CSV_CHUNK_ROWS = chunk_rows
+        assert df.column_names == self.df1.column_names
+        assert df.dtype[0] == np.int64
+        assert df.dtype[2] == np.float64
+        assert df.dtype[4] == np.int32
+        assert df.row_count() == 10
+        for row, orig in zip(df[:], self.df1[:]):
+            assert list(row) == list(orig)
+
+        with self.assertRaises(ValueError):
+            self.block.create_data_frame_from_csv("bad", "csv", csvname,
+                                                  col_dict={"nope": int})
+
+    @unittest.skipIf(pd is None, "pandas is not installed")
+    def test_pandas(self):
+        self.df1.units = ["s", "", "ms", "Hz", "mA"]
+        pdf = self.df1.to_pandas()
+        assert tuple(pdf.columns) == self.df1.column_names
+        assert list(pdf["id"]) == list("abcdefghij")
+        assert pdf["sig2"].dtype == np.int32
+        assert pdf.attrs["units"] == {"name": "s", "time": "ms",
+                                      "sig1": "Hz", "sig2": "mA"}
+        part = self.df1.to_pandas(columns=["time", 4], rows=slice(2, 5))
+        assert tuple(part.columns) == ("time", "sig2")
+        assert list(part.index) == [2, 3, 4]
+        assert list(part["sig2"]) == [100, 150, 200]
+        chunks = list(self.df1.to_pandas(columns=["id"], chunksize=4))
+        assert [len(c) for c in chunks] == [4, 4, 2]
+        assert list(chunks[-1].index) == [8, 9]
+        assert list(pd.concat(chunks)["id"]) == list("abcdefghij")
+
+        df = self.block.create_data_frame("from pandas", "pd",
+                                          from_pandas=pdf,
+                                          layout=self.layout)
+        assert df.column_names == self.df1.column_names
+        assert df.dtype == self.df1.dtype
+        assert list(df.units) == ["s", None, "ms", "Hz", "mA"]
+        for row, orig in zip(df[:], self.df1[:]):
+            assert list(row) == list(orig)
+        df = self.block.create_data_frame("from chunks", "pd",
+                                          from_pandas=iter(chunks),
+                                          layout=self.layout)
+        assert df.column_names == ("id", )
+        assert list(df["id"]) == list("abcdefghij")
+
+    def test_where(self):
+        rows = self.df1.where("name == 2 and sig2 >= 200")
+        np.testing.assert_array_equal(rows, [4, 5, 8, 9])
+        rows = self.df1.where("id == 'a' or (time > 20.2 and not sig1 < 5.7)")
+        np.testing.assert_array_equal(rows, [0, 4])
+        rows = self.df1.where(lambda data: data["sig2"] == 100,
+                              columns=["sig2"])
+        np.testing.assert_array_equal(rows, [0, 2])
+        assert len(self.df1.where("id == 3")) == 0
+        with self.assertRaises(ValueError):
+            self.df1.where("nope < 3")
+        with self.assertRaises(ValueError):
+            self.df1.where("sig2 <")
+
+        from nixio import data_frame
+        chunk_bytes = data_frame._CHUNK_BYTES
+        data_frame._CHUNK_BYTES = 16
+        try:
+            np.testing.assert_array_equal(
+                self.df1.where("name == 2 and sig2 >= 200"), [4, 5, 8, 9]
+            )
+            # with an index on sig2
+            self.df1.create_index("sig2")
+            np.testing.assert_array_equal(self.df1.where("sig2 >= 200"),
+                                          [4, 5, 7, 8, 9])
+            np.testing.assert_array_equal(
+                self.df1.where("name == 2 and sig2 >= 200"), [4, 5, 8, 9]
+            )
+            np.testing.assert_array_equal(self.df1.where("sig2 == 100"),
+                                          [0, 2])
+            self.df1.create_index("id")
+            np.testing.assert_array_equal(
+                self.df1.where("id > 'g' and sig1 < 5.5"), [7, 9]
+            )
+        finally:
+            data_frame._CHUNK_BYTES = chunk_bytes
+        # candidate rows are read one by one
+        sparse_factor = data_frame._SPARSE_FACTOR
+        data_frame._SPARSE_FACTOR = 100
+        try:
+            np.testing.assert_array_equal(
+                self.df1.where("sig2 >= 200 and name == 2"), [4, 5, 8, 9]
+            )
+        finally:
+            data_frame._SPARSE_FACTOR = sparse_factor
+        assert "indices" in self.df1._h5group
+        # the index is dropped when the data is modified
+        self.df1.write_column(np.zeros(10, dtype=np.int32), name="sig2")
+        assert "indices" not in self.df1._h5group
+        np.testing.assert_array_equal(self.df1.where("sig2 == 0"),
+                                      np.arange(10))
+
+    def test_where_nan_index(self):
+        data = np.array([(0.1,), (np.nan,), (0.7,), (0.6,), (np.nan,)],
+                        dtype=[("rt", np.float64)])
+        df = self.block.create_data_frame("nan frame", "test", data=data,
+                                          layout=self.layout)
+        queries = ("rt > 0.5", "rt >= 0.6", "rt < 0.65", "rt <= 0.1",
+                   "rt == 0.7")
+        scanned = [df.where(query) for query in queries]
+        np.testing.assert_array_equal(scanned[0], [2, 3])
+        df.create_index("rt")
+        for query, rows in zip(queries, scanned):
+            np.testing.assert_array_equal(df.where(query), rows)
+
     def test_timestamp_autoupdate(self):
         self.file.auto_update_timestamps = True
         df = self.block.create_data_frame("df.time", "test.time",
@@ -225,3 +413,42 @@ class TestDataFrame(unittest.TestCase):
         time.sleep(1)
         df.units = "ly"
         self.assertEqual(dftime, df.updated_at)
+
+
+class TestDataFrameColumns(TestDataFrame):
+
+    layout = nix.DataFrameLayout.Columns
+
+    def test_unknown_layout(self):
+        self.df1._h5group.set_attr("layout", "Rows")
+        with self.assertRaises(RuntimeError):
+            self.df1.row_count()
+
+    def test_layout(self):
+        assert self.df1.layout == nix.DataFrameLayout.Columns
+        # the non-standard layout is marked in the file
+        assert self.df1._h5group.get_attr("layout") == "Columns"
+        assert "data" not in self.df1._h5group
+        assert len(self.df1._h5group.open_group("columns")) == 5
+        self.df1.append_column(np.arange(10), name="extra")
+        assert len(self.df1._h5group.open_group("columns")) == 6
+        with self.assertRaises(nix.exceptions.DuplicateColumnName):
+            self.df1.append_column(np.arange(10), name="extra")
+        self.block.create_data_frame(
+            "compound df", "signal1", data=self.df2[:],
+            layout=nix.DataFrameLayout.Compound
+        )
+        # both layouts read the same after reopening
+        self.file.close()
+        self.file = nix.File.open(self.testfilename, nix.FileMode.ReadOnly)
+        block = self.file.blocks[0]
+        df = block.data_frames["test df"]
+        assert df.layout == nix.DataFrameLayout.Columns
+        assert df.column_names[-1] == "extra"
+        assert list(df[3]) == [1, "d", 20.15, 5.3, 150, 3]
+        compound = block.data_frames["compound df"]
+        assert compound.layout == nix.DataFrameLayout.Compound
+        assert "layout" not in compound._h5group.group.attrs
+        np.testing.assert_array_equal(df.read_columns(name=["id", "sig1"]),
+                                      compound.read_columns(name=["id",
+                                                                  "sig1"]))
@@ -82,6 +82,8 @@ class TestDimension(unittest.TestCase):
         assert(self.sample_dim.index_of(3.14) == 0)
         assert(self.sample_dim.index_of(23.) == 10)
         assert(type(self.sample_dim.index_of(23.) == int))
+        assert(list(self.sample_dim.index_of([3.14, 23.])) == [0, 10])
+        self.assertRaises(IndexError, self.sample_dim.index_of, [5., 1.])
 
         assert(self.sample_dim.position_at(0) == 3.)
         assert(self.sample_dim.position_at(200) == 200*2.+3.)
@@ -122,6 +124,8 @@ class TestDimension(unittest.TestCase):
         assert(self.range_dim.index_of(28.26) == 9)
         assert(self.range_dim.index_of(100.) == 9)
         assert(self.range_dim.index_of(-100.) == 0)
+        assert(list(self.range_dim.index_of([-100., 18.84, 100.])) ==
+               [0, 6, 9])
 
         assert(self.range_dim.tick_at(0) == 0)
         assert(self.range_dim.tick_at(9) == other[-1])
@@ -487,3 +491,25 @@ class TestLinkDimension(unittest.TestCase):
         self.range_dim.link_data_array(tickarray, [-1])
         assert "link" in self.range_dim._h5group
         assert "ticks" not in self.range_dim._h5group
+
+    def test_link_values_cache(self):
+        tickarray = self.block.create_data_array(
+            "ticks", "array.dimension.ticks",
+            data=np.random.random((4, 15))
+        )
+        tickarray[2, :] = np.linspace(0, 100, 15)
+        self.range_dim.link_data_array(tickarray, [2, -1])
+        dimlink = self.range_dim.dimension_link
+        values = dimlink.values
+        assert np.all(values == np.linspace(0, 100, 15))
+        assert dimlink.values is values
+        with self.assertRaises(ValueError):
+            values[0] = 1000
+
+        # writing to the linked array invalidates the cached values
+        tickarray[2, :] = np.linspace(0, 200, 15)
+        assert np.all(self.range_dim.ticks == np.linspace(0, 200, 15))
+
+        # resizing as well
+        tickarray.append(np.zeros((1, 15)))
+        assert dimlink.values is not values
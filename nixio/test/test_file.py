@@ -61,6 +61,25 @@ class TestFile(unittest.TestCase):
 
         assert(len(self.file.blocks) == 0)
 
+    def test_file_generation(self):
+        otherfilename = os.path.join(self.tmpdir.path, "otherfile.nix")
+        other = nix.File.open(otherfilename, nix.FileMode.Overwrite)
+        generation = self.file._generation
+        othergeneration = other._generation
+
+        block = self.file.create_block("test block", "recordingsession")
+        assert(self.file._generation > generation)
+        assert(other._generation == othergeneration)
+
+        generation = self.file._generation
+        other.create_block("other block", "recordingsession")
+        assert(self.file._generation == generation)
+        assert(other._generation > othergeneration)
+        other.close()
+
+        del self.file.blocks[block.name]
+        assert(len(self.file.blocks) == 0)
+
     def test_file_sections(self):
         assert(len(self.file.sections) == 0)
 
@@ -101,6 +120,122 @@ class TestFile(unittest.TestCase):
                                                            x.name,
                                            limit=1)) == 0)
 
+    def test_metadata_snapshot(self):
+        session = self.file.create_section("session", "recording")
+        session.definition = "a recording session"
+        subject = session.create_section("subject", "animal")
+        subject["species"] = "mouse"
+        subject["weight"] = 21.5
+        subject.props["weight"].unit = "g"
+        session["trials"] = [1, 2, 3]
+        other = self.file.create_section("other", "recording")
+        other.link = subject
+
+        snapshot = self.file.metadata_snapshot()
+        self.assertEqual(len(snapshot), 2)
+        self.assertIn("session", snapshot)
+        snapsession = snapshot["session"]
+        self.assertEqual(snapsession.id, session.id)
+        self.assertEqual(snapsession.type, "recording")
+        self.assertEqual(snapsession.definition, "a recording session")
+        self.assertIsNone(snapsession.parent)
+        self.assertEqual(snapsession["trials"], [1, 2, 3])
+        snapsubject = snapsession["subject"]
+        self.assertIs(snapsubject.parent, snapsession)
+        self.assertEqual(snapsubject["species"], "mouse")
+        self.assertEqual(snapsubject["weight"], 21.5)
+        self.assertEqual(snapsubject.props["weight"].unit, "g")
+        self.assertEqual(snapsubject.props["weight"].values,
+                         subject.props["weight"].values)
+        self.assertIs(snapshot["other"].link, snapsubject)
+        self.assertIs(snapshot.section(subject.id), snapsubject)
+        self.assertEqual([sec.name for sec in snapshot.iter_sections()],
+                         ["session", "other", "subject"])
+
+        # the snapshot does not follow changes to the file
+        subject["species"] = "rat"
+        self.assertEqual(snapsubject["species"], "mouse")
+
+    def test_query_metadata(self):
+        sessions = list()
+        for idx, (species, duration) in enumerate([("mouse", 200),
+                                                   ("mouse", 400),
+                                                   ("rat", 500)]):
+            session = self.file.create_section("session %d" % idx,
+                                               "session")
+            subject = session.create_section("subject", "Subject")
+            subject["species"] = species
+            recording = session.create_section("recording", "Recording")
+            recording["duration"] = duration
+            recording["tags"] = ["a", "b"] if idx else ["c"]
+            sessions.append(session)
+
+        def names(sections):
+            return [(sec.parent.name, sec.name)
+                    for sec in sections]
+
+        query = self.file.query_metadata
+        self.assertEqual(names(query("Subject/species == 'mouse'")),
+                         [("session 0", "subject"), ("session 1", "subject")])
+        self.assertEqual(len(query("Recording/duration >= 400")), 2)
+        self.assertEqual(len(query("duration < 400")), 1)
+        self.assertEqual(len(query("Recording/duration != 400")), 2)
+        self.assertEqual(len(query("recording/tags == 'b'")), 2)
+        self.assertEqual(len(query("Recording/tags")), 3)
+        self.assertEqual(len(query("session")), 3)
+        self.assertEqual(query("'session 2'"), [sessions[2]])
+        self.assertEqual(
+            query("Subject/species == 'mouse' and Recording/duration > 300"),
+            [sessions[1]]
+        )
+        self.assertEqual(
+            query("(Subject/species == 'rat' or Recording/duration < 300) "
+                  "and session"),
+            [sessions[0], sessions[2]]
+        )
+        self.assertEqual(query("Subject/species == 'cat'"), [])
+        self.assertEqual(query("Subject/weight > 1"), [])
+
+        # terms on the same section must be satisfied by the same section
+        young = self.file.create_section("young", "Subject")
+        young["species"] = "mouse"
+        young["age"] = 1
+        old = self.file.create_section("old", "Subject")
+        old["species"] = "rat"
+        old["age"] = 5
+        self.assertEqual(
+            query("Subject/species == 'mouse' and Subject/age > 3"), []
+        )
+        self.assertEqual(
+            query("Subject/species == 'rat' and Subject/age > 3"), [old]
+        )
+        exp = self.file.create_section("exp", "experiment")
+        for name, species, age in (("a", "mouse", 1), ("b", "rat", 5)):
+            subject = exp.create_section(name, "Subject")
+            subject["species"] = species
+            subject["age"] = age
+        self.assertEqual(
+            query("Subject/species == 'mouse' and Subject/age > 3"), []
+        )
+        # matches without a common ancestor section are not combined
+        self.assertEqual(
+            query("Subject/species == 'rat' and Recording/duration > 300"),
+            [sessions[2]]
+        )
+        for name in ("young", "old", "exp"):
+            del self.file.sections[name]
+
+        # the index follows changes to the metadata
+        sessions[2]["subject"]["species"] = "mouse"
+        self.assertEqual(len(query("Subject/species == 'mouse'")), 3)
+        del self.file.sections["session 0"]
+        self.assertEqual(len(query("Subject/species == 'mouse'")), 2)
+
+        for invalid in ("Subject/species ==", "Subject/ == 1",
+                        "(session", "session session", "a == b"):
+            with self.assertRaises(ValueError):
+                query(invalid)
+
     def test_order_tracking(self):
         blknames = []
         for idx in range(10):
@@ -221,6 +356,34 @@ class TestFile(unittest.TestCase):
         rblk.type = "time should change"
         self.assertEqual(rblk.updated_at, rblktime)
 
+    def test_timestamp_batch(self):
+        blk = self.file.create_block("block", "timetest")
+        da = blk.create_data_array("array", "timetest", data=[1, 2, 3])
+        blktime = blk.updated_at
+        datime = da.updated_at
+        time.sleep(1)  # wait for time to change
+        with self.file.batch():
+            blk.definition = "updated"
+            self.file.blocks["block"].type = "updated again"
+            with self.file.batch():
+                da.unit = "mV"
+                da.label = "voltage"
+            # updates are deferred until the outermost batch ends
+            self.assertEqual(blk.updated_at, blktime)
+            self.assertEqual(da.updated_at, datime)
+        self.assertNotEqual(blk.updated_at, blktime)
+        self.assertNotEqual(da.updated_at, datime)
+        self.assertEqual(blk.updated_at, da.updated_at)
+        self.assertEqual(blk.type, "updated again")
+
+        # no updates are recorded without automatic timestamps
+        self.file.auto_update_timestamps = False
+        blktime = blk.updated_at
+        time.sleep(1)  # wait for time to change
+        with self.file.batch():
+            blk.definition = "not updated"
+        self.assertEqual(blk.updated_at, blktime)
+
 
 class TestFileVer(unittest.TestCase):
 
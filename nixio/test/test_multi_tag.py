@@ -602,3 +602,282 @@ class TestMultiTags(unittest.TestCase):
                                                     "test.time",
                                                     nix.DataType.Int8, (0,))
         self.assertEqual(mtag.updated_at, mtagtime)
+
+    def test_multi_tag_query(self):
+        starts = np.array([5.0, 0.5, 3.0, 9.0, 1.0, 7.5])
+        lengths = np.array([1.0, 0.2, 4.0, 0.5, 0.0, 0.1])
+        pos = self.block.create_data_array("qpos", "test.query", data=starts)
+        ext = self.block.create_data_array("qext", "test.query", data=lengths)
+        mtag = self.block.create_multi_tag("qtag", "test.query", pos, ext)
+
+        def brute_force(lower, upper):
+            ends = starts + lengths
+            return np.flatnonzero((starts <= upper) & (ends >= lower))
+
+        for lower, upper in [(0.0, 1.0), (4.0, 4.5), (6.5, 7.4), (0, 10),
+                             (9.6, 12.0), (1.0, 1.0)]:
+            np.testing.assert_array_equal(mtag.query(lower, upper),
+                                          brute_force(lower, upper))
+
+        # index is rebuilt when the positions change
+        pos[0] = 20.0
+        starts[0] = 20.0
+        np.testing.assert_array_equal(mtag.query(19.0, 21.0), [0])
+        np.testing.assert_array_equal(mtag.query(4.0, 6.0),
+                                      brute_force(4.0, 6.0))
+
+        # and when the extents are replaced
+        mtag.extents = None
+        np.testing.assert_array_equal(mtag.query(3.5, 7.0), [])
+        np.testing.assert_array_equal(mtag.query(2.9, 3.0), [2])
+
+        # multidimensional positions
+        np.testing.assert_array_equal(self.feature_tag.query(0.0, 0.0),
+                                      [0, 1])
+        np.testing.assert_array_equal(
+            self.feature_tag.query(0.0, 3.0, dim=1), [0]
+        )
+        np.testing.assert_array_equal(
+            self.feature_tag.query(8.5, 8.6, dim=1), [0, 1]
+        )
+        np.testing.assert_array_equal(
+            self.feature_tag.query(9.5, 10.0, dim=1), [1]
+        )
+        with self.assertRaises(ValueError):
+            mtag.query(2.0, 1.0)
+
+    def test_multi_tag_interval_index(self):
+        from nixio.multi_tag import _IntervalIndex
+        starts = np.random.uniform(0, 100, 200)
+        extents = np.random.uniform(-5, 5, 200)
+        # a few long intervals
+        extents[:5] = 80
+        index = _IntervalIndex(starts, extents)
+        lows = np.minimum(starts, starts + extents)
+        highs = np.maximum(starts, starts + extents)
+        for lower in np.linspace(-10, 110, 25):
+            upper = lower + 3
+            expected = np.flatnonzero((lows <= upper) & (highs >= lower))
+            np.testing.assert_array_equal(index.overlapping(lower, upper),
+                                          expected)
+        assert len(_IntervalIndex([], []).overlapping(0, 1)) == 0
+
+    def test_multi_tag_triggered_average(self):
+        interval = 0.5
+        signal = np.random.random((2, 400))
+        da = self.block.create_data_array("trig signal", "test.signal",
+                                          data=signal)
+        da.append_set_dimension()
+        sdim = da.append_sampled_dimension(interval, unit="ms", offset=1.0)
+        times = np.array([0.02, 0.1, 0.0255, 0.15, 0.06])
+        pos = np.zeros((len(times), 2))
+        pos[:, 1] = times
+        pos_da = self.block.create_data_array("trig pos", "test.pos",
+                                              data=pos)
+        mtag = self.block.create_multi_tag("trig tag", "test", pos_da)
+        mtag.units = ["none", "s"]
+        mtag.references.append(da)
+
+        pre, post = 0.005, 0.01
+        starts = np.round((times * 1000 - pre * 1000 - sdim.offset) /
+                          interval).astype(int)
+        nsamples = int(np.round((pre + post) * 1000 / interval)) + 1
+        windows = np.array([signal[:, s:s+nsamples] for s in starts])
+
+        for buffer_size in (None, 1, 2000):
+            avg = mtag.triggered_average(0, pre, post, dim=1,
+                                         buffer_size=buffer_size)
+            np.testing.assert_almost_equal(avg, windows.mean(axis=0))
+            var = mtag.triggered_average("trig signal", pre, post,
+                                         reducer="var", dim=1,
+                                         buffer_size=buffer_size)
+            np.testing.assert_almost_equal(var, windows.var(axis=0))
+            std = mtag.triggered_average(0, pre, post, reducer="std",
+                                         dim=1, buffer_size=buffer_size)
+            np.testing.assert_almost_equal(std, windows.std(axis=0))
+            med = mtag.triggered_average(0, pre, post, reducer="median",
+                                         dim=1, buffer_size=buffer_size)
+            np.testing.assert_almost_equal(med, np.median(windows, axis=0))
+            pct = mtag.triggered_average(0, pre, post, reducer=[10, 90],
+                                         dim=1, buffer_size=buffer_size)
+            np.testing.assert_almost_equal(
+                pct, np.percentile(windows, [10, 90], axis=0)
+            )
+
+        # calibration is applied
+        da.polynom_coefficients = [1.0, 2.0]
+        avg = mtag.triggered_average(0, pre, post, dim=1)
+        np.testing.assert_almost_equal(avg, (1.0 + 2.0 * windows).mean(0))
+
+        with self.assertRaises(nix.exceptions.IncompatibleDimensions):
+            mtag.triggered_average(0, pre, post, dim=0)
+        with self.assertRaises(nix.exceptions.OutOfBounds):
+            mtag.triggered_average(0, 0.5, post, dim=1)
+        with self.assertRaises(ValueError):
+            mtag.triggered_average(0, pre, post, reducer="mode", dim=1)
+
+    def test_multi_tag_window_buffer(self):
+        from nixio import multi_tag
+        signal = np.random.random((2, 5000)).astype(np.float32)
+        da = self.block.create_data_array("buffer signal", "test.signal",
+                                          data=signal)
+        da.append_set_dimension()
+        da.append_sampled_dimension(1.0, unit="ms")
+        # heavily overlapping windows
+        pos = np.zeros((300, 2))
+        pos[:, 1] = np.arange(300) * 10.0
+        pos_da = self.block.create_data_array("buffer pos", "test.pos",
+                                              data=pos)
+        mtag = self.block.create_multi_tag("buffer tag", "test", pos_da)
+        mtag.units = ["none", "ms"]
+        mtag.references.append(da)
+        # calibrated data is read as double
+        da.polynom_coefficients = [0.0, 1.0]
+
+        chunks = list()
+        iter_windows = multi_tag._iter_windows
+
+        def recording_iter_windows(*args):
+            for idx, windows in iter_windows(*args):
+                chunks.append(windows.nbytes)
+                yield idx, windows
+
+        buffer_size = 2 ** 16
+        starts = np.arange(300) * 10
+        windows = np.array([signal[:, s:s+2001] for s in starts])
+        multi_tag._iter_windows = recording_iter_windows
+        try:
+            avg = mtag.triggered_average(0, 0.0, 2000.0, dim=1,
+                                         buffer_size=buffer_size)
+        finally:
+            multi_tag._iter_windows = iter_windows
+        np.testing.assert_almost_equal(avg, windows.mean(axis=0), 5)
+        assert len(chunks) > 1
+        assert max(chunks) <= buffer_size
+
+        del chunks[:]
+        epochs = self.block.create_data_array("buffer epochs", "test.epochs",
+                                              dtype=nix.DataType.Double,
+                                              shape=windows.shape)
+        multi_tag._iter_windows = recording_iter_windows
+        try:
+            mtag.stack(0, 2000.0, dim=1, out=epochs, buffer_size=buffer_size)
+        finally:
+            multi_tag._iter_windows = iter_windows
+        np.testing.assert_almost_equal(epochs[:], windows, 5)
+        assert len(chunks) > 1
+        assert max(chunks) <= buffer_size
+
+    def test_multi_tag_stack(self):
+        signal = np.arange(3 * 200).reshape((3, 200)).astype(np.float32)
+        da = self.block.create_data_array("stack signal", "test.signal",
+                                          data=signal)
+        da.append_set_dimension()
+        da.append_sampled_dimension(0.001, unit="s")
+        times = np.array([50.0, 20.3, 120.0, 80.0])
+        pos_da = self.block.create_data_array("stack pos", "test.pos",
+                                              data=np.zeros((4, 2)))
+        pos_da[:, 1] = times
+        mtag = self.block.create_multi_tag("stack tag", "test", pos_da)
+        mtag.units = ["none", "ms"]
+        mtag.references.append(da)
+
+        window = 10.0
+        for align, before in (("start", 0), ("center", 5), ("end", 10)):
+            starts = np.round(times - before).astype(int)
+            expected = np.array([signal[:, s:s+11] for s in starts])
+            for buffer_size in (None, 1, 400):
+                stacked = mtag.stack(0, window, align=align, dim=1,
+                                     buffer_size=buffer_size)
+                assert stacked.shape == (4, 3, 11)
+                assert stacked.dtype == np.float32
+                np.testing.assert_array_equal(stacked, expected)
+
+        # write into a caller buffer
+        buf = np.zeros((4, 3, 11))
+        result = mtag.stack(0, window, dim=1, out=buf)
+        assert result is buf
+        starts = np.round(times).astype(int)
+        expected = np.array([signal[:, s:s+11] for s in starts])
+        np.testing.assert_array_equal(buf, expected)
+
+        # write into a new DataArray
+        epochs = self.block.create_data_array("epochs", "test.epochs",
+                                              dtype=nix.DataType.Float,
+                                              shape=(4, 3, 11))
+        mtag.stack(0, window, dim=1, out=epochs, buffer_size=500)
+        np.testing.assert_array_equal(epochs[:], expected)
+
+        with self.assertRaises(nix.exceptions.IncompatibleDimensions):
+            mtag.stack(0, window, dim=1, out=np.zeros((4, 3, 10)))
+        with self.assertRaises(ValueError):
+            mtag.stack(0, window, align="middle", dim=1)
+        with self.assertRaises(nix.exceptions.OutOfBounds):
+            mtag.stack(0, 100.0, dim=1)
+
+    def test_multi_tag_feature_data_all(self):
+        signal = np.arange(4 * 300).reshape((4, 300)).astype(np.float64)
+        tagged = self.block.create_data_array("all signal", "test.signal",
+                                              data=signal)
+        tagged.append_set_dimension()
+        tagged.append_sampled_dimension(0.001, unit="s")
+        waveforms = np.random.random((30, 8))
+        indexed = self.block.create_data_array("all waveforms",
+                                               "test.waveforms",
+                                               data=waveforms)
+        indexed.append_set_dimension()
+        indexed.append_sampled_dimension(0.001, unit="s")
+
+        pos = np.zeros((30, 2))
+        pos[:, 1] = np.random.randint(0, 280, 30)
+        ext = np.zeros((30, 2))
+        ext[:, 0] = 3
+        ext[:, 1] = 10.0
+        pos_da = self.block.create_data_array("all pos", "test.pos",
+                                              data=pos)
+        ext_da = self.block.create_data_array("all ext", "test.ext",
+                                              data=ext)
+        mtag = self.block.create_multi_tag("all tag", "test", pos_da)
+        mtag.extents = ext_da
+        mtag.units = ["none", "ms"]
+        mtag.create_feature(tagged, nix.LinkType.Tagged)
+        mtag.create_feature(indexed, nix.LinkType.Indexed)
+        mtag.create_feature(indexed, nix.LinkType.Untagged)
+
+        # tagged feature, equal slices are stacked
+        expected = np.array([mtag.feature_data(i, 0)[:] for i in range(30)])
+        for buffer_size in (None, 1, 1000):
+            data = mtag.feature_data_all(0, buffer_size=buffer_size)
+            assert data.shape == (30, 4, 11)
+            np.testing.assert_array_equal(data, expected)
+        subset = [5, 1, 5, 29]
+        data = mtag.feature_data_all(tagged.name, positions=subset)
+        np.testing.assert_array_equal(data, expected[subset])
+
+        # tagged feature, slices of differing shape are listed
+        ext[::2, 1] = 20.0
+        ext_da[:] = ext
+        data = mtag.feature_data_all(0, buffer_size=1000)
+        assert isinstance(data, list)
+        for i in range(30):
+            np.testing.assert_array_equal(data[i], mtag.feature_data(i, 0))
+
+        # indexed feature
+        view = mtag.feature_data_all(1)
+        assert view.shape == (30, 8)
+        np.testing.assert_array_equal(view[:], waveforms)
+        for buffer_size in (None, 1):
+            data = mtag.feature_data_all(1, positions=subset,
+                                         buffer_size=buffer_size)
+            np.testing.assert_array_equal(data, waveforms[subset])
+
+        # untagged feature
+        np.testing.assert_array_equal(mtag.feature_data_all(2)[:],
+                                      waveforms)
+
+        with self.assertRaises(nix.exceptions.OutOfBounds):
+            mtag.feature_data_all(0, positions=[30])
+        pos[0, 1] = 295
+        pos_da[:] = pos
+        with self.assertRaises(nix.exceptions.OutOfBounds):
+            mtag.feature_data_all(0)
@@ -9,6 +9,7 @@
 import os
 import unittest
 import six
+import numpy as np
 import nixio as nix
 from .tmp import TempDir
 
@@ -185,6 +186,28 @@ class TestProperties(unittest.TestCase):
         number_extend = (1, 1.2)
         self.assertRaises(TypeError, self.prop.extend_values, number_extend)
 
+    def test_extend_values_array(self):
+        self.prop.values = [1, 2]
+        self.prop.extend_values(np.arange(3, 6, dtype=np.int32))
+        self.prop.extend_values([])
+        self.prop.extend_values([6])
+        self.assertEqual(self.prop.values, (1, 2, 3, 4, 5, 6))
+        self.assertEqual(self.prop.data_type, np.int64)
+        self.assertRaises(TypeError, self.prop.extend_values,
+                          np.array([1.5, 2.5]))
+        # only arrays of the same kind are accepted
+        self.assertRaises(TypeError, self.prop.extend_values,
+                          np.array([True, False]))
+        prop_f = self.section.create_property("test float", 1.5)
+        self.assertRaises(TypeError, prop_f.extend_values,
+                          np.array([1, 2], dtype=np.int32))
+        prop_f.extend_values(np.array([2.5], dtype=np.float32))
+        self.assertEqual(prop_f.values, (1.5, 2.5))
+
+        self.prop_s.values = ["a"]
+        self.prop_s.extend_values(np.array(["b", "c"]))
+        self.assertEqual(self.prop_s.values, ("a", "b", "c"))
+
     def test_unicode_values(self):
         sec = self.section
         unistrings = {
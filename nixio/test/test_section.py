@@ -152,6 +152,45 @@ class TestSections(unittest.TestCase):
         assert(len(self.section.find_related()) == 3)
         assert(len(self.section.sections[0].find_related()) == 5)
 
+    def test_section_iter_sections(self):
+        for i in range(2):
+            sec = self.section.create_section("level1-s" + str(i), "dummy")
+            for j in range(2):
+                sec.create_section("level2-s" + str(j), "deep")
+        self.other.create_section("level1-s0", "dummy")
+
+        for visit in (False, True):
+            sections = list(self.section.iter_sections(visit=visit))
+            self.assertEqual(len(sections), 7)
+            self.assertEqual(sections[0], self.section)
+            deep = list(self.section.iter_sections(type_="deep",
+                                                   visit=visit))
+            self.assertEqual(len(deep), 4)
+            self.assertTrue(all(s.parent.name.startswith("level1")
+                                for s in deep))
+            named = list(self.file.iter_sections(name="level1-s0",
+                                                 visit=visit))
+            self.assertEqual(sorted(s.parent.name for s in named),
+                             ["other section", "test section"])
+            self.assertEqual(
+                len(list(self.file.iter_sections(limit=2, visit=visit))), 5
+            )
+            self.assertEqual(len(list(self.file.iter_sections(
+                filtr=lambda s: s.type == "deep", name="level2-s1",
+                visit=visit))), 2)
+
+        # breadth first order, stopping early
+        gen = self.file.iter_sections()
+        self.assertEqual([next(gen).name for _ in range(2)],
+                         [s.name for s in self.file.sections])
+
+        # linked sections are found at their own place in the tree
+        self.section.sections["level1-s0"].link = self.other
+        for visit in (False, True):
+            self.assertEqual(
+                len(list(self.file.iter_sections(visit=visit))), 9
+            )
+
     def test_section_properties(self):
         assert(len(self.section) == 0)
 
@@ -235,6 +274,35 @@ class TestSections(unittest.TestCase):
         # indirect access parent check
         self.assertEqual(block.groups["group"].metadata.parent, self.section)
 
+    def test_parent_index(self):
+        child = self.section.create_section("child", "sect")
+        grandchild = child.create_section("grandchild", "sect")
+        # a linked section must not be taken for a child of its linker
+        self.other.link = child
+        self.file.close()
+        self.file = nix.File.open(self.testfilename, nix.FileMode.ReadWrite)
+        self.section = self.file.sections["test section"]
+        self.other = self.file.sections["other section"]
+
+        grandchild = self.file.find_sections(
+            filtr=lambda s: s.name == "grandchild"
+        )[0]
+        self.assertEqual(grandchild.parent.name, "child")
+        self.assertEqual(grandchild.parent.parent, self.section)
+        self.assertIsNone(grandchild.parent.parent.parent)
+        self.assertIsNone(self.other.parent)
+        self.assertEqual(self.other.link.parent, self.section)
+
+        # the index is kept up to date after it has been built
+        top = self.file.create_section("top", "sect")
+        newchild = top.create_section("new child", "sect")
+        found = self.file.find_sections(filtr=lambda s: s.name == "new child")
+        self.assertEqual(found[0].parent, top)
+        self.assertIsNone(self.file.sections["top"].parent)
+
+        del self.file.sections["top"]
+        self.assertNotIn(newchild.id, self.file._section_index())
+
     def test_inverse_search(self):
         block = self.file.create_block("a block", "block with metadata")
         block.metadata = self.section
@@ -282,6 +350,40 @@ class TestSections(unittest.TestCase):
         self.assertEqual(len(self.section.referring_sources), 0)
         self.assertEqual(self.other.referring_sources[0].id, src.id)
 
+    def test_inverse_search_index(self):
+        block = self.file.create_block("block", "block with metadata")
+        block.metadata = self.section
+        da = block.create_data_array("da", "data_array", data=[1, 2])
+        da.metadata = self.section
+        grp = block.create_group("group", "group")
+        grp.data_arrays.append(da)
+        self.file.close()
+        self.file = nix.File.open(self.testfilename, nix.FileMode.ReadWrite)
+        self.section = self.file.sections["test section"]
+        self.other = self.file.sections["other section"]
+        block = self.file.blocks["block"]
+
+        self.assertEqual(self.section.referring_blocks, [block])
+        self.assertEqual(self.section.referring_data_arrays,
+                         [block.data_arrays["da"]])
+
+        # changes after the index has been built
+        block.groups["group"].data_arrays["da"].metadata = self.other
+        self.assertEqual(self.section.referring_data_arrays, [])
+        self.assertEqual(len(self.other.referring_data_arrays), 1)
+        del block.metadata
+        self.assertEqual(self.section.referring_blocks, [])
+        grp = block.groups["group"]
+        grp.metadata = self.other
+        self.assertEqual(self.other.referring_groups, [grp])
+
+        # deleted and recreated entities
+        del block.data_arrays["da"]
+        self.assertEqual(self.other.referring_data_arrays, [])
+        block.create_data_array("da", "data_array", data=[1])
+        self.assertEqual(self.other.referring_data_arrays, [])
+        self.assertEqual(len(self.other.referring_objects), 1)
+
     def test_section_link(self):
         self.section.create_property("PropOnSection", "value")
 
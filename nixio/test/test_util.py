@@ -7,7 +7,9 @@
 # modification, are permitted under the terms of the BSD License. See
 # LICENSE file in the root of the Project.
 import unittest
-from nixio.util import names, units
+import numpy as np
+from nixio.util import names, units, decode_strings
+from nixio.exceptions import InvalidUnit
 
 
 class TestUtil(unittest.TestCase):
@@ -85,6 +87,33 @@ class TestUtil(unittest.TestCase):
 
         assert(units.scaling(base_unit, scalable_1) == 1e-03)
         assert(units.scaling(base_unit, scalable_2) == 1e06)
+        assert(units.scaling('ms', 'us') == 1e03)
+        assert(units.scaling('mV^2', 'V^2') == 1e-06)
+        assert(units.scaling('mV/ms', 'V/s') == 1.0)
+        assert(units.scaling('uV^2/Hz', 'mV^2 * Hz^-1') == 1e-06)
+        with self.assertRaises(InvalidUnit):
+            units.scaling('mV/s', 'mV/Hz')
+        with self.assertRaises(InvalidUnit):
+            units.scaling('mV', 'ft')
+
+    def test_unit_parse(self):
+        assert(units.parse('mV') == (-3, (('V', 1),)))
+        assert(units.parse('mV^2/kHz') == (-9, (('Hz', -1), ('V', 2))))
+        assert(units.parse('mV^2 * Hz^-1')[1] == units.parse('V^2/Hz')[1])
+        assert(units.parse('mm') == (-3, (('m', 1),)))
+        with self.assertRaises(InvalidUnit):
+            units.parse('yrd')
+        with self.assertRaises(InvalidUnit):
+            units.parse('')
+
+    def test_unit_convert(self):
+        values = np.array([1.0, 20.0, 300.0])
+        np.testing.assert_almost_equal(units.convert(values, 'ms', 's'),
+                                       values / 1000)
+        np.testing.assert_almost_equal(units.convert(5, 'kHz', 'Hz'), 5000)
+        np.testing.assert_equal(units.convert(values, 'mV', 'mV'), values)
+        with self.assertRaises(InvalidUnit):
+            units.convert(values, 'ms', 'mV')
 
     def test_unit_split(self):
         unit_1 = 'kV'
@@ -99,3 +128,18 @@ class TestUtil(unittest.TestCase):
 
         p, u, po = units.split(unit_3)
         assert(p == '' and u == 'Hz' and po == '-1')
+
+    def test_decode_strings(self):
+        encoded = np.array([u"a".encode(), u"ü".encode()], dtype=object)
+        self.assertEqual(list(decode_strings(encoded)), [u"a", u"ü"])
+        self.assertEqual(decode_strings(u"°".encode()), u"°")
+
+        rows = np.zeros(2, dtype=[("n", np.int64), ("s", object)])
+        rows["s"] = [b"x", b"y"]
+        rows = decode_strings(rows)
+        self.assertEqual(list(rows["s"]), [u"x", u"y"])
+        self.assertEqual(decode_strings(rows[0])["s"], u"x")
+
+        numbers = np.arange(3)
+        self.assertIs(decode_strings(numbers), numbers)
+        self.assertEqual(len(decode_strings(np.array([], dtype=object))), 0)
@@ -180,6 +180,18 @@ class TestValidate (unittest.TestCase):
         assert actual == expected
         assert len(res["warnings"]) == 0
 
+    def test_check_invalid_id(self):
+        self.file.blocks[0].groups[0]._h5group.set_attr("entity_id",
+                                                        "not-a-uuid")
+        # ids of objects obtained while iterating are not checked
+        assert len(list(self.file.blocks[0].groups)) == 2
+        with self.assertRaises(ValueError):
+            self.file.blocks[0].groups["group-0"]
+        res = self.file.validate()
+        errors = [err for obj, err in res["errors"].items()
+                  if obj.id == "not-a-uuid"]
+        assert errors == [[VE.InvalidID]]
+
     def test_check_group(self):
         group1 = self.file.blocks[0].groups[0]
         group2 = self.file.blocks[1].groups[0]
@@ -7,46 +7,206 @@
 # modification, are permitted under the terms of the BSD License. See
 # LICENSE file in the root of the Project.
 
+from collections import deque
+
 import nixio
 
+try:
+    from sys import maxint
+except ImportError:
+    from sys import maxsize as maxint
+
 
-class Cont(object):
+class _Node(object):
     """
-    Simple container for an element an a level
+    An HDF5 group found during a traversal, with its name, the group
+    containing it, its level and its parent node. The entity for the group
+    is only created when it is needed.
     """
 
-    def __init__(self, elem, level):
-        self.elem = elem
+    __slots__ = ("h5obj", "name", "container", "level", "parent", "entity")
+
+    def __init__(self, h5obj, name, container, level, parent, entity=None):
+        self.h5obj = h5obj
+        self.name = name
+        self.container = container
         self.level = level
+        self.parent = parent
+        self.entity = entity
 
 
-def _find_sources(with_sources, filtr, limit):
-    """
-    Find a list of matching sources recursively.
-    For internal use.
-    """
+def _str_attr(h5obj, name):
+    value = h5obj.attrs.get(name)
+    if isinstance(value, bytes):
+        value = value.decode()
+    return value
 
-    fifo = []
-    result = []
-    level = 0
 
-    if isinstance(with_sources, nixio.source.Source):
-        fifo.append(Cont(with_sources, level))
-    else:
-        level += 1
-        fifo += [Cont(e, level) for e in with_sources.sources]
+def _iter_tree(root, cls, childname, filtr, limit, name, type_, visit):
+    """
+    Generator over the entities of class ``cls`` in the tree below ``root``,
+    where the children of each entity are stored in its ``childname``
+    group. Entities are only created for the groups that match ``name`` and
+    ``type_`` (and for their ancestors).
+    """
+    if limit is None:
+        limit = maxint
+    nixfile = root if isinstance(root, nixio.File) else root.file
+    rootnode = _Node(None, None, None, 0, None, root)
+    create = nixio.hdf5.h5group.H5Group.create_from_h5obj
+
+    def entity(node):
+        if node.entity is None:
+            h5group = create(node.h5obj, node.container, node.name)
+            h5group.trusted = True
+            node.entity = nixfile._entity(cls, entity(node.parent), h5group)
+        return node.entity
+
+    def matches(node):
+        if name is not None and node.name != name:
+            return False
+        if type_ is not None and _str_attr(node.h5obj, "type") != type_:
+            return False
+        return filtr is None or filtr(entity(node))
+
+    if isinstance(root, cls):
+        rootnode.h5obj = root._h5group.group
+        rootnode.name = root.name
+        if matches(rootnode):
+            yield root
+        if limit < 1:
+            return
+    children = getattr(root, childname)._backend.group
+    if children is None:
+        return
+    nodes = None
+    if visit:
+        nodes = _visit_nodes(children, childname, rootnode, limit)
+    if nodes is None:
+        nodes = _walk_nodes(children, childname, rootnode, limit)
+    for node in nodes:
+        if matches(node):
+            yield entity(node)
+
+
+def _walk_nodes(children, childname, rootnode, limit):
+    """
+    Breadth first traversal of the groups below ``children``.
+    """
+    fifo = deque(_Node(grp, name, children, 1, rootnode)
+                 for name, grp in children.items())
+    while fifo:
+        node = fifo.popleft()
+        yield node
+        if node.level < limit:
+            container = node.h5obj.get(childname)
+            if container is not None:
+                fifo.extend(_Node(grp, name, container, node.level + 1, node)
+                            for name, grp in container.items())
+
+
+def _visit_nodes(children, childname, rootnode, limit):
+    """
+    Collects the groups below ``children`` with a single visititems call,
+    in depth first order. Returns None if the tree contains section links,
+    since visititems visits linked groups only once, under whichever path
+    it reaches first.
+    """
+    nodes = dict()
+    containers = dict()
+    found = list()
+
+    def collect(path, obj):
+        parts = path.split("/")
+        if len(parts) % 2 == 0:
+            if parts[-1] == childname:
+                containers[path] = obj
+            # groups below a link are visited under the link's path
+            return parts[-1] == "link" or None
+        if any(part != childname for part in parts[1::2]):
+            return None
+        level = (len(parts) + 1) // 2
+        if level > 1 and level > limit:
+            return None
+        parent = nodes.get("/".join(parts[:-2]), rootnode)
+        container = containers.get("/".join(parts[:-1]), children)
+        node = _Node(obj, parts[-1], container, level, parent)
+        nodes[path] = node
+        found.append(node)
+        return None
+
+    if children.visititems(collect):
+        return None
+    return found
+
+
+def iter_sources(with_sources, filtr=None, limit=None, name=None, type_=None,
+                 visit=False):
+    """
+    Generator over the sources in a tree of sources, starting at a Block or
+    a Source. The tree is traversed breadth first, so the generator can be
+    stopped early without traversing the whole tree. Sources are only
+    instantiated when they (or their descendants) are yielded or when the
+    filter is applied to them.
+
+    :param with_sources: The Block or Source to start at
+    :param filtr: A filter function; only sources for which it returns True
+                  are yielded
+    :type filtr: function
+    :param limit: The maximum depth of traversal
+    :type limit: int
+    :param name: Only yield sources with this name
+    :type name: str
+    :param type_: Only yield sources of this type
+    :type type_: str
+    :param visit: Collect the sources with a single HDF5 visititems call
+                  before yielding them. The sources are then yielded in depth
+                  first order.
+    :type visit: bool
+
+    :returns: generator of Source
+    """
+    return _iter_tree(with_sources, nixio.Source, "sources",
+                      filtr, limit, name, type_, visit)
 
-    while len(fifo) > 0:
-        c = fifo.pop(0)
 
-        level = c.level + 1
-        if level <= limit:
-            fifo += [Cont(e, level) for e in c.elem.sources]
+def iter_sections(with_sections, filtr=None, limit=None, name=None,
+                  type_=None, visit=False):
+    """
+    Generator over the sections in a tree of sections, starting at a File or
+    a Section. The tree is traversed breadth first, so the generator can be
+    stopped early without traversing the whole tree. Sections are only
+    instantiated when they (or their descendants) are yielded or when the
+    filter is applied to them.
+
+    :param with_sections: The File or Section to start at
+    :param filtr: A filter function; only sections for which it returns True
+                  are yielded
+    :type filtr: function
+    :param limit: The maximum depth of traversal
+    :type limit: int
+    :param name: Only yield sections with this name
+    :type name: str
+    :param type_: Only yield sections of this type
+    :type type_: str
+    :param visit: Collect the sections with a single HDF5 visititems call
+                  before yielding them. The sections are then yielded in
+                  depth first order. Trees with linked sections are traversed
+                  breadth first instead.
+    :type visit: bool
+
+    :returns: generator of Section
+    """
+    return _iter_tree(with_sections, nixio.Section, "sections",
+                      filtr, limit, name, type_, visit)
 
-        if filtr(c.elem):
-            result.append(c.elem)
 
-    return result
+def _find_sources(with_sources, filtr, limit):
+    """
+    Find a list of matching sources recursively.
+    For internal use.
+    """
+    return list(iter_sources(with_sources, filtr, limit))
 
 
 def _find_sections(with_sections, filtr, limit):
@@ -54,25 +214,4 @@ def _find_sections(with_sections, filtr, limit):
     Find a list of matching sections recursively.
     For internal use.
     """
-
-    fifo = []
-    result = []
-    level = 0
-
-    if isinstance(with_sections, nixio.Section):
-        fifo.append(Cont(with_sections, level))
-    else:
-        level += 1
-        fifo += [Cont(e, level) for e in with_sections.sections]
-
-    while len(fifo) > 0:
-        c = fifo.pop(0)
-
-        level = c.level + 1
-        if level <= limit:
-            fifo += [Cont(e, level) for e in c.elem.sections]
-
-        if filtr(c.elem):
-            result.append(c.elem)
-
-    return result
+    return list(iter_sections(with_sections, filtr, limit))
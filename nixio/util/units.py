@@ -13,6 +13,23 @@ try:
     from collections.abc import Sequence
 except ImportError:
     from collections import Sequence
+try:
+    from functools import lru_cache
+except ImportError:  # Python 2
+    from functools import wraps
+
+    def lru_cache(maxsize=None):
+        def decorator(func):
+            memo = dict()
+
+            @wraps(func)
+            def wrapper(*args):
+                if args not in memo:
+                    memo[args] = func(*args)
+                return memo[args]
+            return wrapper
+        return decorator
+import numpy as np
 from ..exceptions import InvalidUnit
 
 
@@ -43,6 +60,25 @@ PREFIX_FACTORS = {"y": 1.0e-24,
                   "E": 1.0e18,
                   "Z": 1.0e21,
                   "Y": 1.0e24}
+PREFIX_EXPONENTS = {"y": -24, "z": -21, "a": -18, "f": -15, "p": -12,
+                    "n": -9, "u": -6, "m": -3, "c": -2, "d": -1, "da": 1,
+                    "h": 2, "k": 3, "M": 6, "G": 9, "T": 12, "P": 15, "E": 18,
+                    "Z": 21, "Y": 24}
+
+_ATOMIC = "{prefix}?{unit}{power}?".format(prefix=PREFIXES, unit=UNITS,
+                                           power=POWER)
+_ATOMIC_RE = re.compile("^{}$".format(_ATOMIC))
+_COMPOUND_RE = re.compile("({atomic}(\\*|/))+{atomic}".format(atomic=_ATOMIC))
+_OPT_PUP_RE = re.compile(_ATOMIC)
+_PREFIX_GRP = "(?P<prefix>{})".format(PREFIXES)
+_UNIT_GRP = "(?P<unit>{})".format(UNITS)
+_POWER_GRP = "(?P<power>{})".format(POWER)
+_PUP_RE = re.compile(_PREFIX_GRP + _UNIT_GRP + _POWER_GRP)
+_PU_RE = re.compile(_PREFIX_GRP + _UNIT_GRP)
+_UP_RE = re.compile(_UNIT_GRP + _POWER_GRP)
+_TERM_RE = re.compile("^{}?{}{}?$".format(_PREFIX_GRP, _UNIT_GRP,
+                                          _POWER_GRP))
+_SEPARATOR_RE = re.compile("([*/])")
 
 
 def sanitizer(unit):
@@ -85,12 +121,7 @@ def is_atomic(unit):
     :returns: True if unit is atomic, False otherwise.
     :rtype: bool
     """
-    atomic_unit = re.compile(
-        "^{prefix}?{unit}{power}?$".format(prefix=PREFIXES,
-                                           unit=UNITS,
-                                           power=POWER)
-    )
-    return atomic_unit.match(unit)
+    return _ATOMIC_RE.match(unit)
 
 
 def is_compound(unit):
@@ -103,13 +134,7 @@ def is_compound(unit):
               False otherwise.
     :rtype: bool
     """
-    atomic_unit = "{prefix}?{unit}{power}?".format(
-        prefix=PREFIXES, unit=UNITS, power=POWER
-    )
-    compound_unit = re.compile(
-        "({atomic}(\\*|/))+{atomic}".format(atomic=atomic_unit)
-    )
-    return unit and compound_unit.search(unit)
+    return unit and _COMPOUND_RE.search(unit)
 
 
 def scalable(unit_a, unit_b):
@@ -134,20 +159,17 @@ def scalable(unit_a, unit_b):
                 return False
         return True
 
-    if not (is_si(unit_a) and is_si(unit_b)):
-        return False
-
-    _, a_unit, a_power = split(unit_a)
-    _, b_unit, b_power = split(unit_b)
-    if a_unit != b_unit or a_power != b_power:
+    try:
+        return parse(unit_a)[1] == parse(unit_b)[1]
+    except InvalidUnit:
         return False
 
-    return True
-
 
+@lru_cache(maxsize=1024)
 def scaling(origin, destination):
     """
     Returns the scaling factor to convert from one unit to another.
+    Both atomic and compound units are supported. Results are memoized.
 
     :param origin: The original unit string.
     :param destination: The destination unit string.
@@ -155,31 +177,72 @@ def scaling(origin, destination):
     :returns: The scaling factor.
     :rtype: double
     """
-    scale = 1.0
     if not scalable(origin, destination):
         raise InvalidUnit(
             "Origin unit and destination unit are not scalable version of the "
             "same SI unit!",
             "nixio.util.scaling"
         )
+    # prefixes are exact powers of ten; avoid accumulating rounding errors
+    return 10.0 ** (parse(origin)[0] - parse(destination)[0])
+
+
+def convert(values, origin, destination):
+    """
+    Converts values from one unit to another. Accepts scalars as well as
+    array-like data; the scaling is applied to all values at once.
+
+    :param values: The value(s) given in the origin unit.
+    :param origin: The original unit string.
+    :param destination: The destination unit string.
+
+    :returns: The values expressed in the destination unit.
+    :rtype: numpy.ndarray or scalar
+    """
+    factor = scaling(origin, destination)
+    values = np.asarray(values)
+    if factor == 1.0:
+        return values
+    return values * factor
 
-    org_prefix, _, org_power = split(origin)
-    dest_prefix, _, dest_power = split(destination)
 
-    if org_prefix == dest_prefix and org_power == dest_power:
-        return scale
-    if not dest_prefix and org_prefix:
-        scale = PREFIX_FACTORS[org_prefix]
-    elif not org_prefix and dest_prefix:
-        scale = 1.0 / PREFIX_FACTORS[dest_prefix]
-    elif not org_prefix and not dest_prefix:
-        scale = PREFIX_FACTORS[org_prefix] / PREFIX_FACTORS[dest_prefix]
+@lru_cache(maxsize=1024)
+def parse(unit):
+    """
+    Parses a (compound) SI unit string into a canonical representation: the
+    decimal exponent of all magnitude prefixes combined and a sorted tuple of
+    (base unit, power) pairs. For instance, "mV^2/kHz" is parsed into
+    (-9, (("Hz", -1), ("V", 2))). Results are memoized.
 
-    if org_power:
-        power = int(org_power)
-        scale **= power
+    :param unit: The unit string.
 
-    return scale
+    :returns: A tuple of the prefix exponent and the base units.
+    :rtype: tuple
+    """
+    if not unit or not isinstance(unit, string_types):
+        raise InvalidUnit("Invalid unit {}".format(unit),
+                          "nixio.util.units.parse")
+    terms = _SEPARATOR_RE.split(unit.replace(" ", ""))
+    exponent = 0
+    base = dict()
+    sign = 1
+    for idx, term in enumerate(terms):
+        if idx % 2:
+            # separators are at odd positions
+            sign = -1 if term == "/" else 1
+            continue
+        match = _TERM_RE.match(term)
+        if not match:
+            raise InvalidUnit("Invalid unit {}".format(unit),
+                              "nixio.util.units.parse")
+        power = match.group("power")
+        power = sign * (int(power[1:]) if power else 1)
+        prefix = match.group("prefix")
+        if prefix:
+            exponent += PREFIX_EXPONENTS[prefix] * power
+        name = match.group("unit")
+        base[name] = base.get(name, 0) + power
+    return exponent, tuple(sorted((n, p) for n, p in base.items() if p))
 
 
 def split(combined_unit):
@@ -191,30 +254,21 @@ def split(combined_unit):
     :returns: A tuple of prefix, base unit, and power.
     :rtype: tuple
     """
-    prefix_re = "(?P<prefix>{})".format(PREFIXES)
-    unit_re = "(?P<unit>{})".format(UNITS)
-    power_re = "(?P<power>{})".format(POWER)
-    pup = re.compile(prefix_re + unit_re + power_re)
-    pu = re.compile(prefix_re + unit_re)
-    up = re.compile(unit_re + power_re)
-    # u = re.compile(unit_re)
-    # p = re.compile(prefix_re)
-
-    match = pup.match(combined_unit)
+    match = _PUP_RE.match(combined_unit)
     if match:
         prefix = match.group("prefix")
         unit = match.group("unit")
         power = match.group("power")[1:]
         return prefix, unit, power
 
-    match = up.match(combined_unit)
+    match = _UP_RE.match(combined_unit)
     if match:
         prefix = ""
         unit = match.group("unit")
         power = match.group("power")[1:]
         return prefix, unit, power
 
-    match = pu.match(combined_unit)
+    match = _PU_RE.match(combined_unit)
     if match:
         prefix = match.group("prefix")
         unit = match.group("unit")
@@ -247,8 +301,7 @@ def split_compound(compound_unit):
     :returns: A tuple containing the atomic units.
     :rtype: tuple
     """
-    opt_pup = re.compile(PREFIXES + "?" + UNITS + POWER + "?")
-    match = opt_pup.match(compound_unit)
+    match = _OPT_PUP_RE.match(compound_unit)
     sep = ""
     atomic_units = []
     while match and (match.end() < len(match.string)):
@@ -260,7 +313,7 @@ def split_compound(compound_unit):
         else:
             atomic_units.append(unit)
         sep = suffix[0]
-        match = opt_pup.match(suffix[1:])
+        match = _OPT_PUP_RE.match(suffix[1:])
     unit = match.group(0)
     if sep == "/":
         atomic_units.append(invert_power(unit))
@@ -18,6 +18,36 @@ from . import names
 
 vlen_str_dtype = h5py.special_dtype(vlen=text_type)
 
+_decode_utf8 = np.frompyfunc(bytes.decode, 1, 1)
+
+
+def decode_strings(data):
+    """
+    Decodes the UTF-8 encoded bytes that h5py returns when reading variable
+    length strings. Arrays (and the string fields of compound arrays) are
+    decoded with a single vectorized call instead of element by element.
+    Data that does not contain encoded strings is returned unchanged.
+
+    :param data: bytes, array or compound array (or row) read from a dataset
+    :return: the data with all bytes decoded to str
+    """
+    if isinstance(data, bytes):
+        return data.decode()
+    if not isinstance(data, (np.ndarray, np.void)) or not np.size(data):
+        return data
+    if data.dtype.names:
+        for name in data.dtype.names:
+            if data.dtype.fields[name][0].kind == "O":
+                data[name] = decode_strings(data[name])
+        return data
+    if data.dtype.kind != "O" or not isinstance(data.flat[0], bytes):
+        return data
+    decoded = _decode_utf8(data)
+    if not isinstance(decoded, np.ndarray):
+        # 0-d input
+        decoded = np.array(decoded, dtype=vlen_str_dtype)
+    return decoded
+
 
 def create_id():
     """
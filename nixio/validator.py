@@ -8,6 +8,7 @@
 # LICENSE file in the root of the Project.
 from __future__ import (absolute_import, division, print_function)
 from .util import units
+from .util import util
 from .dimension_type import DimensionType
 
 
@@ -20,6 +21,7 @@ class ValidationError(object):
     NoDate = "date is not set"
     NoDataType = "data type is not set"
     NoID = "no ID set"
+    InvalidID = "ID is not a valid UUID"
     DimensionMismatch = ("data dimensionality does not match number of "
                          "defined dimensions")
     InvalidDimensionIndex = ("index for dimension {} is not set to a valid "
@@ -355,6 +357,8 @@ def check_feature(feat, idx):
     errors = list()
     if not feat.id:
         errors.append("feature {}: {}".format(idx, ValidationError.NoID))
+    elif not util.is_uuid(feat.id):
+        errors.append("feature {}: {}".format(idx, ValidationError.InvalidID))
     if feat.created_at is None:
         errors.append("feature {}: {}".format(idx, ValidationError.NoDate))
     if not feat.data:
@@ -471,6 +475,8 @@ def check_entity(entity):
         errors.append(ValidationError.NoType)
     if not entity.id:
         errors.append(ValidationError.NoID)
+    elif not util.is_uuid(entity.id):
+        errors.append(ValidationError.InvalidID)
     if not entity.name:
         errors.append(ValidationError.NoName)
     if entity.created_at is None: